@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import argparse
+from xml.etree.ElementTree import ParseError
+import PyGraph.graph_io as graph_io
+import PyGraph.graph_path_algorithm as path_alg
+
+''' Graph Batch Command Line
+
+    Date: 10/18/2026
+
+    Description:
+        This file contains a command line entry point for running graph algorithms without the GUI.  A graph is loaded
+        from an edge list, GraphML or binary file, the chosen algorithm is run for each query, and the results are
+        written as JSON lines as each query finishes.  PyQt is never imported, so it starts quickly and can be used in
+        a pipeline.
+
+        Queries are given with --query or read from a file (- for standard input) with one query per line: the start
+        node followed by the end nodes, separated by commas or whitespace.  A query with only a start node finds paths
+        to every node.  Examples:
+
+            python GraphBatchCli.py roads.graphml dijkstra --query A B C
+            cut -d, -f1,2 pairs.csv | python GraphBatchCli.py roads.pygraph bidirectional --queries -
+            python GraphBatchCli.py roads.csv prims
+
+'''
+
+PATH_ALGORITHMS = ('dijkstra', 'bellman_ford', 'bidirectional', 'astar', 'all_pairs') # answer queries
+GRAPH_ALGORITHMS = ('prims', 'kruskal', 'components') # run once on the whole graph
+
+
+def load(path, digraph=None):
+    # load a graph file, returns (graph, positions).  Binary files are memory mapped rather than read
+    if path.lower().endswith(graph_io.BINARY_EXTENSIONS):
+        flags = graph_io.map_binary(path)[0]
+        if flags & graph_io.LABEL_INDEX: # written by DiskGraph.build, labels are looked up in the file
+            from PyGraph.disk_graph import DiskGraph
+            return DiskGraph(path), None
+        graph, positions = graph_io.read_binary(path)
+        if positions is not None: # astar takes a dictionary of node label -> (x, y)
+            positions = {label: (positions[2*i], positions[2*i+1]) for i, label in enumerate(graph.labels)
+                         if positions[2*i] == positions[2*i]} # nan for nodes without a position
+        return graph, positions
+    return graph_io.load_graph(path, digraph)
+
+
+def read_queries(args):
+    # yield (from node, list of end nodes or None) for each query, reading query files as they are needed
+    for query in args.query or ():
+        yield query[0], query[1:] or None
+    for path in args.queries or ():
+        file = sys.stdin if path == '-' else open(path, encoding='utf-8')
+        try:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith('#'): continue
+                fields = [field.strip() for field in line.split(',')] if ',' in line else line.split()
+                yield fields[0], fields[1:] or None
+        finally:
+            if file is not sys.stdin: file.close()
+
+
+def run_path_queries(graph, positions, args, write):
+    index = graph.freeze().index
+    if positions is not None and len(positions) != len(index):
+        positions = None # astar needs a position for every node to use straight line distances
+    all_pairs = None
+    if args.algorithm == 'all_pairs':
+        from PyGraph.all_pairs import AllPairsPaths # needs numpy for dense graphs, only imported when used
+        all_pairs = AllPairsPaths(graph)
+
+    for from_v, to_v_list in read_queries(args):
+        # check nodes here, as the algorithms print invalid nodes to standard output
+        missing = [node for node in [from_v] + (to_v_list or []) if node not in index]
+        if missing:
+            write({'from': from_v, 'error': 'node ' + json.dumps(missing[0]) + ' is not in graph'})
+            continue
+        if args.algorithm in ('bidirectional', 'astar'): # point to point searches take one end node at a time
+            if to_v_list is None:
+                write({'from': from_v, 'error': args.algorithm + ' needs an end node'})
+                continue
+            result = []
+            for to_v in to_v_list:
+                if args.algorithm == 'astar':
+                    result += path_alg.astar(graph, from_v, to_v, positions=positions)
+                else:
+                    result += path_alg.bidirectional_dijkstra(graph, from_v, to_v)
+        elif args.algorithm == 'dijkstra':
+            result = path_alg.dijkstra(graph, from_v, to_v_list)
+        elif args.algorithm == 'bellman_ford':
+            result = path_alg.bellman_ford(graph, from_v, to_v_list)
+        else:
+            result = all_pairs.query(from_v, to_v_list)
+        write_path_results(from_v, result, write)
+
+
+def write_path_results(from_v, result, write):
+    # write one line per (node, distance, path) result
+    for to_v, distance, path in result:
+        if to_v == 'Negative cycle' and distance == float('-inf'):
+            write({'from': from_v, 'error': 'negative cycle', 'cycle': path})
+            return
+        if to_v == 'Invalid' and distance == -1 and path is None:
+            write({'from': from_v, 'error': 'negative edge weight'})
+            return
+        if path is None: # not reachable, json has no infinity
+            write({'from': from_v, 'to': to_v, 'distance': None, 'path': None})
+        else:
+            write({'from': from_v, 'to': to_v, 'distance': distance, 'path': path})
+
+
+def run_graph_algorithm(graph, args, write):
+    if args.algorithm == 'components':
+        for component in path_alg.strongly_connected_components(graph):
+            write({'component': component})
+        return
+    tree = path_alg.prims(graph) if args.algorithm == 'prims' else path_alg.kruskal(graph)
+    if tree is None:
+        write({'error': 'graph is not connected'})
+        return
+    for weight, from_v, to_v in tree:
+        write({'from': from_v, 'to': to_v, 'weight': weight})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run graph algorithms on a graph file and write the results as JSON lines')
+    parser.add_argument('graph', help='edge list, GraphML (.graphml) or binary (.pygraph) graph file')
+    parser.add_argument('algorithm', choices=PATH_ALGORITHMS + GRAPH_ALGORITHMS)
+    parser.add_argument('--query', nargs='+', action='append', metavar='NODE', help='start node followed by any end nodes, can be repeated')
+    parser.add_argument('--queries', action='append', metavar='FILE', help='file of queries, one per line, - for standard input')
+    parser.add_argument('--digraph', action='store_true', help='treat edge lists without a header as digraphs')
+    parser.add_argument('--output', default='-', metavar='FILE', help='file to write results to, standard output by default')
+    args = parser.parse_args(argv)
+    if args.algorithm in PATH_ALGORITHMS and not args.query and not args.queries:
+        parser.error(args.algorithm + ' needs --query or --queries')
+
+    try:
+        graph, positions = load(args.graph, args.digraph)
+    except (OSError, ValueError, ParseError) as error:
+        parser.exit(1, 'Could not load ' + args.graph + ': ' + str(error) + '\n')
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    def write(record):
+        output.write(json.dumps(dict(algorithm=args.algorithm, **record)) + '\n')
+        output.flush() # results are read as they arrive when piped
+    try:
+        if args.algorithm in PATH_ALGORITHMS:
+            run_path_queries(graph, positions, args, write)
+        else:
+            run_graph_algorithm(graph, args, write)
+    except BrokenPipeError: # reader of the output stopped early, send anything still buffered nowhere
+        os.dup2(os.open(os.devnull, os.O_WRONLY), output.fileno())
+    finally:
+        if output is not sys.stdout: output.close()
+
+
+if __name__ == "__main__":
+    main()
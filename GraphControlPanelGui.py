@@ -180,6 +180,9 @@ class Ui_GraphControlWindow(object):
         elif algo == 'BELLMAN FORD': # if using bellman ford
             # run bellman ford on GraphScene 
             self.scene.show_shortest_path_bellman_ford(self.path_node1_edit.text(), self.path_node2_edit.text()) 
+        elif algo == 'ALL PAIRS': # if using all pairs
+            # look up path in GraphScene's all pairs results
+            self.scene.show_shortest_path_all_pairs(self.path_node1_edit.text(), self.path_node2_edit.text()) 
         
           
        
@@ -1,8 +1,11 @@
-import webbrowser
+import time
+startup_times = [('start', time.perf_counter())] # (phase, time it finished) for --profile-startup
 import sys
-from PyQt5 import QtCore, QtGui, QtWidgets, QtOpenGL
-from GraphGuiClasses import GraphScene
-from GraphControlPanelGui import Ui_GraphControlWindow as GraphControlPanel
+from PyQt5 import QtCore, QtGui, QtWidgets
+startup_times.append(('import PyQt5', time.perf_counter()))
+from GraphGuiClasses import GraphScene, UpdateData
+from xml.etree.ElementTree import ParseError
+startup_times.append(('import graph modules', time.perf_counter()))
 
 ''' Graph GUI 
   
@@ -12,12 +15,25 @@ from GraphControlPanelGui import Ui_GraphControlWindow as GraphControlPanel
     Modified: 5/11/2017
     Changes made: Added functionality to change graph type between undirected graph and digraph by pressing a button on the panel.
 
+    Modified: 10/18/2026
+    Changes made: Added the --opengl option, which shows the graph in an OpenGL viewport and draws all edges with one batched item.
+    The status labels are refreshed once per batch of changes, and only the labels for what changed are recomputed.
+    The status bar shows the progress of algorithms running in the background.
+    Changing the graph type converts the scene in place instead of building a new scene and control panel.
+    Added a File menu for opening and saving graphs as edge lists, GraphML or binary files.
+    Modules only needed later (the control panel, webbrowser for the help file) are imported when first used, the
+    existing QApplication is reused instead of creating a second one, and the control panel is built after the main
+    window is shown.  --profile-startup reports how long each part of starting up took and exits.
+    Added a Layout menu for placing all nodes, or the selected nodes and their neighbours, with a force directed layout.
+
     Description:
         This file contains various classes and functions for displaying a graphical representation of a graph.  The Graphical layout and 
         design was done using QtDesigner
 
 '''
 
+GRAPH_FILE_FILTER = 'Edge lists (*.csv *.txt);;GraphML (*.graphml);;Binary graphs (*.pygraph);;All files (*)'
+
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
 
@@ -30,6 +46,8 @@ class Ui_MainWindow(object):
         self.centralwidget.setObjectName("centralwidget")
         self.graphView = QtWidgets.QGraphicsView(self.centralwidget)
         self.graphView.setObjectName("graphView")
+        if self.MainWindow.accelerated: # draw the scene with OpenGL for very large graphs
+            self.setup_accelerated_view()
 
         # using the MainWindow passed into the funtion, add a graph scene 
         self.scene=self.MainWindow.graph_scene
@@ -72,7 +90,7 @@ class Ui_MainWindow(object):
         # setup combo box for selecting algorithms to run on graph
         self.select_path_alg_comboBox = SceneConnectedComboBox(self.centralwidget, self.scene) # box requires reference to scene 
         self.select_path_alg_comboBox.setEditable(False)
-        self.select_path_alg_comboBox.addItems(['DIJKSTRA','BELLMAN FORD', 'PRIMS']) # algorithms that can be run
+        self.select_path_alg_comboBox.addItems(['DIJKSTRA','BELLMAN FORD', 'ALL PAIRS', 'PRIMS']) # algorithms that can be run
         self.select_path_alg_comboBox.setMaxVisibleItems(8)
         self.select_path_alg_comboBox.setObjectName("select_path_alg_comboBox")
         self.select_path_alg_comboBox.setCurrentIndex(0)
@@ -227,14 +245,42 @@ class Ui_MainWindow(object):
         # set as central widget
         self.MainWindow.setCentralWidget(self.centralwidget)
 
-        # help menu setup
+        # file menu setup
         self.menubar = QtWidgets.QMenuBar(self.MainWindow)
         self.menubar.setGeometry(QtCore.QRect(0, 0, 1225, 31))
         self.menubar.setObjectName("menubar")
+        openAction = QtWidgets.QAction('&Open...', self.MainWindow) # action loading a graph from a file
+        openAction.setShortcut('Ctrl+O')
+        openAction.setStatusTip('load a graph from a file')
+        openAction.triggered.connect(lambda: self.open_graph_file())
+        saveAction = QtWidgets.QAction('&Save As...', self.MainWindow) # action saving the graph to a file
+        saveAction.setShortcut('Ctrl+S')
+        saveAction.setStatusTip('save the graph to a file')
+        saveAction.triggered.connect(lambda: self.save_graph_file())
+        self.menuFile = QtWidgets.QMenu(self.menubar)
+        self.menuFile.setObjectName("menuFile")
+        self.menuFile.addAction(openAction)
+        self.menuFile.addAction(saveAction)
+
+        # layout menu setup
+        layoutAction = QtWidgets.QAction('&Lay Out Graph', self.MainWindow) # action placing every node
+        layoutAction.setShortcut('Ctrl+L')
+        layoutAction.setStatusTip('place the nodes with a force directed layout')
+        layoutAction.triggered.connect(lambda: self.scene.auto_layout())
+        layoutSelectedAction = QtWidgets.QAction('Lay Out &Around Selected', self.MainWindow) # action placing selected nodes
+        layoutSelectedAction.setShortcut('Ctrl+Shift+L')
+        layoutSelectedAction.setStatusTip('place the selected nodes and their neighbours, leaving other nodes in place')
+        layoutSelectedAction.triggered.connect(lambda: self.layout_selected())
+        self.menuLayout = QtWidgets.QMenu(self.menubar)
+        self.menuLayout.setObjectName("menuLayout")
+        self.menuLayout.addAction(layoutAction)
+        self.menuLayout.addAction(layoutSelectedAction)
+
+        # help menu setup
         helpAction = QtWidgets.QAction('&Open Help', self.MainWindow) # action pulling up a help menu      
         helpAction.setShortcut('Ctrl+H')
         helpAction.setStatusTip('application help')
-        helpAction.triggered.connect(lambda: webbrowser.open("GraphGuiHelp.pdf")) # open help file
+        helpAction.triggered.connect(lambda: self.open_help()) # open help file
         self.menuHelp = QtWidgets.QMenu(self.menubar)
         self.menuHelp.setObjectName("menuHelp")
         self.menuHelp.addAction(helpAction)
@@ -242,6 +288,8 @@ class Ui_MainWindow(object):
         self.statusbar = QtWidgets.QStatusBar(self.MainWindow)
         self.statusbar.setObjectName("statusbar")
         self.MainWindow.setStatusBar(self.statusbar)
+        self.menubar.addAction(self.menuFile.menuAction())
+        self.menubar.addAction(self.menuLayout.menuAction())
         self.menubar.addAction(self.menuHelp.menuAction())
         self.retranslateUi(self.MainWindow) # call retranslateUi function
         QtCore.QMetaObject.connectSlotsByName(self.MainWindow)
@@ -249,6 +297,19 @@ class Ui_MainWindow(object):
         self.button_setup()
         
 
+    def setup_accelerated_view(self):
+        # render through an OpenGL viewport.  A GL viewport redraws in full each frame, so qt is told to do full
+        # updates instead of tracking dirty regions, and painter state saving and antialias padding are skipped
+        viewport = QtWidgets.QOpenGLWidget()
+        surface_format = QtGui.QSurfaceFormat()
+        surface_format.setSamples(4) # multisampling smooths lines without the cost of antialiased painting
+        viewport.setFormat(surface_format)
+        self.graphView.setViewport(viewport)
+        self.graphView.setViewportUpdateMode(QtWidgets.QGraphicsView.FullViewportUpdate)
+        self.graphView.setCacheMode(QtWidgets.QGraphicsView.CacheNone)
+        self.graphView.setOptimizationFlags(QtWidgets.QGraphicsView.DontSavePainterState |
+                                            QtWidgets.QGraphicsView.DontAdjustForAntialiasing)
+
     def button_setup(self):
 
         # connect edit_path_algorithm to combobox
@@ -261,30 +322,58 @@ class Ui_MainWindow(object):
         self.switch_graph_btn.clicked.connect(lambda: self.change_graph_type())
 
         # connect update_data function to signal 
-        self.scene.data_updater.signal.connect(lambda: self.update_data())
+        self.scene.data_updater.signal.connect(lambda flags: self.update_data(flags))
+
+        # connect show_progress function to progress of algorithms running in the background
+        self.scene.data_updater.progress.connect(lambda percent: self.show_progress(percent))
 
     def change_graph_type(self):
         _translate = QtCore.QCoreApplication.translate
-        (nodes, edges) = self.MainWindow.switch_graph_type() # switch graph type and get previously used nodes and edges from old graph
-        self.setupUi(self.MainWindow) # reset the UI with the modified MainWindow 
+        self.scene.deselect_nodes() # remove selections
+        self.scene.set_digraph(not self.scene.digraph) # switch graph type, keeping the scene's nodes and edges
+        self.show_graph_type()
+        self.scene.update()
+
+    def show_graph_type(self):
+        _translate = QtCore.QCoreApplication.translate
         if self.scene.digraph: # if changed to digraph
             self.switch_graph_btn.setText(_translate("MainWindow", "TO GRAPH")) # button to change to graph
         else: 
             self.switch_graph_btn.setText(_translate("MainWindow", "TO DIGRAPH")) # button to change to digraph
-        
-        for node_val, node in nodes.items(): # for each node that was in the original graph
-            node.selected = False 
-            node.highlighted = False # remove higlights or selctions
-            self.scene.addItem(node) # add the node to the windows graph scene
-            self.scene.nodes[node_val] = node  # add the node to the scene's dictionary
-            self.scene.graph.add_node(node_val) # add the node to the scene's underlying graph
-
-        for (from_node, to_node), edge in edges.items(): # for each edge in the original graph
-            self.scene.add_edge(from_node, to_node, edge.weight) # add it to the new graph
-            if self.scene.digraph: # if changed from graph to digraph
-                self.scene.add_edge(to_node, from_node, edge.weight) # add edges in both directions
+
+    def open_help(self):
+        import webbrowser # only needed if help is opened
+        webbrowser.open("GraphGuiHelp.pdf")
+
+    def open_graph_file(self):
+        # replace the graph with one loaded from a file chosen in a dialog
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self.MainWindow, 'Open Graph', '', GRAPH_FILE_FILTER)
+        if not path: return # dialog was cancelled
+        self.scene.deselect_nodes() # remove selections
+        try:
+            self.scene.load_graph(path)
+        except (OSError, ValueError, ParseError) as error: # unreadable file, parts of it may have been loaded
+            self.scene.invalid_input('Could not load ' + path + ': ' + str(error))
+        self.show_graph_type()
+        self.graphView.fitInView(self.scene.itemsBoundingRect(), QtCore.Qt.KeepAspectRatio) # show the whole graph
+
+    def save_graph_file(self):
+        # save the graph and its layout to a file chosen in a dialog
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self.MainWindow, 'Save Graph', '', GRAPH_FILE_FILTER)
+        if not path: return # dialog was cancelled
+        try:
+            self.scene.save_graph(path)
+        except (OSError, ValueError) as error:
+            self.scene.invalid_input('Could not save ' + path + ': ' + str(error))
         
  
+    def layout_selected(self):
+        # lay out the selected nodes and the nodes next to them
+        if not self.scene.selected:
+            self.scene.invalid_input('Select the nodes to lay out')
+            return
+        self.scene.auto_layout(self.scene.selected_vals())
+
     def edit_path_algorithm(self):
 
         # when algorithm combo box is edited reset the graph scenes current algorithm
@@ -318,31 +407,41 @@ class Ui_MainWindow(object):
         self.switch_graph_btn.setText(_translate("MainWindow", "TO GRAPH"))
         
             
+        self.menuFile.setTitle(_translate("MainWindow", "File"))
+        self.menuLayout.setTitle(_translate("MainWindow", "Layout"))
         self.menuHelp.setTitle(_translate("MainWindow", "Help"))
 
-    @QtCore.pyqtSlot()
-    def update_data(self):
-        # function is called when signel is sent indicating the graph has been updated 
+    @QtCore.pyqtSlot(int)
+    def update_data(self, flags=UpdateData.ALL):
+        # function is called when signel is sent indicating the graph has been updated, flags tell which parts changed
         _translate = QtCore.QCoreApplication.translate
 
-        if self.scene.path_displayed[0]: # if a path is being displayed indicate that it is and fill in relavent data from graph 
-            self.path_shown_yes_no.setText(_translate("MainWindow", "YES"))   
-            self.node1_val_lab.setText(_translate("MainWindow", str(self.scene.path_displayed[1])))
-            self.node2__val_lab.setText(_translate("MainWindow", str(self.scene.path_displayed[2])))
-            self.dist_val_lab.setText(_translate("MainWindow", str(self.scene.path_displayed[3])))
-        else: # if no path indicate that nothing is shown
-            self.path_shown_yes_no.setText(_translate("MainWindow", "NO"))
-            self.node1_val_lab.setText(_translate("MainWindow", "N/A"))
-            self.node2__val_lab.setText(_translate("MainWindow", "N/A"))
-            self.dist_val_lab.setText(_translate("MainWindow", "N/A"))
-
-        # set label to indicate if graph is connected
-        if self.scene.graph.is_connected(): self.graph_status.setText(_translate("MainWindow", "YES"))
-        else: self.graph_status.setText(_translate("MainWindow", "NO"))
+        if flags & UpdateData.PATH: # only refresh the path labels if the displayed path changed
+            if self.scene.path_displayed[0]: # if a path is being displayed indicate that it is and fill in relavent data from graph 
+                self.path_shown_yes_no.setText(_translate("MainWindow", "YES"))   
+                self.node1_val_lab.setText(_translate("MainWindow", str(self.scene.path_displayed[1])))
+                self.node2__val_lab.setText(_translate("MainWindow", str(self.scene.path_displayed[2])))
+                self.dist_val_lab.setText(_translate("MainWindow", str(self.scene.path_displayed[3])))
+            else: # if no path indicate that nothing is shown
+                self.path_shown_yes_no.setText(_translate("MainWindow", "NO"))
+                self.node1_val_lab.setText(_translate("MainWindow", "N/A"))
+                self.node2__val_lab.setText(_translate("MainWindow", "N/A"))
+                self.dist_val_lab.setText(_translate("MainWindow", "N/A"))
+
+        if flags & (UpdateData.NODES | UpdateData.EDGES): # connectivity only changes with the nodes or edges
+            # set label to indicate if graph is connected
+            if self.scene.graph.is_connected(): self.graph_status.setText(_translate("MainWindow", "YES"))
+            else: self.graph_status.setText(_translate("MainWindow", "NO"))
 
         #show the current number of edges and nodes in graph
-        self.num_nodes_val.setText(_translate("MainWindow", str(len(self.scene.nodes))))
-        self.num_edges_val.setText(_translate("MainWindow", str(len(self.scene.edges))))
+        if flags & UpdateData.NODES: self.num_nodes_val.setText(_translate("MainWindow", str(len(self.scene.nodes))))
+        if flags & UpdateData.EDGES: self.num_edges_val.setText(_translate("MainWindow", str(len(self.scene.edges))))
+
+    def show_progress(self, percent):
+        # show the progress of an algorithm running in the background in the status bar, percent is -1 when it stops
+        _translate = QtCore.QCoreApplication.translate
+        if percent < 0: self.statusbar.clearMessage()
+        else: self.statusbar.showMessage(_translate("MainWindow", "Running " + self.scene.current_path_algo + "... " + str(percent) + "%"))
 
 class SceneConnectedComboBox(QtWidgets.QComboBox):
 
@@ -357,50 +456,70 @@ class SceneConnectedComboBox(QtWidgets.QComboBox):
          
 
 class MainGraphWindow(QtWidgets.QMainWindow):
-    def __init__(self):
+    def __init__(self, accelerated=False):
         # initialize the main window of the GUI
         super().__init__()
 
-        self.graph_scene = GraphScene(True) # initialize it with a graph scene
+        self.accelerated = accelerated # use an OpenGL view and draw all edges as one item
+        self.graph_scene = GraphScene(True, self.accelerated) # initialize it with a graph scene
         
-        self.app = QtWidgets.QApplication([])
-        self.screen_resolution = app.desktop().screenGeometry()
+        self.app = QtWidgets.QApplication.instance() # application the window was created in
+        self.screen_resolution = self.app.desktop().screenGeometry()
         self.width = self.screen_resolution.width()
         self.height = self.screen_resolution.height()  
 
-        self.init_control_pane() # also intitialize with a control panel
+        self.GraphControlWindow = None
+        self.setGeometry(self.width//4+5, 40, 3*self.width//4, self.height-100) # main window take up 3/4 of the total width of the screen
+        QtCore.QTimer.singleShot(0, self.init_control_pane) # also intitialize with a control panel, once the main window is up
         
 
     def init_control_pane(self):
-        self.setGeometry(self.width/4+5, 40, 3*self.width/4, self.height-100) # main window take up 3/4 of the total width of the screen
+        from GraphControlPanelGui import Ui_GraphControlWindow as GraphControlPanel # imported when first shown
         self.GraphControlWindow = QtWidgets.QWidget() # create an new control panel window
         ui = GraphControlPanel()
         ui.setupUi(self.GraphControlWindow, self.graph_scene)
-        self.GraphControlWindow.setGeometry(0,40,self.width/4,self.height-100) # control panel takes 1/4 of the total width of the screen
+        self.GraphControlWindow.setGeometry(0,40,self.width//4,self.height-100) # control panel takes 1/4 of the total width of the screen
         self.GraphControlWindow.show() # display control panel
+        mark_startup('control panel')
 
-    def switch_graph_type(self):
-        
-        edges = self.graph_scene.edges
-        nodes = self.graph_scene.nodes
-        digraph = not self.graph_scene.digraph
-        
-        self.graph_scene = GraphScene(digraph)
-
-        self.init_control_pane() # also intitialize with a control panel
-        
-        return ((nodes, edges)) 
-        
-                
     def closeEvent(self, event):
-        self.GraphControlWindow.close() # when the main window is closed the control panel must also close
+        if self.GraphControlWindow is not None:
+            self.GraphControlWindow.close() # when the main window is closed the control panel must also close
+
+
+def mark_startup(phase):
+    # note the time a part of starting up finished
+    if startup_times is not None: startup_times.append((phase, time.perf_counter()))
+
+def report_startup():
+    # print how long each part of starting up took to stderr, then stop recording
+    global startup_times
+    print('startup phase            ms', file=sys.stderr)
+    for (phase, finished), (previous, started) in zip(startup_times[1:], startup_times):
+        print('%-22s %6.1f' % (phase, (finished - started) * 1000), file=sys.stderr)
+    print('%-22s %6.1f' % ('total', (startup_times[-1][1] - startup_times[0][1]) * 1000), file=sys.stderr)
+    print(str(len(sys.modules)) + ' modules loaded, run with python -X importtime for the time each took', file=sys.stderr)
+    startup_times = None
 
 
 if __name__ == "__main__":
     import sys
-    app = QtWidgets.QApplication(sys.argv)
-    MainWindow = MainGraphWindow()
+    import argparse
+    parser = argparse.ArgumentParser(description='Graph GUI')
+    parser.add_argument('--opengl', action='store_true', help='use an OpenGL view and batched edge drawing for very large graphs')
+    parser.add_argument('--profile-startup', action='store_true', help='print how long each part of starting up took, then exit')
+    args, qt_args = parser.parse_known_args() # remaining arguments are left for qt
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
+    mark_startup('QApplication')
+    MainWindow = MainGraphWindow(args.opengl)
+    mark_startup('main window')
     ui = Ui_MainWindow()
     ui.setupUi(MainWindow)
+    mark_startup('window layout')
     MainWindow.show()
+    mark_startup('show')
+    if args.profile_startup: # runs after the control panel is built, which was queued first
+        QtCore.QTimer.singleShot(0, lambda: (mark_startup('first events'), report_startup(), app.quit()))
+    else:
+        startup_times = None # nothing to report
     sys.exit(app.exec_())
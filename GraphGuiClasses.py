@@ -1,7 +1,11 @@
-from PyQt5 import QtCore, QtGui, QtWidgets, QtOpenGL
+from PyQt5 import QtCore, QtGui, QtWidgets
 import PyGraph.SGraph as graph
-import PyGraph.graph_path_algorithm as path_alg
+from PyGraph.all_pairs import AllPairsPaths
+from PyGraph.path_cache import PathCache
+import PyGraph.graph_io as graph_io
+import PyGraph.layout as graph_layout
 import math
+import contextlib
 
 ''' Graph GUI Classes
   
@@ -12,66 +16,184 @@ import math
     Changes made:  Included functionality for directed graph edges that include arrow heads to indicate direction. Functionality
     for running Bellman Ford algorithm added. 
 
+    Modified: 10/18/2026
+    Changes made: added the ALL PAIRS path algorithm, which answers path queries from cached all pairs results.
+    Path algorithms are run through a PathCache so edits that cannot change a displayed result do not recompute it.
+    Edges report bounds that fit their line, arrow and weight label so the scene index can cull them.  Items are
+    stacked with z values (edges, highlighted edges, nodes) instead of being removed and re-added to the scene.
+    Pens, brushes, fonts and arrow heads are created once rather than on every paint, and arrow heads, weights and
+    node labels are skipped when zoomed out.  Scenes created with batched_edges draw all edges with one EdgeLayer
+    item instead of an item per edge, for graphs with too many edges to paint one at a time
+    Changes are signaled through UpdateData.notify, which sends one signal per event loop pass with flags saying
+    what changed, rather than a signal for every operation.  Edits can be grouped with the batch context manager or
+    add_edges_bulk so the displayed path and signals are refreshed once for the whole group, and bulk edits index
+    their items in one pass.  Nodes can be added from code with add_node_at.  The scene keeps the edges connected to each node, so removing or
+    replacing a node only visits its own edges.  Algorithms on large graphs run on a thread pool from a frozen
+    snapshot of the graph, report their progress, and are cancelled when the graph is edited.  set_digraph switches
+    between a graph and a digraph without rebuilding the scene.  Nodes are found under the mouse through a grid index
+    of their positions instead of itemAt, dragging with the right button selects every node in an area, and the
+    selection is kept in an ordered dictionary.  Graphs can be saved to and loaded from edge list, GraphML or binary
+    files with save_graph and load_graph.  The unused QtOpenGL module is no longer imported.  auto_layout places nodes
+    with a force directed layout, on a background thread for large graphs, and nodes loaded without a position are
+    placed with it.  move_nodes moves nodes and their edges.  ALL PAIRS searches each path on its own for graphs
+    with more than ALL_PAIRS_SIZE nodes rather than building all pairs results
+
     Description:
         This file contains objects for graphically displaying nodes and edges of a graph as well as the results of graph traversals.
 
 '''       
         
 class Node(QtWidgets.QGraphicsItem):
+    Z_VALUE = 2 # nodes are stacked above all edges
+    LABEL_DETAIL = 0.4 # node labels are not drawn when zoomed out below this level of detail
+    _resources = None # pens, brushes and fonts shared by every node, created on first paint
+
+    @classmethod
+    def paint_resources(cls):
+        # create the shared painting resources once a QApplication exists
+        if cls._resources is None:
+            cls._resources = {
+                'selected': (QtGui.QPen(QtCore.Qt.green), QtGui.QBrush(QtGui.QColor(255, 50, 0, 255))), # red
+                'highlighted': (QtGui.QPen(QtCore.Qt.green), QtGui.QBrush(QtGui.QColor(165, 255, 0, 255))), # green
+                'normal': (QtGui.QPen(QtCore.Qt.red), QtGui.QBrush(QtGui.QColor(255, 165, 0, 255))), # orange
+                'text': QtGui.QPen(QtCore.Qt.black),
+                'fonts': {}, # label length -> font, longer labels use smaller text
+            }
+        return cls._resources
+
+    @classmethod
+    def label_font(cls, length):
+        fonts = cls.paint_resources()['fonts']
+        if length not in fonts:
+            font = QtGui.QFont('Decorative')
+            font.setPointSizeF(10/max(length, 1) + 5)
+            fonts[length] = font
+        return fonts[length]
+
     def __init__(self, x, y, val):
      
         super().__init__()
+        self.setZValue(Node.Z_VALUE)
         
-        self.x = x # set x coordinate of node
-        self.y = y # set y coordinate of node
         self.val = val # set node value
         self.highlighted = False 
         self.selected = False
+        self.set_position(x, y)
         
     
     def paint(self, painter, option, widget):
-
+        resources = Node.paint_resources()
         if self.selected:
-            # if the node is seleted paint it red
-            painter.setPen(QtCore.Qt.green)
-            painter.setBrush(QtGui.QColor(255,50, 0, 255))
+            pen, brush = resources['selected'] # if the node is seleted paint it red
         elif self.highlighted:
-            # if the node is highlighted paint it green
-            painter.setPen(QtCore.Qt.green)
-            painter.setBrush(QtGui.QColor(165,255, 0, 255))
+            pen, brush = resources['highlighted'] # if the node is highlighted paint it green
         else:
-            # otehrwise paint it orange
-            painter.setPen(QtCore.Qt.red)
-            painter.setBrush(QtGui.QColor(255, 165, 0, 255))
+            pen, brush = resources['normal'] # otherwise paint it orange
+        painter.setPen(pen)
+        painter.setBrush(brush)
         # paint the node to the scene
-        painter.drawEllipse(QtCore.QRect(self.x, self.y, 40, 40))
-        painter.setPen(QtCore.Qt.black)
-        painter.setFont(QtGui.QFont('Decorative', (10/len(str(self.val)) + 5)))
-        painter.drawText(QtCore.QRect(self.x, self.y, 40, 40), QtCore.Qt.AlignCenter, self.val)
+        painter.drawEllipse(self.rect)
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < Node.LABEL_DETAIL:
+            return # label would be too small to read
+        painter.setPen(resources['text'])
+        painter.setFont(Node.label_font(len(str(self.val))))
+        painter.drawText(self.rect, QtCore.Qt.AlignCenter, str(self.val))
         
 
+    def set_position(self, x, y):
+        # move the node; edges attached to it must then have update_position called
+        self.prepareGeometryChange() # let the scene index know the bounds are changing
+        self.x = x # set x coordinate of node
+        self.y = y # set y coordinate of node
+        self.rect = QtCore.QRectF(x, y, 40, 40)
+
     def boundingRect(self):
-        return QtCore.QRectF(self.x,self.y,37,37)
+        return QtCore.QRectF(self.x-1, self.y-1, 42, 42) # 40 pixel circle plus its outline
 
 
 
 class Edge(QtWidgets.QGraphicsItem):
+    Z_VALUE = 0 # edges are stacked below nodes
+    HIGHLIGHTED_Z_VALUE = 1 # highlighted edges are stacked over other edges
+    DETAIL = 0.5 # arrow heads and weights are not drawn when zoomed out below this level of detail
+    _resources = None # pens, brushes and fonts shared by every edge, created on first use
+
+    @classmethod
+    def paint_resources(cls):
+        # create the shared painting resources once a QApplication exists
+        if cls._resources is None:
+            def pen(color):
+                pen = QtGui.QPen(color)
+                pen.setWidth(3)
+                return pen
+            cls._resources = {
+                'line': pen(QtGui.QColor(250, 100, 100, 255)), # red
+                'highlighted line': pen(QtGui.QColor(50, 175, 50, 200)), # green
+                'thin line': QtGui.QPen(QtGui.QColor(250, 100, 100, 255), 0), # one pixel wide at any zoom
+                'arrow': (pen(QtCore.Qt.red), QtGui.QBrush(QtGui.QColor(250, 100, 100, 255))),
+                'highlighted arrow': (pen(QtCore.Qt.green), QtGui.QBrush(QtGui.QColor(165, 255, 0, 255))),
+                'text': QtGui.QPen(QtCore.Qt.black),
+                'directed font': QtGui.QFont('Decorative', 9),
+                'font': QtGui.QFont('Decorative', 11),
+            }
+        return cls._resources
+
     def __init__(self, node1, node2 ,weight, directed):
        
         super().__init__()
+        self.setZValue(Edge.Z_VALUE)
         self.directed = directed
         self.node1 = node1 # set node at one end of edge
         self.node2 = node2 # set node at other end of edge
-        self.x1 = node1.x+20 # set x coordinate of one end of edge
-        self.y1 = node1.y+20 # set y coordinate of one end of edge
-        self.x2 = node2.x+20 # set x coordinate of other end of edge
-        self.y2 = node2.y+20 # set y coordinate of other end of edge
-    
         self.weight = weight # set edge weight of edge
-        self.midx = (self.x1+self.x2)/2 # find midpoint x cooridinate of edge
-        self.midy = (self.y1+self.y2)/2 # find midpoint y cooridinate of edge
         self.strWeight = str(weight) # get weight as string
         self.highlighted = False
+        self.update_position()
+
+    def set_directed(self, directed, weight):
+        # change the edge between an undirected and a directed edge, possibly with a new weight
+        self.directed = directed
+        self.weight = weight
+        self.strWeight = str(weight)
+        self.update_position() # label and arrow head change
+
+    def set_highlighted(self, highlighted):
+        self.highlighted = highlighted
+        self.setZValue(Edge.HIGHLIGHTED_Z_VALUE if highlighted else Edge.Z_VALUE) # raise highlighted edges over the others
+
+    def update_position(self):
+        # recompute the edge geometry from the positions of its nodes, called when created or when a node moves
+        self.prepareGeometryChange() # let the scene index know the bounds are changing
+        self.x1 = self.node1.x+20 # set x coordinate of one end of edge
+        self.y1 = self.node1.y+20 # set y coordinate of one end of edge
+        self.x2 = self.node2.x+20 # set x coordinate of other end of edge
+        self.y2 = self.node2.y+20 # set y coordinate of other end of edge
+        self.midx = (self.x1+self.x2)/2 # find midpoint x cooridinate of edge
+        self.midy = (self.y1+self.y2)/2 # find midpoint y cooridinate of edge
+
+        if self.directed: # if digraph, draw edge weight closer to arrow
+            quartX = (self.midx+self.x2)/2 # get x coordinate of point between distination node and edge midpoint
+            quartY = (self.midy+self.y2)/2 # get y component for same point
+            self.label_pos = QtCore.QPointF(quartX, quartY)
+            self.label = self.strWeight + ':>'+str(self.node2.val) # string to indicate towards which node this weight applies to 
+            self.label_font = Edge.paint_resources()['directed font']
+        else: # otherwise draw weight near midpoint of edge
+            self.label_pos = QtCore.QPointF(self.midx - 5*(len(self.strWeight)), self.midy)
+            self.label = self.strWeight
+            self.label_font = Edge.paint_resources()['font']
+
+        self.line = QtCore.QLineF(self.x1, self.y1, self.x2, self.y2)
+        self.arrow = None
+        if self.directed and not self.line.isNull(): # arrow head is only computed when the edge moves, not on every paint
+            point_array = self.get_directed_arrow_points(self.x1, self.y1, self.x2, self.y2, 20) # get coordinates of arrow vertices
+            self.arrow = QtGui.QPolygonF([QtCore.QPointF(x, y) for (x, y) in point_array]) # create a triangle with the given points
+
+        # bounds cover the line, the arrow head (half a node radius either side of the line) and the weight label
+        pad = 12 if self.directed else 2
+        self.bounds = QtCore.QRectF(QtCore.QPointF(self.x1, self.y1), QtCore.QPointF(self.x2, self.y2)).normalized()
+        self.bounds.adjust(-pad, -pad, pad, pad)
+        label_rect = QtGui.QFontMetricsF(self.label_font).boundingRect(self.label)
+        self.bounds = self.bounds.united(label_rect.translated(self.label_pos).adjusted(-1, -1, 1, 1))
 
     def get_directed_arrow_points(self,x1, y1, x2, y2, d):
 
@@ -122,64 +244,191 @@ class Edge(QtWidgets.QGraphicsItem):
 
 
     def paint(self, painter, option, widget):
-        pen = QtGui.QPen()
-        pen.setWidth(3)
-        if self.highlighted:
-            # if edge is highlighted paint it green
-            pen.setColor(QtGui.QColor(50, 175, 50, 200))
-        else:
-            # otherwise paint it red
-            pen.setColor(QtGui.QColor(250, 100, 100, 255))
-        # paint line to represent edge
-        painter.setPen(pen)
-        painter.drawLine(self.x1, self.y1,self.x2,self.y2) # draw line to represent edge
-        
+        resources = Edge.paint_resources()
+        # paint line to represent edge, green if highlighted and red otherwise
+        painter.setPen(resources['highlighted line' if self.highlighted else 'line'])
+        painter.drawLine(self.line) # draw line to represent edge
+
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < Edge.DETAIL:
+            return # arrow and weight would be too small to see
         
-        if self.directed: # if edge is part of a digraph
-            if self.highlighted:
-                # if edge is highlighted paint arrow green
-                pen.setColor(QtCore.Qt.green)
-                painter.setBrush(QtGui.QColor(165,255, 0, 255))
-            else:
-                # otherwise paint it red
-                pen.setColor(QtCore.Qt.red)
-                painter.setBrush(QtGui.QColor(250, 100, 100, 255))
+        if self.arrow is not None: # if edge is part of a digraph
+            pen, brush = resources['highlighted arrow' if self.highlighted else 'arrow']
             painter.setPen(pen)
-            point_array = self.get_directed_arrow_points(self.x1, self.y1, self.x2, self.y2, 20) # get coordinates of arrow vertices
-            points = [QtCore.QPointF(point_array[0][0], point_array[0][1]),
-                      QtCore.QPointF(point_array[1][0], point_array[1][1]), 
-                      QtCore.QPointF(point_array[2][0], point_array[2][1])] # create a list of QPointF
-            arrow = QtGui.QPolygonF(points) # create a triangle with the given points 
-            painter.drawPolygon(arrow) # draw arrow
+            painter.setBrush(brush)
+            painter.drawPolygon(self.arrow) # draw arrow
 
-            # if digraph, draw edge weight closer to arrow
-            quartX = (self.midx+self.x2)/2 # get x coordinate of point between distination node and edge midpoint
-            quartY = (self.midy+self.y2)/2 # get y component for same point
-            strDirection = ':>'+str(self.node2.val) # string to indicate towards which node this weight applies to 
-            painter.setPen(QtCore.Qt.black) # set pen color to black
-            painter.setFont(QtGui.QFont('Decorative', 9)) # set font
-            painter.drawText(quartX, quartY, self.strWeight + strDirection) # draw weight
-
-        else:
-            painter.setPen(QtCore.Qt.black) # pen to black
-            painter.setFont(QtGui.QFont('Decorative', 11)) # set font
-            painter.drawText(self.midx - 5*(len(self.strWeight)), self.midy, self.strWeight) # draw weight near mipoint of edge
+        painter.setPen(resources['text']) # set pen color to black
+        painter.setFont(self.label_font) # set font
+        painter.drawText(self.label_pos, self.label) # draw weight
             
     
     def boundingRect(self):
-        return QtCore.QRectF(0,0,2500,2500)
+        return self.bounds
 
 
 
+class EdgeLayer(QtWidgets.QGraphicsItem):
+    # draws every edge of a scene as a single item, used in place of one Edge item per edge for very large graphs.
+    # the lines of all edges are kept in one painter path, so they are drawn with a single call no matter how many
+    # edges there are.  Arrow heads and weights are only drawn when zoomed in, so they are kept in a grid to find the
+    # few in view.  Highlighted edges are drawn over the layer by their own Edge items
+    CELL_SIZE = 200 # size of the grid cells used to find the arrow heads and weight labels in view
+
+    def __init__(self):
+        super().__init__()
+        self.setZValue(Edge.Z_VALUE)
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption) # paint is told which area is exposed
+        self.edges = set() # Edge objects drawn by the layer
+        self.bounds = QtCore.QRectF() # covers every edge, only grows until invalidate is called
+        self.lines = None # cached paths and grids, built on the next paint
+
+    def add_edge(self, edge):
+        self.edges.add(edge)
+        if not self.bounds.contains(edge.bounds):
+            self.prepareGeometryChange()
+            self.bounds = self.bounds.united(edge.bounds)
+        if self.lines is not None: # extend the cached paths rather than rebuilding them
+            self.add_to_paths(edge)
+        self.update(edge.bounds)
+
+    def remove_edge(self, edge):
+        self.edges.discard(edge)
+        self.lines = None # a path cannot have a part removed, rebuild it on the next paint
+        self.update(edge.bounds) # bounds are left as they are, being larger than needed is harmless
+
+    def invalidate(self):
+        # recompute the bounds and drop the cached paths, call when edges are moved
+        self.prepareGeometryChange()
+        self.bounds = QtCore.QRectF()
+        for edge in self.edges:
+            self.bounds = self.bounds.united(edge.bounds)
+        self.lines = None
+        self.update()
+
+    def build_paths(self):
+        if self.lines is not None: return
+        self.lines = QtGui.QPainterPath() # painter path of every edge line
+        self.label_cells = {} # (column, row) -> edges with their weight label in that grid cell
+        self.arrow_cells = {} # (column, row) -> edges with their arrow head in that grid cell
+        for edge in self.edges:
+            self.add_to_paths(edge)
+
+    def add_to_paths(self, edge):
+        self.lines.moveTo(edge.line.p1())
+        self.lines.lineTo(edge.line.p2())
+        size = EdgeLayer.CELL_SIZE
+        self.label_cells.setdefault((int(edge.label_pos.x()//size), int(edge.label_pos.y()//size)), []).append(edge)
+        if edge.arrow is not None: # arrow heads sit against the end node
+            self.arrow_cells.setdefault((int(edge.x2//size), int(edge.y2//size)), []).append(edge)
+
+    def edges_near(self, cells, rect):
+        # edges in cells that overlap rect or its neighbouring cells
+        size = EdgeLayer.CELL_SIZE
+        rect = rect.adjusted(-size, -size, size, size) # labels and arrows extend from their cell into the next one
+        for column in range(int(rect.left()//size), int(rect.right()//size) + 1):
+            for row in range(int(rect.top()//size), int(rect.bottom()//size) + 1):
+                yield from cells.get((column, row), ())
+
+    def paint(self, painter, option, widget):
+        self.build_paths()
+        resources = Edge.paint_resources()
+        detailed = option.levelOfDetailFromTransform(painter.worldTransform()) >= Edge.DETAIL
+        painter.setPen(resources['line' if detailed else 'thin line']) # one pixel lines are much cheaper to fill when zoomed out
+        painter.setBrush(QtCore.Qt.NoBrush)
+        painter.drawPath(self.lines) # every edge line in one call
+
+        if not detailed:
+            return # arrows and weights would be too small to see
+
+        exposed = option.exposedRect # only arrows and weights in the exposed area are drawn
+        pen, brush = resources['arrow']
+        painter.setPen(pen)
+        painter.setBrush(brush)
+        for edge in self.edges_near(self.arrow_cells, exposed):
+            painter.drawPolygon(edge.arrow)
+
+        painter.setPen(resources['text'])
+        for edge in self.edges_near(self.label_cells, exposed):
+            painter.setFont(edge.label_font)
+            painter.drawText(edge.label_pos, edge.label)
+
+    def boundingRect(self):
+        return self.bounds
+
+    def shape(self):
+        return QtGui.QPainterPath() # clicks pass through the layer to the scene
+
+
+
+class NodeGrid(object):
+    # spatial index of node values by the position of their centers.  The scene is divided into square cells and
+    # each value is kept in the cell holding its center, so finding the nodes near a point or in an area only
+    # looks at the cells that overlap it
+    CELL_SIZE = 100
+
+    def __init__(self):
+        self.cells = {} # (column, row) -> {node value: center point} for the nodes with their center in that cell
+        self.centers = {} # node value -> center point
+
+    def cell(self, point):
+        return (int(point.x()//NodeGrid.CELL_SIZE), int(point.y()//NodeGrid.CELL_SIZE))
+
+    def add(self, val, x, y):
+        # add or move the node with value val to have its center at (x, y)
+        if val in self.centers: self.remove(val)
+        point = QtCore.QPointF(x, y)
+        self.centers[val] = point
+        self.cells.setdefault(self.cell(point), {})[val] = point
+
+    def remove(self, val):
+        key = self.cell(self.centers.pop(val))
+        del self.cells[key][val]
+        if not self.cells[key]: del self.cells[key]
+
+    def vals_in(self, rect):
+        # values of the nodes with their center inside rect
+        size = NodeGrid.CELL_SIZE
+        columns = range(int(rect.left()//size), int(rect.right()//size) + 1)
+        rows = range(int(rect.top()//size), int(rect.bottom()//size) + 1)
+        if len(columns) * len(rows) > len(self.cells): # area is large, visiting the filled cells is quicker
+            cells = [cell for key, cell in self.cells.items() if key[0] in columns and key[1] in rows]
+        else:
+            cells = [self.cells[(column, row)] for column in columns for row in rows if (column, row) in self.cells]
+        return [val for cell in cells for val, point in cell.items() if rect.contains(point)]
+
+    def val_at(self, point):
+        # value of the node drawn under point, the one with the closest center if nodes overlap, or None
+        best, best_dist = None, 20*20 # points within the 20 pixel radius of a node are on it
+        for val in self.vals_in(QtCore.QRectF(point.x()-20, point.y()-20, 40, 40)):
+            center = self.centers[val]
+            dist = (center.x() - point.x())**2 + (center.y() - point.y())**2
+            if dist <= best_dist:
+                best, best_dist = val, dist
+        return best
+
+
 
 class GraphScene(QtWidgets.QGraphicsScene):
-    def __init__(self, digraph):
+    BACKGROUND_SIZE = 20000 # algorithms on graphs with at least this many nodes plus edges run on a worker thread
+    DRAG_DISTANCE = 4 # right button moves further than this are a drag selecting an area rather than a click
+    LOAD_COLUMNS = 40 # nodes loaded from a file without a position are placed in rows of this many
+    ALL_PAIRS_SIZE = 2000 # all pairs results take about 16 bytes per pair of nodes, larger graphs search each path
+
+    def __init__(self, digraph, batched_edges=False):
         super().__init__()
         self.digraph = digraph
         self.setSceneRect(0,0,2500,2500) # set size of graphical scene
         self.nodes = {} # node dictionary
         self.edges = {} # edge dictionary
+        self.incident = {} # node value -> set of the Edge items connected to that node
+        self.highlighted_edges = set() # edges currently highlighted, so clearing a path does not visit every edge
+        self.edge_layer = None # when batched_edges is set, one EdgeLayer item draws all edges instead of an item per edge
+        if batched_edges:
+            self.edge_layer = EdgeLayer()
+            self.addItem(self.edge_layer)
         self.graph = graph.Graph(self.digraph) # graph object to underlay the graphical interface
+        self.path_cache = PathCache(self.graph) # algorithm results, only recomputed when an edit could change them
 
         self.path_displayed = (False, 'NONE','NONE', 'NO PATH') # initialize information about displayed path
         self.current_path_algo = 'DIJKSTRA' # set current path algorithm being used to DIJKSTRA
@@ -191,7 +440,30 @@ class GraphScene(QtWidgets.QGraphicsScene):
         self.InvalidInMsg.setStandardButtons(QtWidgets.QMessageBox.Ok)
         self.InvalidInMsg.setWindowTitle('Invalid input alert!')
 
-        self.selected = []
+        self.selected = {} # selected nodes, in the order they were selected (values are unused)
+        self.node_grid = NodeGrid() # index of node positions for finding nodes under the mouse or in an area
+        self.rubber_band_origin = None # where the right button was pressed
+        self.rubber_band = None # rectangle shown while dragging with the right button
+        self.all_pairs = None # all pairs shortest path results, created when first needed
+
+        self.edit_depth = 0 # number of nested changes in progress, see begin_edit
+        self.edit_flags = 0 # UpdateData flags for the changes in progress
+        self.edit_path_shown = False # whether a path was displayed when the outermost change began
+        self.batch_errors = None # invalid input messages saved during a batch, None outside of batches
+
+        self.thread_pool = QtCore.QThreadPool.globalInstance() # threads for running algorithms on large graphs
+        self.algorithm_signals = AlgorithmSignals() # results sent back from those threads
+        self.algorithm_signals.finished.connect(self.algorithm_finished)
+        self.algorithm_signals.failed.connect(self.algorithm_failed)
+        self.algorithm_signals.progress.connect(self.algorithm_progress)
+        self.algorithm_generation = 0 # increased to cancel the algorithm running in the background
+        self.algorithm_finish = None # function given the result of the algorithm running in the background
+        self.layout_signals = LayoutSignals() # node positions sent back from the layout thread
+        self.layout_signals.positions.connect(self.layout_positions)
+        self.layout_signals.finished.connect(self.layout_finished)
+        self.layout_signals.failed.connect(self.layout_failed)
+        self.layout_generation = 0 # increased to stop the layout running in the background
+        self.layout_applying = False # set while a batch of positions from the layout thread waits to be applied
 
     
     def check_selected(self, requiredNum):
@@ -201,20 +473,62 @@ class GraphScene(QtWidgets.QGraphicsScene):
         
         return True
 
+    def selected_vals(self):
+        # values of the selected nodes in the order they were selected
+        return [node.val for node in self.selected]
+
+    def set_node_selected(self, node, selected):
+        if node.selected == selected: return
+        node.selected = selected
+        if selected: self.selected[node] = None
+        else: del self.selected[node]
+        node.update() # repaint just this node
+
     def deselect_nodes(self):
         for node in self.selected:
             node.selected = False
-        self.selected = []
+            node.update()
+        self.selected = {}
      
     def mousePressEvent(self, event):
         
         if event.button() != QtCore.Qt.LeftButton: # if right button pressed
-            self.select_node(event) # call selectd node function
+            self.rubber_band_origin = event.scenePos() # start of a click or a drag to select nodes in an area
             return
         
         self.add_node(event) # otherwise call add node function
 
         QtWidgets.QGraphicsScene.mousePressEvent(self, event) # call original function to maintain functionality
+
+    def mouseMoveEvent(self, event):
+
+        if self.rubber_band_origin is not None: # if right button held down
+            rect = QtCore.QRectF(self.rubber_band_origin, event.scenePos()).normalized()
+            if self.rubber_band is None and rect.width() + rect.height() > GraphScene.DRAG_DISTANCE: # drag started
+                self.rubber_band = QtWidgets.QGraphicsRectItem()
+                self.rubber_band.setPen(QtGui.QPen(QtCore.Qt.darkGray, 0, QtCore.Qt.DashLine))
+                self.rubber_band.setZValue(Node.Z_VALUE + 1) # drawn over the nodes
+                self.addItem(self.rubber_band)
+            if self.rubber_band is not None:
+                self.rubber_band.setRect(rect) # show the area being selected
+            return
+
+        QtWidgets.QGraphicsScene.mouseMoveEvent(self, event)
+
+    def mouseReleaseEvent(self, event):
+
+        if self.rubber_band_origin is not None and event.button() != QtCore.Qt.LeftButton: # if right button released
+            if self.rubber_band is None: # button was clicked rather than dragged
+                self.select_node(event) # call selectd node function
+            else: # select every node in the dragged area
+                for node_val in self.node_grid.vals_in(self.rubber_band.rect()):
+                    self.set_node_selected(self.nodes[node_val], True)
+                self.removeItem(self.rubber_band)
+                self.rubber_band = None
+            self.rubber_band_origin = None
+            return
+
+        QtWidgets.QGraphicsScene.mouseReleaseEvent(self, event)
         
 
     def keyPressEvent(self, event):
@@ -235,7 +549,7 @@ class GraphScene(QtWidgets.QGraphicsScene):
     def delete_edge_selected(self):
        
         if self.check_selected(2): # if nodes selected
-            self.remove_edge(self.selected[0].val, self.selected[1].val) # delete edge between them 
+            self.remove_edge(*self.selected_vals()) # delete edge between them 
             self.deselect_nodes() # deselect nodes
         else: # else print error message
             self.InvalidInMsg.setText('Must select 2 nodes to delete edge')
@@ -248,17 +562,16 @@ class GraphScene(QtWidgets.QGraphicsScene):
             weight, ok = QtWidgets.QInputDialog.getText(QtWidgets.QWidget(), 'Input edge weight', 
                  'Enter weight of edge:')  # use dialog to get weight of edge between nodes
             if ok:
-                if self.add_edge(self.selected[0].val, self.selected[1].val, weight): # add edge between selected nodes
+                if self.add_edge(*self.selected_vals(), weight): # add edge between selected nodes
                     self.deselect_nodes() # deselect nodes
         else: # if invalid selection p rint error 
             self.InvalidInMsg.setText('Must select 2 nodes to add edge')
             self.InvalidInMsg.exec_()
 
     def delete_nodes_selected(self): 
-        for node in self.selected: # for each of the selected nodes
-            self.remove_node(node.val) # remove it from the graph
- 
-        self.selected = []
+        with self.batch(): # path and labels are refreshed once after every node is removed
+            for node_val in self.selected_vals(): # for each of the selected nodes
+                self.remove_node(node_val) # remove it from the graph, which also deselects it
 
     def display_path(self):
         if self.current_path_algo == 'PRIMS': # if current path algorithm is prims
@@ -266,29 +579,32 @@ class GraphScene(QtWidgets.QGraphicsScene):
             self.deselect_nodes()# run prims algorithm
         elif self.current_path_algo == 'DIJKSTRA': # if current algorithm is dijkstra
             if self.check_selected(2): # if nodes are selected run dijktra between them
-                self.show_shortest_path_dijkstra(self.selected[0].val, self.selected[1].val)
+                self.show_shortest_path_dijkstra(*self.selected_vals())
                 self.deselect_nodes() # deselect nodes
             else: # else print error
                 self.InvalidInMsg.setText('Must select 2 nodes to find shortest path')
                 self.InvalidInMsg.exec_()
         elif self.current_path_algo == 'BELLMAN FORD': # if current algorithm is bellman ford
             if self.check_selected(2): # if nodes are selected run bellman ford between them
-                self.show_shortest_path_bellman_ford(self.selected[0].val, self.selected[1].val)
+                self.show_shortest_path_bellman_ford(*self.selected_vals())
+                self.deselect_nodes() # deselect nodes
+            else: # else print error
+                self.InvalidInMsg.setText('Must select 2 nodes to find shortest path')
+                self.InvalidInMsg.exec_()
+        elif self.current_path_algo == 'ALL PAIRS': # if current algorithm is all pairs
+            if self.check_selected(2): # if nodes are selected look up the path between them
+                self.show_shortest_path_all_pairs(*self.selected_vals())
                 self.deselect_nodes() # deselect nodes
             else: # else print error
                 self.InvalidInMsg.setText('Must select 2 nodes to find shortest path')
                 self.InvalidInMsg.exec_()
         
     def select_node(self, event):
-        node = self.itemAt(event.scenePos(), QtGui.QTransform()) # get item clicked on at this position in scene
-
-        if type(node) is Node: # if item is a node
-            node.selected = not node.selected # set selected to True
-            if node.selected:
-                self.selected.append(node)
-            else: 
-                self.selected.remove(node)
-        self.update()
+        node_val = self.node_grid.val_at(event.scenePos()) # get node clicked on at this position in scene
+
+        if node_val is not None: # if a node was clicked
+            node = self.nodes[node_val]
+            self.set_node_selected(node, not node.selected) # toggle its selection
     
     def add_node(self, event):
         x = event.scenePos().x() # get x position of mouse
@@ -298,31 +614,36 @@ class GraphScene(QtWidgets.QGraphicsScene):
             'Enter node name:') # use dialog to get node value to be added
         
         if ok: # dialog value was input
-            if len(str(node_val)) < 5 and len(str(node_val)) > 0: # if input was between 1 and 4 characters
-                connections = []
-                path_shown = self.path_displayed[0] # get wether or not a shortest path is currently displayed
-                self.delete_shortest_path() # delete shortest path
-                if node_val in self.nodes: # node being added already exists
-                    connections = self.remove_node(node_val) # remove original node and save all its node connections
-                     
-                node = Node(x-20, y-20, str(node_val)) # create a new node at the given x and y coordinates
-                self.addItem(node) # add node to scene
-                self.nodes[node.val] = node # add node to node dictionary
-                self.graph.add_node(node.val) # add node value to underlying graph objects
-                for connection in connections: # for each of the original node connections
-                    self.add_edge(connection[0], connection[1], connection[2]) # add the original edges
-                 
-            else: 
-                self.InvalidInMsg.setText('Node name must consist of between 1 and 4 characters') # print message if invalid dialog input
-                self.InvalidInMsg.exec_()
-                return
- 
-            # reset path displayed variable to reflect its original value before node was added
-            self.path_displayed = (path_shown, self.path_displayed[1], self.path_displayed[2], self.path_displayed[3]) 
-            if self.path_displayed[0]: # if path was displayed before node was added
-                self.reset_path() # find and display path
-
-            self.data_updater.signal.emit() # emit a signal to notify that the graph was updated
+            self.add_node_at(node_val, x-20, y-20) # center the node on the mouse
+
+    def add_node_at(self, node_val, x, y, limit_length=True):
+        # add a node with its top left corner at x, y, replacing any node with the same value.  Returns the new node, 
+        # or None if the value is invalid.  Names typed in are limited to 4 characters, pass limit_length=False for 
+        # nodes from files, which may have longer labels
+        node_val = str(node_val)
+        if len(node_val) == 0:
+            self.invalid_input('Node name must not be empty')
+            return None
+        if limit_length and len(node_val) >= 5: # if input was not between 1 and 4 characters
+            self.invalid_input('Node name must consist of between 1 and 4 characters') # print message if invalid input
+            return None
+
+        self.begin_edit()
+        connections = []
+        if node_val in self.nodes: # node being added already exists
+            connections = self.remove_node(node_val) # remove original node and save all its node connections
+             
+        node = Node(x, y, node_val) # create a new node at the given x and y coordinates
+        self.addItem(node) # add node to scene
+        self.nodes[node.val] = node # add node to node dictionary
+        self.node_grid.add(node.val, node.x+20, node.y+20) # and its center to the index of node positions
+        self.incident[node.val] = set() # no edges yet
+        self.graph.add_node(node.val) # add node value to underlying graph objects
+        for connection in connections: # for each of the original node connections
+            self.add_edge(connection[0], connection[1], connection[2]) # add the original edges
+
+        self.end_edit(UpdateData.NODES | UpdateData.EDGES)
+        return node
 
 
     def add_edge(self, node1_val, node2_val, weight):
@@ -330,124 +651,288 @@ class GraphScene(QtWidgets.QGraphicsScene):
         try:
             numWeight = float(weight) # try to convert weigth to a float 
         except ValueError: # value error exception if unable to cast weight as a float
-            self.InvalidInMsg.setText('Weight must be a number')
-            self.InvalidInMsg.exec_()
+            self.invalid_input('Weight must be a number')
             return False
 
         if node1_val not in self.nodes: # ensure node value is in dictionary of nodes
-           self.InvalidInMsg.setText('"'+str(node1_val) + '" is not in graph')
-           self.InvalidInMsg.exec_()
+           self.invalid_input('"'+str(node1_val) + '" is not in graph')
            return False
         if node2_val not in self.nodes: # ensure node value is in dictionary of nodes
-           self.InvalidInMsg.setText('"'+str(node2_val) + '" is not in graph')
-           self.InvalidInMsg.exec_()
+           self.invalid_input('"'+str(node2_val) + '" is not in graph')
            return False
         if node2_val == node1_val: # ensure node values are unique
-           self.InvalidInMsg.setText('Two unique node values required to create an edge')
-           self.InvalidInMsg.exec_()
+           self.invalid_input('Two unique node values required to create an edge')
            return False
 
         # get nodes from dictionary
         node2 = self.nodes[node2_val] 
         node1 = self.nodes[node1_val]
 
-        path_shown = self.path_displayed[0] # save whether shortest path is being shown
-        self.delete_shortest_path() # delete shortest path 
+        self.begin_edit()
         if (node1_val, node2_val) in self.edges or ((node2_val, node1_val) in self.edges and not self.digraph): # if edge already exists between given nodes
            self.remove_edge(node1_val, node2_val) # remove edge
            
         edge = Edge(node1, node2, numWeight, self.digraph) # create new edge 
 
-        self.addItem(edge) # add edge to scene
-        self.graph.add_edge(node1.val, node2.val, numWeight) # add edge to underlying graph
-        # reset all nodes in graph so they are layered over the edges
-        for val, node in self.nodes.items():
-            self.removeItem(node)
-            self.addItem(node)
+        self.add_edge_item(edge) # add edge to scene
+        self.graph.add_edge(node1.val, node2.val, numWeight) # add edge to underlying graph, z values keep it below the nodes
           
         self.edges[(node1_val, node2_val)] = edge  # add new edge to list of edges
+        self.incident[node1_val].add(edge) # and to the edges of both its nodes
+        self.incident[node2_val].add(edge)
  
-        self.path_displayed = (path_shown, self.path_displayed[1], self.path_displayed[2], self.path_displayed[3]) # reset path displayed value 
-        if self.path_displayed[0]: # if path was displayed before adding the edge 
-            self.reset_path() # find and display path
-            
-        self.data_updater.signal.emit() # emit a signal to notify that the graph was updated
+        self.end_edit(UpdateData.EDGES)
         return True # return true if edge successfully added
 
+    def add_edges_bulk(self, edges):
+        # add (node1_val, node2_val, weight) edges from an iterable in one batch, indexing the new items once at the end.
+        # Returns the number of edges added
+        added = 0
+        with self.batch(suspend_index=True):
+            for node1_val, node2_val, weight in edges:
+                if self.add_edge(node1_val, node2_val, weight):
+                    added += 1
+        return added
+
     def remove_edge(self, node1_val, node2_val):
         
         if node1_val not in self.nodes: # if node1_val not in nodes dictinary
-           self.InvalidInMsg.setText('"'+str(node1_val) + '" is not in graph')
-           self.InvalidInMsg.exec_() # print message and exit
+           self.invalid_input('"'+str(node1_val) + '" is not in graph') # print message and exit
            return  
 
         if node2_val not in self.nodes: # if node1_val not in nodes dictinary
-           self.InvalidInMsg.setText('"'+str(node2_val) + '" is not in graph')
-           self.InvalidInMsg.exec_() # print message and exit
+           self.invalid_input('"'+str(node2_val) + '" is not in graph') # print message and exit
            return 
 
         if (node1_val, node2_val) not in self.edges: # if edge from node1_val to node2_val not in edges dictionary
             if self.digraph or (node2_val, node1_val) not in self.edges: # and edge from node2_val to node1_val not in edges dictionary
-                self.InvalidInMsg.setText('No edge exists between nodes ' + str(node1_val) + ' and ' + str(node2_val))
-                self.InvalidInMsg.exec_() # print message and exit
+                self.invalid_input('No edge exists between nodes ' + str(node1_val) + ' and ' + str(node2_val)) # print message and exit
                 return 
             else: edge = self.edges[(node2_val, node1_val)] # otherwise represent edge from node2_val, node1_val
         else:
             edge = self.edges[(node1_val, node2_val)] # otherwise represent edge from node1_val, node2_val
         
-        path_shown = self.path_displayed[0] # save whether shortest path is being shown
-        self.delete_shortest_path() # delete shortest path 
+        self.begin_edit()
 
-        self.removeItem(edge) # remove edge from scene
+        self.remove_edge_item(edge) # remove edge from scene
         self.graph.remove_edge(node1_val, node2_val) # remove edge from underlaying graph
 
         del self.edges[(edge.node1.val, edge.node2.val)] # delete edge from edges dictionary
+        self.incident[edge.node1.val].discard(edge)
+        self.incident[edge.node2.val].discard(edge)
         
-        self.path_displayed = (path_shown, self.path_displayed[1], self.path_displayed[2], self.path_displayed[3])
-        if self.path_displayed[0]: # if path was being displayed
-            self.reset_path() # find shortest path
-
-        self.data_updater.signal.emit() # emit a signal to notify that the graph was updated
+        self.end_edit(UpdateData.EDGES)
 
     def remove_node(self, node_val):
 
         if node_val not in self.nodes: # if node value not in dictionary
-           self.InvalidInMsg.setText(str(node_val) + ' is not in graph')
-           self.InvalidInMsg.exec_() # print message and exit
+           self.invalid_input(str(node_val) + ' is not in graph') # print message and exit
            return
 
-        path_shown = self.path_displayed[0] # save whether shortest path is being shown
-        self.delete_shortest_path() # delete shortest path 
+        self.begin_edit()
 
         connections = []
-        for node_pair in self.edges.keys(): # for each edge in graph
-            if node_pair[0] == node_val or node_pair[1] == node_val: # if edge connects to this node
-                connections.append((node_pair[0], node_pair[1], self.edges[node_pair].weight)) # save the connection in list
+        for edge in self.incident[node_val]: # for each edge connected to this node
+            connections.append((edge.node1.val, edge.node2.val, edge.weight)) # save the connection in list
 
         for connection in connections: # for all connections
             self.remove_edge(connection[0], connection[1]) # remove edges from graph
         
-        self.removeItem(self.nodes[node_val]) # remove the node from the scene
+        node = self.nodes[node_val]
+        if node.selected: self.set_node_selected(node, False) # a removed node cannot stay selected
+        self.node_grid.remove(node_val)
+        self.removeItem(node) # remove the node from the scene
         self.graph.remove_node(node_val) # remove the node from the underlaying graph
         del self.nodes[node_val] # delete the node from the node dictionary
+        del self.incident[node_val]
 
-        self.path_displayed = (path_shown, self.path_displayed[1], self.path_displayed[2], self.path_displayed[3])
-        if self.path_displayed[0]: # if the shortest path was being displayed
-            self.reset_path()# find shortest path with edited graph
-
-        self.data_updater.signal.emit() # emit a signal to notify that the graph was updated
+        self.end_edit(UpdateData.NODES | UpdateData.EDGES)
         return connections # return the connections that were deleted
 
+    def set_digraph(self, digraph):
+        # convert the scene between a graph and a digraph in place, keeping its node and edge items.  A graph edge becomes
+        # edges in both directions, and two opposite digraph edges become one graph edge with the lighter weight
+        if digraph == self.digraph: return
+        with self.batch(suspend_index=digraph): # a digraph adds an item for each edge
+            self.graph.set_digraph(digraph) # convert the underlying graph
+            self.digraph = digraph
+            edges = {}
+            for (node1_val, node2_val), edge in self.edges.items():
+                weight = self.graph.edges_dict[(node1_val, node2_val)] # lighter weight when merging opposite edges
+                if not digraph and (node2_val, node1_val) in edges: # opposite edge already kept
+                    self.remove_edge_item(edge)
+                    self.incident[node1_val].discard(edge)
+                    self.incident[node2_val].discard(edge)
+                    continue
+                edge.set_directed(digraph, weight) # reuse the item
+                edges[(node1_val, node2_val)] = edge
+                if digraph: # add the edge in the other direction
+                    reverse = Edge(edge.node2, edge.node1, weight, True)
+                    self.add_edge_item(reverse)
+                    edges[(node2_val, node1_val)] = reverse
+                    self.incident[node1_val].add(reverse)
+                    self.incident[node2_val].add(reverse)
+            self.edges = edges
+            if self.edge_layer is not None:
+                self.edge_layer.invalidate() # arrows and labels of every edge changed
+
+    def load_graph(self, path):
+        # replace the scene's graph with one read from a file, streaming its nodes and edges into the scene.  Nodes saved
+        # without a position are placed by auto_layout.  Raises OSError or ValueError if the file cannot be read
+        digraph, records = graph_io.iter_graph(path, self.digraph)
+        self.layout_generation += 1 # stop laying out the old graph
+        unplaced = [] # values of the nodes without a position
+        with self.batch(suspend_index=True):
+            for node_val in list(self.nodes): # remove the current graph
+                self.remove_node(node_val)
+            self.edit_path_shown = False # the old path does not apply to the new graph
+            self.set_digraph(digraph)
+            self.add_edges_bulk(self.place_nodes(records, unplaced))
+        self.setSceneRect(self.itemsBoundingRect().united(QtCore.QRectF(0, 0, 2500, 2500))) # grow scene to fit the graph
+        if unplaced and len(unplaced) == len(self.nodes): # lay out the whole graph
+            self.auto_layout()
+        elif unplaced: # place the rest around the nodes that have positions
+            self.auto_layout(unplaced, hops=0, keep_positions=False)
+
+    def place_nodes(self, records, unplaced):
+        # add the nodes from file records to the scene, yielding the edges to be added once their nodes exist.  The values
+        # of nodes without a position are appended to unplaced
+        for record in records:
+            if record[0] == 'node' and record[2] is not None:
+                self.add_node_at(record[1], record[2], record[3], limit_length=False)
+                continue
+            # edge lists name most nodes only through their edges
+            new_vals = record[1:2] if record[0] == 'node' else dict.fromkeys(record[1:3])
+            for node_val in new_vals:
+                if node_val not in self.nodes: # lay out nodes without a position in rows until they are placed
+                    placed = len(unplaced)
+                    x, y = (placed % GraphScene.LOAD_COLUMNS) * 80 + 20, (placed // GraphScene.LOAD_COLUMNS) * 80 + 20
+                    if self.add_node_at(node_val, x, y, limit_length=False) is not None:
+                        unplaced.append(str(node_val))
+            if record[0] == 'edge':
+                yield record[1:]
+
+    def save_graph(self, path):
+        # write the graph and its node positions to a file, in the format given by its extension
+        graph_io.save_graph(self.graph, path, {node_val: (node.x, node.y) for node_val, node in self.nodes.items()})
+
+    def move_nodes(self, positions):
+        # move nodes to the top left positions in a dictionary of node value -> (x, y), skipping values no longer in the
+        # scene, and move the edges connected to them
+        edges = set()
+        rect = self.sceneRect()
+        for node_val, (x, y) in positions.items():
+            node = self.nodes.get(node_val)
+            if node is None: continue
+            node.set_position(x, y)
+            self.node_grid.add(node_val, x+20, y+20)
+            edges |= self.incident[node_val]
+            rect = rect.united(QtCore.QRectF(x, y, 40, 40))
+        for edge in edges:
+            edge.update_position()
+        if self.edge_layer is not None and edges:
+            self.edge_layer.invalidate()
+        self.setSceneRect(rect) # grow scene to fit the moved nodes
+
+    def auto_layout(self, node_vals=None, hops=1, keep_positions=True):
+        # place nodes with a force directed layout.  Without node_vals the whole graph is laid out afresh, otherwise
+        # only those nodes and the nodes within hops edges of them move, such as to fit in nodes just added.  Their
+        # current positions are ignored when keep_positions is False.  Large graphs are laid out on a thread pool
+        # thread from a snapshot of the graph, moving the nodes in batches as the layout runs
+        self.layout_generation += 1 # stop any layout already running
+        positions = movable = None
+        if node_vals is not None:
+            movable = {str(node_val) for node_val in node_vals if str(node_val) in self.nodes}
+            if not movable: return
+            frontier = movable
+            for _ in range(hops): # add the neighbours of the nodes added last
+                frontier = {node_val for edge in self.incident_edges(frontier) for node_val in (edge.node1.val, edge.node2.val)} - movable
+                movable |= frontier
+            positions = {node_val: (node.x, node.y) for node_val, node in self.nodes.items()}
+            if not keep_positions:
+                for node_val in node_vals:
+                    positions.pop(str(node_val), None)
+
+        snapshot = self.graph.freeze()
+        compute = lambda report: graph_layout.ForceLayout(snapshot, positions, movable).run(report=report)
+        if not self.runs_in_background():
+            self.move_nodes(compute(None))
+            return
+        self.thread_pool.start(LayoutWorker(self, compute, self.layout_generation))
+
+    def incident_edges(self, node_vals):
+        # the Edge items connected to any of the nodes
+        return set().union(*(self.incident[node_val] for node_val in node_vals))
+
+    def begin_edit(self):
+        # start a change to the graph.  Changes can be nested, the outermost one clears the displayed path and 
+        # end_edit shows it again once every nested change is done
+        if self.edit_depth == 0:
+            # save whether shortest path is being shown or found, it is found again for the edited graph
+            self.edit_path_shown = self.path_displayed[0] or self.algorithm_finish is not None
+            self.delete_shortest_path() # delete shortest path, stopping any search for it
+        self.edit_depth += 1
+
+    def end_edit(self, flags):
+        # finish a change started with begin_edit, flags are the UpdateData flags for what the change modified
+        self.edit_flags |= flags
+        self.edit_depth -= 1
+        if self.edit_depth > 0: return # an outer change is still in progress
+
+        # reset path displayed variable to reflect its value before the change
+        self.path_displayed = (self.edit_path_shown, self.path_displayed[1], self.path_displayed[2], self.path_displayed[3])
+        if self.path_displayed[0]: # if path was displayed before the change
+            self.reset_path() # find and display path
+
+        self.data_updater.notify(self.edit_flags) # queue a signal to notify that the graph was updated
+        self.edit_flags = 0
+
+    @contextlib.contextmanager
+    def batch(self, suspend_index=False):
+        # group edits made inside a with block.  The displayed path is recomputed and the update signal sent once at the
+        # end, and invalid input is reported in one message.  Batches adding many items pass suspend_index so the scene
+        # index is rebuilt once at the end rather than on every item added.  The rebuild visits every item in the scene,
+        # so small batches leave the index alone
+        outermost = self.batch_errors is None
+        suspend = suspend_index and self.itemIndexMethod() == QtWidgets.QGraphicsScene.BspTreeIndex # not already suspended
+        self.begin_edit()
+        if outermost:
+            self.batch_errors = []
+        if suspend:
+            self.setItemIndexMethod(QtWidgets.QGraphicsScene.NoIndex) # items are indexed in one pass when the batch ends
+        try:
+            yield self
+        finally:
+            if suspend:
+                self.setItemIndexMethod(QtWidgets.QGraphicsScene.BspTreeIndex)
+            if outermost:
+                errors, self.batch_errors = self.batch_errors, None
+            self.end_edit(UpdateData.ALL)
+            if outermost and errors:
+                self.invalid_input(str(len(errors)) + ' edits failed, first error: ' + errors[0])
+
+    def invalid_input(self, text):
+        # show an invalid input alert, or save it until the end of the current batch
+        if self.batch_errors is not None:
+            self.batch_errors.append(text)
+            return
+        self.InvalidInMsg.setText(text)
+        self.InvalidInMsg.exec_()
+
     def show_shortest_path_dijkstra(self, from_node_val, to_node_val):
         self.delete_shortest_path() # delete shortest path of currently displayed
-        path = None
 
         if from_node_val not in self.nodes or to_node_val not in self.nodes: # nodes for path not in nodes dictionary
             self.InvalidInMsg.setText('Invalid node value input')
             self.InvalidInMsg.exec_() # show message and exit
             return
             
-        short_path_info = path_alg.dijkstra(self.graph, from_node_val, [to_node_val])[0] # call dijkstra algorithm on underlaying graph
+        self.path_displayed = (False, from_node_val, to_node_val, self.path_displayed[3]) # path being looked for
+        # call dijkstra algorithm on underlaying graph, reusing a still valid result
+        self.run_cached(('DIJKSTRA', from_node_val, to_node_val), 
+                        lambda result: self.show_dijkstra_info(from_node_val, to_node_val, result[0]))
+
+    def show_dijkstra_info(self, from_node_val, to_node_val, short_path_info):
            
         if short_path_info[1] < 0:
             self.InvalidInMsg.setText('DIJKSTRA requires connected edges to be positive')
@@ -461,64 +946,80 @@ class GraphScene(QtWidgets.QGraphicsScene):
             self.InvalidInMsg.exec_()  # show message # deselect nodes in graph and exit
             self.update()
             return   
-        node_val = None 
-        while len(path) > 1: # while length of path if greater than 1
-            node_val = path.pop(0) # remove first item from path
-            self.nodes[node_val].highlighted = True # highlight that node
-            if len(path) > 0: # if length of path is still greater than 0
-                if (node_val, path[0]) in self.edges: # and edge exists between current node value and next in path
-                    self.edges[(node_val, path[0])].highlighted = True # highlight the edge
-                else:
-                    self.edges[(path[0], node_val)].highlighted = True # else the edge exists as being from next in path to current node
-        self.nodes[path[0]].highlighted = True # highlight the last node in the path 
+        self.highlight_path(path) # highlight the nodes and edges along the path
        
-        if self.digraph: self.overlay_highlighted()
         self.update() 
         self.path_displayed = (True, from_node_val, to_node_val, str(short_path_info[1])) # reset path displayed information
         
         
-        self.data_updater.signal.emit() # emit a signal to notify that the graph was updated
+        self.data_updater.notify(UpdateData.PATH) # queue a signal to notify that the graph was updated
 
 
     def show_shortest_path_bellman_ford(self, from_node_val, to_node_val):
         self.delete_shortest_path() # delete shortest path if currently displayed
-        path = None
 
         if from_node_val not in self.nodes or to_node_val not in self.nodes: # if nodes for path not in nodes dictionary
             self.InvalidInMsg.setText('Invalid node value input')
             self.InvalidInMsg.exec_() # show message and exit
             return
             
-        short_path_info = path_alg.bellman_ford(self.graph, from_node_val, [to_node_val])[0] # call bellman ford on underlaying graph
-           
+        self.path_displayed = (False, from_node_val, to_node_val, self.path_displayed[3]) # path being looked for
+        # call bellman ford on underlaying graph, reusing a still valid result
+        self.run_cached(('BELLMAN FORD', from_node_val, to_node_val),
+                        lambda result: self.show_path_info(from_node_val, to_node_val, result[0]))
+
+
+    def show_shortest_path_all_pairs(self, from_node_val, to_node_val):
+        self.delete_shortest_path() # delete shortest path if currently displayed
+
+        if from_node_val not in self.nodes or to_node_val not in self.nodes: # if nodes for path not in nodes dictionary
+            self.InvalidInMsg.setText('Invalid node value input')
+            self.InvalidInMsg.exec_() # show message and exit
+            return
+
+        self.path_displayed = (False, from_node_val, to_node_val, self.path_displayed[3]) # path being looked for
+        if len(self.graph.nodes_dict) > GraphScene.ALL_PAIRS_SIZE: # too large to hold all pairs results
+            self.all_pairs = None
+            self.run_cached(('BELLMAN FORD', from_node_val, to_node_val), # also handles negative edges and cycles
+                            lambda result: self.show_path_info(from_node_val, to_node_val, result[0]))
+            return
+        show = lambda all_pairs: self.show_all_pairs_info(from_node_val, to_node_val, all_pairs)
+        snapshot = self.graph.freeze() # the same snapshot is returned until the graph is modified
+        if self.all_pairs is not None and self.all_pairs.csr is snapshot: # all pairs results are still current
+            self.cancel_algorithm()
+            show(self.all_pairs)
+        else: # all pairs results are built on first use and rebuilt when the graph changes
+            self.run_algorithm(lambda progress: AllPairsPaths(snapshot, progress=progress), show)
+
+    def show_all_pairs_info(self, from_node_val, to_node_val, all_pairs):
+        all_pairs.progress = None # computation is finished
+        self.all_pairs = all_pairs
+        short_path_info = self.all_pairs.query(from_node_val, [to_node_val])[0] # look up path in all pairs results
+        self.show_path_info(from_node_val, to_node_val, short_path_info)
+
+
+    def show_path_info(self, from_node_val, to_node_val, short_path_info):
+        # display a (node, distance, path) result from bellman ford or the all pairs results
         path = short_path_info[2] # get the path list from running that path search
 
-        if path == None:  # if path is not possible
-            if short_path_info[1] > 0: # check if due to there being no path to end node
-                self.InvalidInMsg.setText('No path exists between nodes "'+str(from_node_val)+'" and "'+str(to_node_val)+'"')
-                self.InvalidInMsg.exec_() # show relavent message
-            else:# otherwise it is due to a negative graph cycle
-                self.InvalidInMsg.setText('Graph contains negative weight cycle')
-                self.InvalidInMsg.exec_() # show relavent message
+        if short_path_info[1] == float('-inf'): # if a negative graph cycle was found
+            self.highlight_path(path) # highlight the cycle so it can be seen
+            self.update()
+            self.InvalidInMsg.setText('Graph contains negative weight cycle')
+            self.InvalidInMsg.exec_() # show relavent message
+            return
 
+        if path == None:  # if there is no path to end node
+            self.InvalidInMsg.setText('No path exists between nodes "'+str(from_node_val)+'" and "'+str(to_node_val)+'"')
+            self.InvalidInMsg.exec_() # show relavent message
             return   
-        node_val = None 
-        while len(path) > 1: # while length of path if greater than 1
-            node_val = path.pop(0) # remove first item from path
-            self.nodes[node_val].highlighted = True # highlight that node
-            if len(path) > 0: # if length of path is still greater than 0
-                if (node_val, path[0]) in self.edges: # and edge exists between current node value and next in path
-                    self.edges[(node_val, path[0])].highlighted = True # highlight the edge
-                else:
-                    self.edges[(path[0], node_val)].highlighted = True # else the edge exists as being from next in path to current node
-        self.nodes[path[0]].highlighted = True # highlight the last node in the path 
+        self.highlight_path(path) # highlight the nodes and edges along the path
        
-        if self.digraph: self.overlay_highlighted()
         self.update() 
         self.path_displayed = (True, from_node_val, to_node_val, str(short_path_info[1])) # reset path displayed information
         
         
-        self.data_updater.signal.emit() # emit a signal to notify that the graph was updated
+        self.data_updater.notify(UpdateData.PATH) # queue a signal to notify that the graph was updated
 
     
     def show_mst_prims(self):
@@ -528,8 +1029,10 @@ class GraphScene(QtWidgets.QGraphicsScene):
             return
         
         self.delete_shortest_path() # delete shortest path of currently displayed
-        
-        mst_edges = path_alg.prims(self.graph) # call dijkstra algorithm on underlaying graph
+        self.path_displayed = (False, 'N/A', 'N/A', self.path_displayed[3]) # tree being looked for
+        self.run_cached(('PRIMS',), self.show_mst) # call prims algorithm on underlaying graph, reusing a still valid result
+
+    def show_mst(self, mst_edges):
 
         if mst_edges == None:
             self.InvalidInMsg.setText('Graph must be connected to perform Prims algorithm')
@@ -540,31 +1043,128 @@ class GraphScene(QtWidgets.QGraphicsScene):
             self.nodes[node].highlighted = True
         for edge in mst_edges:
             if (edge[1], edge[2]) in self.edges: # and edge exists between current node value and next in path
-                self.edges[(edge[1], edge[2])].highlighted = True # highlight the edge
+                self.set_edge_highlighted(self.edges[(edge[1], edge[2])], True) # highlight the edge
             else:
-                self.edges[(edge[2], edge[1])].highlighted = True # else the edge exists as being from next in path to current node
+                self.set_edge_highlighted(self.edges[(edge[2], edge[1])], True) # else the edge exists as being from next in path to current node
             dist = dist + edge[0]
            
 
-        if self.digraph: self.overlay_highlighted()
         self.update() 
         self.path_displayed = (True, 'N/A', 'N/A', str(dist)) # reset path displayed information
         
         
-        self.data_updater.signal.emit()
+        self.data_updater.notify(UpdateData.PATH)
         
+
+    def run_algorithm(self, compute, finish):
+        # call compute(progress) and pass its result to finish.  Small graphs are computed straight away, larger ones
+        # on a thread pool thread so the window stays responsive.  finish is then called once the result arrives,
+        # unless the graph is edited or another algorithm is started first
+        self.cancel_algorithm()
+        if not self.runs_in_background():
+            finish(compute(None))
+            return
+        self.algorithm_finish = finish
+        self.data_updater.progress.emit(0)
+        self.thread_pool.start(AlgorithmWorker(self, compute, self.algorithm_generation))
+
+    def runs_in_background(self):
+        # whether the graph is large enough for algorithms on it to run on the thread pool
+        return len(self.graph.nodes_dict) + len(self.graph.edges_dict) >= GraphScene.BACKGROUND_SIZE
+
+    def run_cached(self, key, finish):
+        # run a path cache algorithm.  The cache is checked here first, otherwise the result is computed and stored.
+        # Work sent to the thread pool runs on a snapshot of the graph, which stays unchanged while the graph is
+        # edited, and smaller graphs are computed straight away on the graph itself without building a snapshot
+        entry = self.path_cache.lookup(key)
+        if entry is not None:
+            self.cancel_algorithm()
+            finish(entry.result)
+            return
+        snapshot = version = None # the graph and its current version
+        if self.runs_in_background():
+            snapshot, version = self.graph.freeze(), self.graph.version
+        def store(entry):
+            self.path_cache.store(key, entry)
+            finish(entry.result)
+        self.run_algorithm(lambda progress: self.path_cache.compute(key, snapshot, version, progress), store)
+
+    def cancel_algorithm(self):
+        # stop any algorithm running in the background, its result will be ignored
+        self.algorithm_generation += 1 # the worker stops at its next progress call
+        if self.algorithm_finish is not None:
+            self.algorithm_finish = None
+            self.data_updater.progress.emit(-1)
+
+    def algorithm_finished(self, generation, result):
+        if generation != self.algorithm_generation or self.algorithm_finish is None: return # result is out of date
+        finish, self.algorithm_finish = self.algorithm_finish, None
+        self.data_updater.progress.emit(-1)
+        finish(result)
+
+    def algorithm_failed(self, generation, message):
+        if generation != self.algorithm_generation: return
+        self.cancel_algorithm()
+        self.InvalidInMsg.setText('Algorithm failed: ' + message)
+        self.InvalidInMsg.exec_()
+
+    def algorithm_progress(self, generation, percent):
+        if generation == self.algorithm_generation and self.algorithm_finish is not None:
+            self.data_updater.progress.emit(percent) # pass on progress of the current algorithm only
     
+    def layout_positions(self, generation, positions):
+        if generation == self.layout_generation: # not from a layout that has been stopped
+            self.move_nodes(positions)
+        self.layout_applying = False # ready for the next batch
+
+    def layout_finished(self, generation, positions):
+        self.layout_positions(generation, positions)
+
+    def layout_failed(self, generation, message):
+        if generation != self.layout_generation: return
+        self.InvalidInMsg.setText('Layout failed: ' + message)
+        self.InvalidInMsg.exec_()
+
+    def highlight_path(self, path):
+        for i, node_val in enumerate(path): # for each node along the path
+            self.nodes[node_val].highlighted = True # highlight that node
+            if i > 0: # highlight the edge from the previous node in the path
+                prev_val = path[i-1]
+                if (prev_val, node_val) in self.edges: # if edge exists from previous node to current node
+                    self.set_edge_highlighted(self.edges[(prev_val, node_val)], True) # highlight the edge
+                else:
+                    self.set_edge_highlighted(self.edges[(node_val, prev_val)], True) # else the edge exists as being from current node to previous node
+
+    def add_edge_item(self, edge):
+        if self.edge_layer is None: self.addItem(edge) # edge draws itself
+        else: self.edge_layer.add_edge(edge) # edge is drawn by the layer
+
+    def remove_edge_item(self, edge):
+        self.set_edge_highlighted(edge, False)
+        if self.edge_layer is None: self.removeItem(edge)
+        else: self.edge_layer.remove_edge(edge)
+
+    def set_edge_highlighted(self, edge, highlighted):
+        if edge.highlighted == highlighted: return
+        edge.set_highlighted(highlighted)
+        if highlighted: self.highlighted_edges.add(edge)
+        else: self.highlighted_edges.discard(edge)
+        if self.edge_layer is not None: # the layer draws no highlights, so highlighted edges are shown with their own item
+            if highlighted: self.addItem(edge)
+            else: self.removeItem(edge)
+
     def delete_shortest_path(self):
+        self.cancel_algorithm() # a path still being found is no longer wanted
         for val, node in self.nodes.items(): # for each node in nodes dictionary
             node.highlighted = False # remove node highlights 
 
-        for val, edge in self.edges.items(): # for each edge 
-            edge.highlighted = False # remove highlights
+        for edge in list(self.highlighted_edges): # for each highlighted edge
+            self.set_edge_highlighted(edge, False) # remove highlights
 
         self.update() 
         self.path_displayed = (False, self.path_displayed[1],self.path_displayed[2], self.path_displayed[3]) # path info not shown 
         
-        self.data_updater.signal.emit() # emit a signal to notify that the graph was updated
+        self.data_updater.notify(UpdateData.PATH) # queue a signal to notify that the graph was updated
 
  
 
@@ -582,22 +1182,121 @@ class GraphScene(QtWidgets.QGraphicsScene):
             self.show_shortest_path_dijkstra(self.path_displayed[1], self.path_displayed[2]) # run dijskstra
         elif self.current_path_algo == 'BELLMAN FORD': # if current algorithm is bellman_ford
             self.show_shortest_path_bellman_ford(self.path_displayed[1], self.path_displayed[2]) # run bellman ford
+        elif self.current_path_algo == 'ALL PAIRS': # if current algorithm is all pairs
+            self.show_shortest_path_all_pairs(self.path_displayed[1], self.path_displayed[2]) # look up path
         
         self.update()
-
-    def overlay_highlighted(self):
-        for (from_node_val, to_node_val), edge in self.edges.items():
-                if edge.highlighted:
-                    self.removeItem(edge) 
-                    self.addItem(edge) # layer highlighted edges over none highlighted edges
-
-        for node_val, node in self.nodes.items():
-            # layer all nodes over edges 
-            self.removeItem(node)
-            self.addItem(node)
   
         
 
+class AlgorithmCancelled(Exception):
+    # raised inside an algorithm running in the background once its result is no longer wanted
+    pass
+
+
+class AlgorithmSignals(QtCore.QObject):
+    # signals sent by AlgorithmWorker, received on the GUI thread
+    finished = QtCore.pyqtSignal(int, object) # generation, result
+    failed = QtCore.pyqtSignal(int, str) # generation, error message
+    progress = QtCore.pyqtSignal(int, int) # generation, percent done
+
+
+class AlgorithmWorker(QtCore.QRunnable):
+    # runs compute(progress) on a thread pool thread.  compute must only read data that is not edited, such as a frozen
+    # snapshot of the graph.  Once the scene's algorithm_generation moves on from the generation the worker was started
+    # with, the next progress call raises AlgorithmCancelled to stop it
+
+    def __init__(self, scene, compute, generation):
+        super().__init__()
+        self.scene = scene
+        self.compute = compute
+        self.generation = generation
+        self.signals = scene.algorithm_signals
+        self.percent = -1 # last percent reported
+
+    def progress(self, fraction):
+        if self.scene.algorithm_generation != self.generation:
+            raise AlgorithmCancelled()
+        percent = int(fraction * 100)
+        if percent != self.percent: # only signal when the shown value would change
+            self.percent = percent
+            self.signals.progress.emit(self.generation, percent)
+
+    def run(self):
+        try:
+            result = self.compute(self.progress)
+        except AlgorithmCancelled:
+            return
+        except Exception as error: # report the error rather than letting it end the application
+            self.signals.failed.emit(self.generation, str(error))
+            return
+        self.signals.finished.emit(self.generation, result)
+
+
+class LayoutSignals(QtCore.QObject):
+    # signals sent by LayoutWorker, received on the GUI thread
+    positions = QtCore.pyqtSignal(int, object) # generation, node value -> (x, y) for the nodes moved so far
+    finished = QtCore.pyqtSignal(int, object) # generation, final positions
+    failed = QtCore.pyqtSignal(int, str) # generation, error message
+
+
+class LayoutWorker(QtCore.QRunnable):
+    # runs layout(report) on a thread pool thread, where report is called with the node positions as the layout runs.
+    # A batch of positions is only sent once the scene has applied the last one, so a slow scene skips batches rather
+    # than falling behind.  Once the scene's layout_generation moves on, the next report call stops the layout
+
+    def __init__(self, scene, layout, generation):
+        super().__init__()
+        self.scene = scene
+        self.layout = layout
+        self.generation = generation
+        self.signals = scene.layout_signals
+
+    def report(self, positions):
+        if self.scene.layout_generation != self.generation:
+            raise AlgorithmCancelled()
+        if self.scene.layout_applying: return # scene is still moving nodes to the last batch
+        self.scene.layout_applying = True
+        self.signals.positions.emit(self.generation, positions)
+
+    def run(self):
+        try:
+            positions = self.layout(self.report)
+        except AlgorithmCancelled:
+            return
+        except Exception as error: # report the error rather than letting it end the application
+            self.signals.failed.emit(self.generation, str(error))
+            return
+        self.signals.finished.emit(self.generation, positions)
+
+
+
 class UpdateData(QtCore.QObject):
-   # class for signaling main window of updated data
-   signal = QtCore.pyqtSignal()
+   # class for signaling main window of updated data.  notify can be called any number of times while one event is
+   # handled, the flags passed are combined and signal is emitted once with them when control returns to the event loop
+   PATH = 1 # the displayed path changed
+   NODES = 2 # nodes were added or removed
+   EDGES = 4 # edges were added or removed
+   ALL = PATH | NODES | EDGES
+   signal = QtCore.pyqtSignal(int)
+   progress = QtCore.pyqtSignal(int) # percent done of the algorithm running in the background, -1 once it stops
+
+   def __init__(self):
+       super().__init__()
+       self.pending = 0 # flags of the changes not yet signaled
+       self.timer = QtCore.QTimer(self) # zero length single shot timer fires once pending events are handled
+       self.timer.setSingleShot(True)
+       self.timer.setInterval(0)
+       self.timer.timeout.connect(self.flush)
+
+   def notify(self, flags=ALL):
+       self.pending |= flags
+       if not self.timer.isActive():
+           self.timer.start()
+
+   def flush(self):
+       # emit the pending changes now
+       self.timer.stop()
+       flags, self.pending = self.pending, 0
+       if flags:
+           self.signal.emit(flags)
@@ -1,6 +1,5 @@
-import sys
-import random
-import heapq
+from array import array
+from collections import deque
 
 #from sets import Set
 
@@ -13,10 +12,21 @@ import heapq
     Changes made: refactored graph class to use a seperate node dictionary and edge dictionary 
     instead of a dictionary within a dictionary.  Deleted some functions that added unnecessay complexity
 
+    Modified: 10/18/2026
+    Changes made: digraphs keep a predecessor dictionary alongside the node dictionary so incoming edges 
+    can be found without scanning every node.  Added CSRGraph, a compact integer indexed snapshot of a graph 
+    that the path algorithms run on, and a UnionFind structure for tracking connected components.  Connectivity
+    checks are iterative, and undirected graphs keep their components up to date as edges are added.  Graphs 
+    keep a version number and a journal of recent changes so cached algorithm results can be checked.  set_digraph
+    converts a graph to a digraph or back in place.  The label index of a CSRGraph is built when first used, so
+    snapshots read from a file open without visiting every node.  Graphs count their negative edges and CSRGraph
+    has has_negative_weights, so searches that stop early can check for negative edges first
+
     Description:
         This file contains a graph class.
         Nodes and edges can be added and removed from the graph, an adjacency list can be printed, and a trvaersal can 
         be performed to test if the graph is connected.
+        A graph can be frozen into a CSRGraph, a read only snapshot that stores its adjacency in flat arrays.
 
 '''
 
@@ -25,38 +35,119 @@ class Graph(object):
     self.digraph = digraph
     self.nodes_dict = {}
     self.edges_dict = {}
+    self.pred_dict = {} # digraph only: node -> set of nodes with an edge into it (graphs use nodes_dict)
+    self._frozen = None # cached CSRGraph snapshot, dropped whenever the graph changes
+    self.version = 0 # incremented by every change to the graph
+    self.journal = deque(maxlen=1024) # most recent changes as (version, operation, node, node, weight)
+    self.components = UnionFind() # graph only: connected components, kept up to date as nodes and edges are added
+    self._components_stale = False # set when an edge or node is removed, since union find cannot split a set
+    self.negative_edges = 0 # number of edges_dict entries with a negative weight
 
     
   def add_node(self, node):
 
     if node not in self.nodes_dict: # node not yet in graph
+      self._record('add_node', node)
       self.nodes_dict[node] = set() # add it to node dictionary and attach an empty set of adjacent nodes 
+      if self.digraph:
+        self.pred_dict[node] = set() # and an empty set of nodes pointing to it
+      else:
+        self.components.add(node) # new node is a component of its own
 
   def add_edge(self, from_node, to_node, weight):
+    stored = 1 if self.digraph else 2 # edges_dict entries for the edge
+    if (from_node, to_node) in self.edges_dict: # changing the weight of an existing edge
+      self._record('remove_edge', from_node, to_node, self.edges_dict[(from_node, to_node)])
+      if self.edges_dict[(from_node, to_node)] < 0: self.negative_edges -= stored
+    self._record('add_edge', from_node, to_node, weight)
+    if weight < 0: self.negative_edges += stored
     self.edges_dict[(from_node, to_node)] = weight # add an edge with given weight
     self.nodes_dict[from_node].add(to_node) # add connection reference to nodes
 
-    if not self.digraph: # if not digraph 
+    if self.digraph: # if digraph
+      self.pred_dict[to_node].add(from_node) # record incoming connection
+    else: # if not digraph 
       self.edges_dict[(to_node, from_node)] = weight # add edge connecting node in other direction
       self.nodes_dict[to_node].add(from_node) # add connection reference to other node
+      if not self._components_stale:
+        self.components.union(from_node, to_node) # nodes are now in the same component
 
   def remove_edge(self, from_node, to_node):
+    self._record('remove_edge', from_node, to_node, self.edges_dict[(from_node, to_node)])
+    if self.edges_dict[(from_node, to_node)] < 0: self.negative_edges -= 1 if self.digraph else 2
     del self.edges_dict[(from_node, to_node)] # delete edge from dictionary of edges
     self.nodes_dict[from_node].remove(to_node) # remove connection reference from node
  
-    if not self.digraph: # if not a digraph
+    if self.digraph: # if a digraph
+      self.pred_dict[to_node].remove(from_node) # remove incoming connection reference
+    else: # if not a digraph
       del self.edges_dict[(to_node, from_node)] # delete edge in other direction
       self.nodes_dict[to_node].remove(from_node) # remove connection reference from other node
+      self._components_stale = True # component may have split, rebuilt on next is_connected
 
   def remove_node(self, del_node):
-    for node in self.nodes_dict: # for each node
-      if del_node in self.nodes_dict[node]: # if node to be deleted is connected   
-        self.remove_edge(node, del_node) # delete connecting edge
+    for node in list(self.predecessors(del_node)): # for each node with an edge into the deleted node
+      self.remove_edge(node, del_node) # delete connecting edge
 
-    for adj in self.nodes_dict[del_node]: # for each node that can be reached from deleted node 
+    for adj in list(self.nodes_dict[del_node]): # for each node that can still be reached from deleted node 
        self.remove_edge(del_node, adj) # remove connecting edge
     
     del self.nodes_dict[del_node] # delete the node
+    self._record('remove_node', del_node)
+    if self.digraph:
+      del self.pred_dict[del_node] # and its incoming connection set
+    else:
+      self._components_stale = True
+
+  def set_digraph(self, digraph):
+    # convert between graph and digraph in place.  A graph becomes a digraph with an edge in each direction, and a
+    # digraph becomes a graph where nodes joined in either direction are connected, by the lighter edge if both exist
+    if digraph == self.digraph: return
+    self._record('set_digraph', digraph)
+    self.digraph = digraph
+    if digraph: # edges are already stored in both directions, only the incoming connections are needed
+      self.pred_dict = {node: set(adj_set) for node, adj_set in self.nodes_dict.items()}
+    else:
+      edges_dict = {}
+      for (from_node, to_node), weight in self.edges_dict.items():
+        if (to_node, from_node) in self.edges_dict: # keep the lighter of the two directions
+          weight = min(weight, self.edges_dict[(to_node, from_node)])
+        edges_dict[(from_node, to_node)] = edges_dict[(to_node, from_node)] = weight
+      self.edges_dict = edges_dict
+      for node, pred_set in self.pred_dict.items():
+        self.nodes_dict[node] |= pred_set # nodes pointing into a node are now adjacent to it
+      self.pred_dict = {}
+    self.negative_edges = sum(1 for weight in self.edges_dict.values() if weight < 0)
+    self.components = UnionFind()
+    self._components_stale = not digraph # components are rebuilt from the edges when first needed
+
+  def predecessors(self, node):
+    # nodes with an edge leading into node; in an undirected graph these are just its neighbours
+    # the returned set is live and must not be modified by the caller
+    if self.digraph:
+      return self.pred_dict[node]
+    return self.nodes_dict[node]
+
+
+  def _record(self, operation, node1, node2=None, weight=None):
+    # note a change in the journal and drop the cached snapshot
+    self.version += 1
+    self.journal.append((self.version, operation, node1, node2, weight))
+    self._frozen = None
+
+  def changes_since(self, version):
+    # return the journal entries made after the given version, oldest first, or None if some of
+    # them have already been dropped from the journal
+    if version == self.version: return []
+    if not self.journal or self.journal[0][0] > version + 1: return None
+    return [entry for entry in self.journal if entry[0] > version]
+
+
+  def freeze(self):
+    # return a CSRGraph snapshot of the graph; the snapshot is reused until the graph is next modified
+    if self._frozen is None:
+      self._frozen = CSRGraph.from_graph(self)
+    return self._frozen
 
 
   def print_adj_list(self):
@@ -72,28 +163,171 @@ class Graph(object):
   def is_connected(self):
     if len(self.nodes_dict) < 1: 
       return False
-    visited = []
     if not self.digraph: # if graph
-      rand = random.choice(list(self.nodes_dict.keys())) # randomly select node
-      return self.check_connections(rand, visited) # check connections
-    # if digraph
-    connected = [] 
-    for node in self.nodes_dict.keys(): # for every node
-      visited.clear() # clear visited
-      if not self.check_connections(node, visited): # check connections
-        return False 
-    return True # return true only if strongly connected
+      if self._components_stale: # rebuild components after a removal
+        self.components = UnionFind(self.nodes_dict.keys())
+        for (from_node, to_node) in self.edges_dict.keys():
+          self.components.union(from_node, to_node)
+        self._components_stale = False
+      return self.components.components == 1 # connected if every node is in one component
+    # if digraph, strongly connected only if one node reaches every node and every node reaches it
+    start = next(iter(self.nodes_dict))
+    return self.check_connections(start) and self.check_connections(start, adj_dict=self.pred_dict)
 
     
-  def check_connections(self, node, visited):   
-    visited.append(node) # add given node to list of visited
-    if len(visited) == len(self.nodes_dict): # if visited contains all nodes in graph
-      return True # return true
-    for adj in self.nodes_dict[node]: # for each node
-      if adj not in visited: # if node is in visited
-        if self.check_connections(adj, visited): # check connections of that node recursively
-            return True # return true if all nodes in graph were visited
-    return False # if nodes were not all able to be visited return false
+  def check_connections(self, node, visited=None, adj_dict=None):
+    # iterative depth first traversal from node following adj_dict (outgoing edges by default), adding
+    # each reached node to the visited set.  returns True if every node in the graph was reached
+    if visited is None: visited = set()
+    if adj_dict is None: adj_dict = self.nodes_dict
+    visited.add(node) # add given node to set of visited
+    stack = [node]
+    while stack:
+      for adj in adj_dict[stack.pop()]: # for each adjacent node
+        if adj not in visited: # if node has not been visited
+          visited.add(adj)
+          stack.append(adj) # visit its adjacent nodes later
+    return len(visited) == len(self.nodes_dict) # true if all nodes in graph were visited
     
    
       
+
+
+class CSRGraph(object):
+  ''' Read only snapshot of a Graph in compressed sparse row form.
+
+      Nodes are numbered 0..n-1 in the order of labels.  The edges leaving node i are stored in
+      targets[offsets[i]:offsets[i+1]] with matching weights in weights[offsets[i]:offsets[i+1]].
+      An undirected edge is stored once in each direction, as in Graph.edges_dict.
+  '''
+
+  def __init__(self, labels, offsets, targets, weights, digraph=False, index=None):
+    self.digraph = digraph
+    self.labels = labels # index -> node label
+    self._index = index # node label -> index, built when first used if not given
+    self.offsets = offsets # array('l') of length n+1
+    self.targets = targets # array('l') of length m
+    self.weights = weights # array('d') of length m
+    self._reverse = None # cached snapshot with every edge reversed
+    self._negative = None # whether any weight is negative, found when first asked
+
+  @classmethod
+  def from_graph(cls, graph):
+    labels = list(graph.nodes_dict.keys())
+    index = {label: i for i, label in enumerate(labels)}
+    offsets = array('l', [0])
+    targets = array('l')
+    weights = array('d')
+    edges_dict = graph.edges_dict
+    for node in labels: # for each node append its adjacent nodes and edge weights
+      for adj_node in graph.nodes_dict[node]:
+        targets.append(index[adj_node])
+        weights.append(edges_dict[(node, adj_node)])
+      offsets.append(len(targets))
+    return cls(labels, offsets, targets, weights, graph.digraph, index)
+
+  @property
+  def index(self):
+    # node label -> index.  Building the dictionary is left until a label is looked up, so a snapshot
+    # opened from a file is ready as soon as its arrays are mapped
+    if self._index is None:
+      self._index = {label: i for i, label in enumerate(self.labels)}
+    return self._index
+
+  def freeze(self):
+    return self # already a snapshot
+
+  def has_negative_weights(self):
+    if self._negative is None:
+      self._negative = len(self.weights) > 0 and min(self.weights) < 0
+    return self._negative
+
+  def __len__(self):
+    return len(self.labels)
+
+  def edge_count(self):
+    # number of stored directed edges; an undirected edge counts twice
+    return len(self.targets)
+
+  def neighbours(self, i):
+    # return (target index, weight) pairs for the edges leaving node index i
+    start, end = self.offsets[i], self.offsets[i+1]
+    return zip(self.targets[start:end], self.weights[start:end])
+
+  def reverse(self):
+    # return a snapshot with every edge reversed, built once by counting sort; an undirected graph is its own reverse
+    if not self.digraph: return self
+    if self._reverse is None:
+      n = len(self.labels)
+      offsets, targets, weights = self.offsets, self.targets, self.weights
+      rev_offsets = array('l', [0]) * (n + 1)
+      for v in targets: # count the edges entering each node
+        rev_offsets[v+1] += 1
+      for i in range(n): # running total gives where each node's entering edges start
+        rev_offsets[i+1] += rev_offsets[i]
+      position = array('l', rev_offsets[:n]) # next free slot for each node
+      rev_targets = array('l', [0]) * len(targets)
+      rev_weights = array('d', [0.0]) * len(targets)
+      for u in range(n):
+        for e in range(offsets[u], offsets[u+1]):
+          v = targets[e]
+          rev_targets[position[v]] = u
+          rev_weights[position[v]] = weights[e]
+          position[v] += 1
+      self._reverse = CSRGraph(self.labels, rev_offsets, rev_targets, rev_weights, True, self.index)
+      self._reverse._reverse = self
+    return self._reverse
+
+  def thaw(self):
+    # build an editable Graph holding the same nodes and edges
+    graph = Graph(self.digraph)
+    for label in self.labels:
+      graph.add_node(label)
+    labels = self.labels
+    for i, label in enumerate(labels):
+      for j, weight in self.neighbours(i):
+        if self.digraph or i <= j: # undirected edges are stored in both directions
+          graph.add_edge(label, labels[j], weight)
+    return graph
+
+
+
+class UnionFind(object):
+  ''' Disjoint set forest over hashable items using union by size and path halving, so find and union
+      run in near constant amortized time.  components holds the current number of disjoint sets.
+  '''
+
+  def __init__(self, items=()):
+    self.parent = {}
+    self.size = {}
+    self.components = 0
+    for item in items:
+      self.add(item)
+
+  def add(self, item):
+    # add item as a set of its own if it is not already present
+    if item not in self.parent:
+      self.parent[item] = item
+      self.size[item] = 1
+      self.components += 1
+
+  def find(self, item):
+    # return the representative item of the set containing item
+    parent = self.parent
+    while parent[item] != item:
+      parent[item] = parent[parent[item]] # point item at its grandparent to shorten the path
+      item = parent[item]
+    return item
+
+  def union(self, a, b):
+    # merge the sets containing a and b; returns False if they were already in the same set
+    root_a, root_b = self.find(a), self.find(b)
+    if root_a == root_b:
+      return False
+    if self.size[root_a] < self.size[root_b]: # attach the smaller tree under the larger one
+      root_a, root_b = root_b, root_a
+    self.parent[root_b] = root_a
+    self.size[root_a] += self.size[root_b]
+    del self.size[root_b]
+    self.components -= 1
+    return True
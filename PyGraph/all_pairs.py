@@ -0,0 +1,192 @@
+from array import array
+from PyGraph.SGraph import CSRGraph
+from PyGraph.graph_path_algorithm import _dijkstra_search, _spfa_search
+
+''' All Pairs Shortest Path File
+
+    Date: 10/18/2026
+
+    Description:
+        This file contains an all pairs shortest path engine.  Distances and predecessors between every pair of
+        nodes are computed once, with floyd warshall (vectorised with numpy when it is installed) for dense graphs
+        or johnsons algorithm for sparse graphs, and kept until the graph changes.  Pair queries are then answered
+        from the stored matrices in time proportional to the length of the path.  numpy is only imported the first
+        time floyd warshall runs, as importing it takes longer than starting the rest of the program.
+
+'''
+
+_numpy = False # the numpy module once imported, None if it is not installed, False until it is first needed
+
+def _import_numpy():
+  global _numpy
+  if _numpy is False:
+    try:
+      import numpy
+      _numpy = numpy
+    except ImportError: # floyd warshall and the layout steps fall back to plain python loops
+      _numpy = None
+  return _numpy
+
+
+class AllPairsPaths(object):
+  ''' All pairs shortest paths of a Graph or CSRGraph.
+
+      method is 'floyd_warshall', 'johnson' or 'auto', which uses floyd warshall when numpy is available
+      and the graph has at least a quarter of all possible edges.  Results are recomputed on the next
+      query after the graph is modified.  progress, if given, is called with the fraction of the work done
+      while results are computed
+  '''
+
+  def __init__(self, graph, method='auto', progress=None):
+    self.graph = graph
+    self.method = method
+    self.progress = progress
+    self.csr = None # snapshot the current results were computed from
+    self.dist = None # dist[i][j] distance from node index i to node index j
+    self.pred = None # pred[i][j] index of the node before j on the path from i, -1 if j unreachable
+    self.negative_cycle = None # list of node labels forming a negative cycle, if the graph has one
+    self.refresh()
+
+  def refresh(self):
+    # recompute the matrices if the graph changed since they were built
+    csr = self.graph.freeze()
+    if csr is self.csr: return # graph.freeze() returns the same snapshot until the graph is modified
+    self.csr = csr
+    self.negative_cycle = None
+    n = len(csr)
+    method = self.method
+    if method == 'auto':
+      dense = csr.edge_count() * 4 >= n * n and _import_numpy() is not None
+      method = 'floyd_warshall' if dense else 'johnson'
+    if method == 'floyd_warshall':
+      self.dist, self.pred = _floyd_warshall(csr, self.progress)
+      if any(self.dist[i][i] < 0 for i in range(n)): # a node with a negative distance to itself lies on a negative cycle
+        self._set_negative_cycle(_spfa_search(csr, range(n))[2])
+    elif method == 'johnson':
+      self.dist, self.pred, cycle = _johnson(csr, self.progress)
+      if cycle is not None: self._set_negative_cycle(cycle)
+    else:
+      raise ValueError('Unknown all pairs method ' + str(method))
+
+  def _set_negative_cycle(self, cycle):
+    self.negative_cycle = [self.csr.labels[i] for i in cycle]
+
+  def distance(self, from_v, to_v):
+    # shortest distance from from_v to to_v, inf if there is no path
+    self.refresh()
+    index = self.csr.index
+    return float(self.dist[index[from_v]][index[to_v]])
+
+  def path(self, from_v, to_v):
+    # shortest path from from_v to to_v as a list of node labels, None if there is no path
+    self.refresh()
+    index, labels = self.csr.index, self.csr.labels
+    start, end = index[from_v], index[to_v]
+    if start == end: return [from_v]
+    pred_row = self.pred[start]
+    if pred_row[end] < 0: return None # to_v cannot be reached
+    path = [labels[end]]
+    while end != start: # walk predecessors back to the start node
+      end = int(pred_row[end])
+      path.append(labels[end])
+    path.reverse()
+    return path
+
+  def query(self, from_v, to_v_list=None):
+    # answer a query in the same (node, distance, path) result format as dijkstra and bellman_ford
+    self.refresh()
+    index = self.csr.index
+    if to_v_list is None: to_v_list = self.csr.labels # if no node was input, find path to all nodes
+
+    # make sure start and end nodes are valid
+    if from_v not in index:
+      print ('Invalid start node of ' + str(from_v))
+      return
+    for node in to_v_list:
+      if node not in index:
+        print ('Invalid end node of ' + str(node))
+        return
+
+    if self.negative_cycle is not None: # shortest paths are undefined
+      return [('Negative cycle', float('-inf'), list(self.negative_cycle))]
+    result = []
+    for node in to_v_list:
+      path = self.path(from_v, node)
+      total_dist = self.distance(from_v, node) if path is not None else float('inf')
+      result.append((node, total_dist, path))
+    return result
+
+
+
+def _floyd_warshall(csr, progress=None):
+  # floyd warshall over node indexes, returns (dist, pred) matrices
+  n = len(csr)
+  offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+  inf = float('inf')
+  np = _import_numpy()
+  if np is None: # plain python version, one row list per node
+    dist = [[inf] * n for i in range(n)]
+    pred = [[-1] * n for i in range(n)]
+    for u in range(n):
+      dist[u][u] = 0
+      for e in range(offsets[u], offsets[u+1]):
+        v = targets[e]
+        if weights[e] < dist[u][v]:
+          dist[u][v] = weights[e]
+          pred[u][v] = u
+    for k in range(n):
+      if progress is not None: progress(k / n)
+      dist_k, pred_k = dist[k], pred[k]
+      for i in range(n):
+        dist_i, pred_i = dist[i], pred[i]
+        d_ik = dist_i[k]
+        if d_ik == inf: continue # nothing can be improved through k
+        for j in range(n):
+          d = d_ik + dist_k[j]
+          if d < dist_i[j]:
+            dist_i[j] = d
+            pred_i[j] = pred_k[j]
+    return dist, pred
+
+  dist = np.full((n, n), inf)
+  pred = np.full((n, n), -1, dtype=np.int64)
+  sources = np.repeat(np.arange(n), np.diff(np.asarray(offsets, dtype=np.int64)))
+  ends = np.asarray(targets, dtype=np.int64)
+  np.minimum.at(dist, (sources, ends), np.asarray(weights, dtype=np.float64)) # keep the lightest of parallel edges
+  pred[sources, ends] = sources
+  np.fill_diagonal(dist, np.minimum(dist.diagonal(), 0))
+  np.fill_diagonal(pred, np.arange(n))
+  for k in range(n): # relax every pair through k at once
+    if progress is not None and k % 64 == 0: progress(k / n)
+    through_k = dist[:, k, None] + dist[None, k, :]
+    better = through_k < dist
+    np.copyto(dist, through_k, where=better)
+    np.copyto(pred, np.broadcast_to(pred[k], (n, n)), where=better) # predecessor of j via k is k's predecessor of j
+  return dist, pred
+
+
+def _johnson(csr, progress=None):
+  # johnsons algorithm, returns (dist, pred, cycle) with cycle the node indexes of a negative cycle or None
+  n = len(csr)
+  weights = csr.weights
+  potential = [0.0] * n
+  if any(w < 0 for w in weights): # reweighting is only needed with negative edges
+    # starting spfa from every node at distance 0 is the same as adding a source joined to every node
+    potential, parent, cycle = _spfa_search(csr, range(n))
+    if cycle is not None: return None, None, cycle
+  offsets, targets = csr.offsets, csr.targets
+  reweighted = array('d', weights)
+  for u in range(n): # w(u, v) + h(u) - h(v) is never negative
+    for e in range(offsets[u], offsets[u+1]):
+      reweighted[e] = max(0.0, weights[e] + potential[u] - potential[targets[e]])
+  search_graph = CSRGraph(csr.labels, offsets, targets, reweighted, csr.digraph, csr.index)
+
+  dist, pred = [], []
+  inf = float('inf')
+  for start in range(n):
+    if progress is not None: progress(start / n)
+    row_dist, row_parent = _dijkstra_search(search_graph, start)
+    shift = potential[start]
+    dist.append(array('d', (d - shift + potential[v] if d != inf else inf for v, d in enumerate(row_dist))))
+    pred.append(array('l', row_parent))
+  return dist, pred, None
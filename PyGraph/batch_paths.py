@@ -0,0 +1,96 @@
+import os
+from multiprocessing import Pool, shared_memory
+from PyGraph.SGraph import CSRGraph
+from PyGraph.graph_path_algorithm import dijkstra
+from PyGraph.disk_graph import DiskGraph
+
+''' Batch Path File
+
+    Date: 10/18/2026
+
+    Description:
+        This file contains a batch entry point for running dijkstra from many start nodes over one graph using a
+        pool of worker processes.  The CSRGraph arrays are placed in shared memory once, each worker attaches to
+        them when it starts, and results are streamed back as each start node finishes.  A DiskGraph is not copied,
+        each worker maps its file instead.
+
+'''
+
+def dijkstra_many(graph, sources, targets=None, workers=None):
+  # generator yielding (source, result) pairs, where result is what dijkstra(graph, source, targets) returns.
+  # pairs are yielded in the order the sources finish, not the order they were given
+  csr = graph.freeze() # integer indexed snapshot of the graph
+  sources = list(sources)
+  if targets is not None: targets = list(targets)
+
+  # make sure start and end nodes are valid before starting any workers
+  for node in sources:
+    if node not in csr.index:
+      print ('Invalid start node of ' + str(node))
+      return
+  for node in targets or ():
+    if node not in csr.index:
+      print ('Invalid end node of ' + str(node))
+      return
+
+  if workers is None: workers = os.cpu_count() or 1
+  if workers <= 1 or len(sources) <= 1: # not worth starting processes
+    for source in sources:
+      yield source, dijkstra(csr, source, targets)
+    return
+
+  chunksize = max(1, len(sources) // (workers * 8)) # a few chunks per worker keeps them all busy
+  if isinstance(graph, DiskGraph): # already in a file the workers can map, which also shares its pages between them
+    with Pool(workers, initializer=_open_graph, initargs=(graph.path, targets)) as pool:
+      for source, result in pool.imap_unordered(_run_source, sources, chunksize):
+        yield source, result
+    return
+
+  blocks = [_share_array(csr.offsets), _share_array(csr.targets), _share_array(csr.weights)]
+  try:
+    # arrays of a snapshot read from a file are memoryviews, which give their typecode as format
+    shared = [(block.name, len(values) * values.itemsize, getattr(values, 'typecode', None) or values.format)
+              for block, values in zip(blocks, (csr.offsets, csr.targets, csr.weights))]
+    with Pool(workers, initializer=_attach_graph, initargs=(shared, csr.labels, csr.digraph, targets)) as pool:
+      for source, result in pool.imap_unordered(_run_source, sources, chunksize):
+        yield source, result
+  finally:
+    for block in blocks:
+      block.close()
+      block.unlink()
+
+
+
+def _share_array(values):
+  # copy an array into a new shared memory block
+  nbytes = len(values) * values.itemsize
+  block = shared_memory.SharedMemory(create=True, size=max(nbytes, 1)) # blocks cannot be empty
+  block.buf[:nbytes] = values.tobytes()
+  return block
+
+
+_worker_blocks = [] # shared memory blocks the worker is attached to, kept open for the life of the worker
+_worker_graph = None # CSRGraph over the shared blocks or a mapped file
+_worker_targets = None
+
+def _attach_graph(shared, labels, digraph, targets):
+  # pool initializer, builds this worker's CSRGraph over views of the shared blocks without copying them
+  global _worker_graph, _worker_targets
+  arrays = []
+  for name, nbytes, typecode in shared:
+    block = shared_memory.SharedMemory(name=name) # pool workers share the parent's resource tracker, which unlinks nothing early
+    _worker_blocks.append(block)
+    arrays.append(block.buf[:nbytes].cast(typecode))
+  _worker_graph = CSRGraph(labels, arrays[0], arrays[1], arrays[2], digraph)
+  _worker_targets = targets
+
+
+def _open_graph(path, targets):
+  # pool initializer for a DiskGraph, maps the file again in this worker
+  global _worker_graph, _worker_targets
+  _worker_graph = DiskGraph(path).freeze()
+  _worker_targets = targets
+
+
+def _run_source(source):
+  return source, dijkstra(_worker_graph, source, _worker_targets)
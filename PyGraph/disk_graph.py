@@ -0,0 +1,335 @@
+import os
+import sys
+import mmap
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from PyGraph.SGraph import CSRGraph
+import PyGraph.graph_io as graph_io
+
+''' Disk Graph File
+
+    Date: 10/18/2026
+
+    Description:
+        This file contains DiskGraph, a read only graph kept in a memory mapped file for graphs too large to hold as
+        a Graph.  Edges are stored once per direction in fixed width arrays in the binary format of graph_io, with the
+        reversed edges of a digraph and an index of the node labels sorted so a label is found by binary search.  Only
+        the pages an algorithm touches are read from disk.  DiskGraph.build writes the file from a graph file or a
+        stream of records in two passes over it, holding nothing larger than the nodes in memory.
+
+'''
+
+class DiskGraph(object):
+  ''' Read only graph stored in a binary graph file with a label index, as written by DiskGraph.build.
+
+      nodes_dict, pred_dict and edges_dict are read only views with the same keys and values as the
+      dictionaries of a Graph, so code reading a Graph can read a DiskGraph.  freeze() returns a CSRGraph
+      whose arrays are views of the file, which is what the path algorithms run on.
+  '''
+
+  def __init__(self, path):
+    flags, n, m, sections, label_text = graph_io.map_binary(path)
+    if not flags & graph_io.LABEL_INDEX:
+      raise ValueError(path + ' has no label index, write it with DiskGraph.build')
+    self.path = path
+    self.digraph = bool(flags & graph_io.DIGRAPH)
+    self.version = 0 # the graph never changes
+    self.labels = DiskLabels(sections['label_offsets'], label_text)
+    self.index = DiskLabelIndex(self.labels, sections['label_order'])
+    self._csr = CSRGraph(self.labels, sections['offsets'], sections['targets'], sections['weights'], self.digraph, self.index)
+    if flags & graph_io.REVERSE: # reversed edges were saved, so the reverse snapshot is not built in memory
+      reverse = CSRGraph(self.labels, sections['rev_offsets'], sections['rev_targets'], sections['rev_weights'], True, self.index)
+      self._csr._reverse, reverse._reverse = reverse, self._csr
+    self.nodes_dict = _AdjacencyView(self._csr) # node -> set of nodes it has an edge to
+    self.pred_dict = _AdjacencyView(self._csr.reverse()) if self.digraph else {} # digraph only, as in Graph
+    self.edges_dict = _EdgeView(self._csr) # (from node, to node) -> weight
+
+  def freeze(self):
+    return self._csr # already a snapshot
+
+  def predecessors(self, node):
+    # nodes with an edge leading into node; in an undirected graph these are just its neighbours
+    if self.digraph:
+      return self.pred_dict[node]
+    return self.nodes_dict[node]
+
+  def changes_since(self, version):
+    return [] # nothing has changed, so cached results always hold
+
+  def is_connected(self):
+    # connected for a graph, strongly connected for a digraph, found with flags per node rather than sets of labels
+    csr = self._csr
+    if len(csr) < 1:
+      return False
+    return _reaches_all(csr) and (not self.digraph or _reaches_all(csr.reverse()))
+
+
+  @classmethod
+  def build(cls, path, source, digraph=None):
+    # write a DiskGraph file at path and open it.  source is the name of a file graph_io can read, or a function
+    # returning a new iterator over graph_io records each time it is called, as it is read twice.  digraph is used
+    # for sources that do not say which kind of graph they hold.  Repeated edges keep the last weight, as in Graph
+    if isinstance(source, str):
+      file_name = source
+      digraph, records = graph_io.iter_graph(file_name, digraph)
+      records.close() # only the kind of graph was wanted, graph_io records open their file on first use so nothing is held
+      source = lambda: graph_io.iter_graph(file_name, digraph)[1]
+    digraph = bool(digraph)
+    directory = os.path.dirname(os.path.abspath(path)) # scratch files go next to the output
+
+    # first pass, number the nodes in the order they appear and count the edges leaving each one
+    ids = {} # node label -> index
+    degree = array('q')
+    for record in source():
+      node_ids = [_node_id(ids, degree, str(label)) for label in record[1:3 if record[0] == 'edge' else 2]]
+      if record[0] == 'edge':
+        degree[node_ids[0]] += 1
+        if not digraph and node_ids[0] != node_ids[1]: # undirected edges are stored in both directions
+          degree[node_ids[1]] += 1
+    n = len(ids)
+    offsets = array('q', [0]) * (n + 1)
+    for i in range(n):
+      offsets[i+1] = offsets[i] + degree[i]
+    del degree
+
+    # second pass, place each edge in the row of the node it leaves
+    with _Scratch(directory, offsets[n], 'q') as targets, _Scratch(directory, offsets[n], 'd') as weights:
+      position = array('q', offsets[:n]) # next free slot in each row
+      for record in source():
+        if record[0] != 'edge': continue
+        u, v, weight = ids[str(record[1])], ids[str(record[2])], float(record[3])
+        for from_id, to_id in ((u, v), (v, u)) if not digraph and u != v else ((u, v),):
+          if position[from_id] == offsets[from_id+1]:
+            raise ValueError('Graph source changed between passes')
+          targets.view[position[from_id]] = to_id
+          weights.view[position[from_id]] = weight
+          position[from_id] += 1
+      if position != offsets[1:]:
+        raise ValueError('Graph source changed between passes')
+      del position
+
+      # sort each row by target, dropping repeated edges, into the final arrays
+      with _Scratch(directory, offsets[n], 'q') as final_targets, _Scratch(directory, offsets[n], 'd') as final_weights:
+        final_offsets = array('q', [0]) * (n + 1)
+        in_degree = array('q', [0]) * n if digraph else None
+        m = 0
+        for u in range(n):
+          row = dict(zip(targets.view[offsets[u]:offsets[u+1]], weights.view[offsets[u]:offsets[u+1]])) # last weight wins
+          for v in sorted(row):
+            final_targets.view[m] = v
+            final_weights.view[m] = row[v]
+            m += 1
+            if digraph: in_degree[v] += 1
+          final_offsets[u+1] = m
+        targets.close() # scratch space for the unsorted rows is no longer needed
+        weights.close()
+
+        flags = graph_io.LABEL_INDEX
+        if digraph: flags |= graph_io.DIGRAPH | graph_io.REVERSE
+        labels = list(ids)
+        del ids
+        label_text = '\n'.join(labels).encode('utf-8')
+        label_offsets = array('q', [0]) * (n + 1)
+        encoded = []
+        for i, label in enumerate(labels): # each label is followed by a newline, except the last
+          encoded.append(label.encode('utf-8'))
+          label_offsets[i+1] = label_offsets[i] + len(encoded[i]) + 1
+        del labels
+        label_order = array('q', sorted(range(n), key=encoded.__getitem__)) # byte order of the utf-8 labels
+        del encoded
+
+        with open(path, 'wb') as file:
+          file.write(graph_io.binary_header(flags, n, m, len(label_text)))
+          _write_section(file, final_offsets)
+          _write_section(file, final_targets.view[:m])
+          _write_section(file, final_weights.view[:m])
+          if digraph: # edges entering each node, in rows sorted by the node they leave
+            with _Scratch(directory, m, 'q') as rev_targets, _Scratch(directory, m, 'd') as rev_weights:
+              rev_offsets = array('q', [0]) * (n + 1)
+              for v in range(n):
+                rev_offsets[v+1] = rev_offsets[v] + in_degree[v]
+              position = array('q', rev_offsets[:n])
+              for u in range(n):
+                for e in range(final_offsets[u], final_offsets[u+1]):
+                  v = final_targets.view[e]
+                  rev_targets.view[position[v]] = u
+                  rev_weights.view[position[v]] = final_weights.view[e]
+                  position[v] += 1
+              _write_section(file, rev_offsets)
+              _write_section(file, rev_targets.view)
+              _write_section(file, rev_weights.view)
+          _write_section(file, label_offsets)
+          _write_section(file, label_order)
+          file.write(label_text)
+    return cls(path)
+
+  @classmethod
+  def from_graph(cls, path, graph):
+    # write a Graph or CSRGraph to a DiskGraph file at path and open it
+    csr = graph.freeze()
+    return cls.build(path, lambda: graph_io.iter_csr(csr), csr.digraph)
+
+
+
+class DiskLabels(Sequence):
+  # node labels read from the label text of a file as they are needed, indexed like the nodes
+
+  def __init__(self, offsets, text):
+    self.offsets = offsets # label i is text[offsets[i]:offsets[i+1]-1], the byte before the next label is a newline
+    self.text = text
+
+  def __len__(self):
+    return len(self.offsets) - 1
+
+  def __getitem__(self, i):
+    return self.label_bytes(i).decode('utf-8')
+
+  def label_bytes(self, i):
+    if i < 0: i += len(self)
+    if not 0 <= i < len(self): raise IndexError('node index out of range')
+    return bytes(self.text[self.offsets[i]:self.offsets[i+1]-1])
+
+
+class DiskLabelIndex(Mapping):
+  # node label -> index, found by binary search over the node indexes sorted by label
+
+  def __init__(self, labels, order):
+    self.labels = labels
+    self.order = order
+
+  def __getitem__(self, label):
+    if not isinstance(label, str): raise KeyError(label)
+    key = label.encode('utf-8')
+    low, high = 0, len(self.order)
+    while low < high:
+      middle = (low + high) // 2
+      if self.labels.label_bytes(self.order[middle]) < key: low = middle + 1
+      else: high = middle
+    if low < len(self.order) and self.labels.label_bytes(self.order[low]) == key:
+      return self.order[low]
+    raise KeyError(label)
+
+  def __len__(self):
+    return len(self.order)
+
+  def __iter__(self):
+    return iter(self.labels)
+
+
+class _AdjacencyView(Mapping):
+  # node label -> set of the labels at the other end of its edges in a snapshot
+
+  def __init__(self, csr):
+    self.csr = csr
+
+  def __getitem__(self, node):
+    csr = self.csr
+    i = csr.index[node]
+    labels, targets = csr.labels, csr.targets
+    return frozenset(labels[targets[e]] for e in range(csr.offsets[i], csr.offsets[i+1]))
+
+  def __len__(self):
+    return len(self.csr)
+
+  def __iter__(self):
+    return iter(self.csr.labels)
+
+  def __contains__(self, node):
+    return node in self.csr.index
+
+
+class _EdgeView(Mapping):
+  # (from node, to node) -> weight, found by binary search in the sorted row of the from node
+
+  def __init__(self, csr):
+    self.csr = csr
+
+  def __getitem__(self, edge):
+    csr = self.csr
+    try:
+      i, j = csr.index[edge[0]], csr.index[edge[1]]
+    except (KeyError, TypeError, IndexError):
+      raise KeyError(edge)
+    start, end = csr.offsets[i], csr.offsets[i+1]
+    e = bisect_left(csr.targets, j, start, end)
+    if e == end or csr.targets[e] != j: raise KeyError(edge)
+    return csr.weights[e]
+
+  def __len__(self):
+    return self.csr.edge_count() # undirected edges count in both directions, as in Graph.edges_dict
+
+  def __iter__(self):
+    csr = self.csr
+    labels, offsets, targets = csr.labels, csr.offsets, csr.targets
+    for i in range(len(csr)):
+      label = labels[i]
+      for e in range(offsets[i], offsets[i+1]):
+        yield (label, labels[targets[e]])
+
+
+
+class _Scratch(object):
+  # a temporary array of count values of typecode in a memory mapped file, removed when closed
+  def __init__(self, directory, count, typecode):
+    self.file = tempfile.TemporaryFile(dir=directory)
+    self.file.truncate(max(count, 1) * 8) # an empty file cannot be mapped
+    self.map = mmap.mmap(self.file.fileno(), 0)
+    self.buffer = memoryview(self.map)
+    self.view = self.buffer[:count * 8].cast(typecode)
+
+  def close(self):
+    if self.file is None: return
+    self.view.release()
+    self.buffer.release()
+    self.map.close()
+    self.file.close()
+    self.file = None
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc_info):
+    self.close()
+
+
+def _write_section(file, values):
+  # write an array or memoryview of 8 byte values in little endian order, a block at a time
+  block = 1 << 20
+  for start in range(0, len(values), block):
+    chunk = values[start:start + block]
+    if sys.byteorder != 'little':
+      chunk = array(chunk.format if isinstance(chunk, memoryview) else chunk.typecode, chunk)
+      chunk.byteswap()
+    file.write(chunk)
+
+
+def _node_id(ids, degree, label):
+  # index of the node label, numbering it if it is new
+  node_id = ids.get(label)
+  if node_id is None:
+    if '\n' in label:
+      raise ValueError('Node label ' + repr(label) + ' cannot be written to a binary file')
+    node_id = ids[label] = len(ids)
+    degree.append(0)
+  return node_id
+
+
+def _reaches_all(csr):
+  # True if every node index can be reached from index 0 following the edges of csr
+  n = len(csr)
+  offsets, targets = csr.offsets, csr.targets
+  visited = bytearray(n)
+  visited[0] = 1
+  count = 1
+  stack = [0]
+  while stack:
+    u = stack.pop()
+    for e in range(offsets[u], offsets[u+1]):
+      v = targets[e]
+      if not visited[v]:
+        visited[v] = 1
+        count += 1
+        stack.append(v)
+  return count == n
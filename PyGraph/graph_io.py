@@ -0,0 +1,329 @@
+import os
+import sys
+import mmap
+import struct
+from array import array
+from xml.etree import ElementTree
+from PyGraph.SGraph import Graph, CSRGraph
+
+''' Graph File Input and Output
+
+    Date: 10/18/2026
+
+    Description:
+        This file contains functions for saving graphs to files and loading them again.  Three formats are supported:
+        edge lists (one "from,to,weight" edge per line, commas or whitespace between fields), GraphML, and a binary
+        format holding the arrays of a CSRGraph.  Edge lists and GraphML are read as a stream of records, so files
+        larger than memory can be loaded edge by edge.  GraphML and binary files also keep the position of each node.
+        A binary file is memory mapped when read, so reopening it only reads the node labels.
+
+        Readers produce ('node', label, x, y) records, with x and y None if the file has no position for the node, and
+        ('edge', from_label, to_label, weight) records.  Labels are read back as strings.
+
+'''
+
+GRAPHML_EXTENSIONS = ('.graphml', '.xml')
+BINARY_EXTENSIONS = ('.pygraph',)
+
+DEFAULT_WEIGHT = 1.0 # weight of edges listed without one
+
+# binary format: header, then offsets (n+1 int64), targets (m int64), weights (m float64), positions (2n float64, x
+# and y of each node, only if POSITIONS is set), the edges reversed as rev_offsets, rev_targets and rev_weights (only
+# if REVERSE is set), label_offsets (n+1 int64, where each label starts in the label text) and label_order (n int64,
+# node indexes sorted by label) only if LABEL_INDEX is set, and the node labels as utf-8 text separated by newlines
+_MAGIC = b'PYGRAPH\x00'
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct('<8sIIqqq') # magic, format version, flags, node count, edge count, label bytes
+DIGRAPH = 1 # header flags
+POSITIONS = 2
+REVERSE = 4
+LABEL_INDEX = 8
+
+
+
+def iter_graph(path, digraph=None):
+  # open any supported file by its extension and return (digraph, records) where records is an iterator over the
+  # node and edge records in the file.  digraph is used for edge lists that do not say which kind of graph they hold
+  extension = os.path.splitext(path)[1].lower()
+  if extension in GRAPHML_EXTENSIONS:
+    return iter_graphml(path)
+  if extension in BINARY_EXTENSIONS:
+    csr, positions = read_binary(path)
+    return csr.digraph, iter_csr(csr, positions)
+  return iter_edge_list(path, digraph)
+
+
+def load_graph(path, digraph=None):
+  # read a file into a new Graph, returns (graph, positions) with positions a dictionary of node label -> (x, y)
+  digraph, records = iter_graph(path, digraph)
+  graph = Graph(digraph)
+  positions = {}
+  for record in records:
+    if record[0] == 'node':
+      graph.add_node(record[1])
+      if record[2] is not None: positions[record[1]] = (record[2], record[3])
+    else:
+      graph.add_node(record[1]) # edge lists name nodes only through their edges
+      graph.add_node(record[2])
+      graph.add_edge(record[1], record[2], record[3])
+  return graph, positions
+
+
+def save_graph(graph, path, positions=None):
+  # write a Graph or CSRGraph to a file in the format given by its extension.  positions is an optional dictionary
+  # of node label -> (x, y), which is kept by GraphML and binary files
+  extension = os.path.splitext(path)[1].lower()
+  if extension in GRAPHML_EXTENSIONS:
+    write_graphml(graph, path, positions)
+  elif extension in BINARY_EXTENSIONS:
+    write_binary(graph, path, positions)
+  else:
+    write_edge_list(graph, path)
+
+
+def iter_csr(csr, positions=None):
+  # records for the nodes and edges of a snapshot, positions as returned by read_binary
+  labels = csr.labels
+  for i, label in enumerate(labels):
+    if positions is None or positions[2*i] != positions[2*i]: # no position, or nan for a node saved without one
+      yield ('node', label, None, None)
+    else:
+      yield ('node', label, positions[2*i], positions[2*i+1])
+  for i, label in enumerate(labels):
+    for j, weight in csr.neighbours(i):
+      if csr.digraph or i <= j: # undirected edges are stored in both directions
+        yield ('edge', label, labels[j], weight)
+
+
+
+def iter_edge_list(path, digraph=None):
+  # return (digraph, records) for an edge list file.  Lines hold "from to" or "from to weight" separated by commas
+  # or whitespace, or a single label for a node without edges, followed by a comma if the label holds whitespace.
+  # Lines starting with # are comments, except that "# digraph" or "# graph" as the first line gives the kind of graph
+  with open(path, encoding='utf-8') as file:
+    first = file.readline()
+  kind = first.strip().lstrip('#').strip().lower()
+  if first.startswith('#') and kind in ('graph', 'digraph'):
+    digraph = kind == 'digraph'
+  return bool(digraph), _edge_list_records(path)
+
+
+def _edge_list_records(path):
+  # the file is only opened once the first record is asked for, so closing the generator before then leaves nothing open
+  with open(path, encoding='utf-8') as file:
+    for line_number, line in enumerate(file, 1):
+      line = line.strip()
+      if not line or line.startswith('#'): continue # comments, including the header
+      fields = [field.strip() for field in line.split(',')] if ',' in line else line.split()
+      if len(fields) == 1 or (len(fields) == 2 and not fields[1]): # "label," for labels holding whitespace
+        yield ('node', fields[0], None, None)
+      elif len(fields) in (2, 3):
+        try:
+          weight = float(fields[2]) if len(fields) == 3 else DEFAULT_WEIGHT
+        except ValueError:
+          raise ValueError('Invalid weight on line ' + str(line_number) + ' of ' + path)
+        yield ('edge', fields[0], fields[1], weight)
+      else:
+        raise ValueError('Invalid edge on line ' + str(line_number) + ' of ' + path)
+
+
+def write_edge_list(graph, path):
+  # write one line per edge, each undirected edge once, and a line for each node without edges.  Positions are
+  # not kept, save to GraphML or a binary file for that
+  csr = graph.freeze()
+  labels = csr.labels
+  with open(path, 'w', encoding='utf-8') as file:
+    file.write('# digraph\n' if csr.digraph else '# graph\n')
+    has_edges = bytearray(len(labels)) # nodes that appear in an edge line
+    for i, label in enumerate(labels):
+      for j, weight in csr.neighbours(i):
+        if csr.digraph or i <= j:
+          file.write(_edge_list_field(label) + ',' + _edge_list_field(labels[j]) + ',' + repr(weight) + '\n')
+          has_edges[i] = has_edges[j] = 1
+    for i, label in enumerate(labels):
+      if not has_edges[i]:
+        field = _edge_list_field(label)
+        file.write(field + (',\n' if len(field.split()) > 1 else '\n')) # without a comma it would be split at whitespace
+
+
+def _edge_list_field(label):
+  label = str(label)
+  if not label or label != label.strip() or ',' in label or '\n' in label or label.startswith('#'):
+    raise ValueError('Node label ' + repr(label) + ' cannot be written to an edge list')
+  return label
+
+
+
+def iter_graphml(path):
+  # return (digraph, records) for a GraphML file, read with iterparse so only one element is held at a time.
+  # Edge weights and node positions are taken from the data keys named weight, x and y.  A file without a graph
+  # gives no records
+  with open(path, 'rb') as file: # iterparse only closes a file it opened when parsing finishes before python 3.13
+    for event, element in ElementTree.iterparse(file, events=('start',)):
+      if _local_name(element.tag) == 'graph': # only read up to the first graph to find its kind
+        return element.get('edgedefault', 'directed') == 'directed', _graphml_records(path)
+  return False, _graphml_records(path)
+
+
+def _graphml_records(path):
+  # the file is parsed again from the start once the first record is asked for, so closing the generator before
+  # then leaves nothing open
+  keys = {} # key id -> (attribute name, default value)
+  with open(path, 'rb') as file: # opened here rather than by iterparse so closing the generator part way closes it
+    events = ElementTree.iterparse(file, events=('start', 'end'))
+    for event, element in events:
+      tag = _local_name(element.tag)
+      if event == 'end' and tag == 'key':
+        default = None
+        for child in element:
+          if _local_name(child.tag) == 'default': default = child.text
+        keys[element.get('id')] = (element.get('attr.name', element.get('id')), default)
+      elif event == 'start' and tag == 'graph': # the first graph holds the nodes and edges
+        graph_element = element
+        break
+    else:
+      return # file has no graph
+    defaults = {name: default for name, default in keys.values() if default is not None}
+    for event, element in events:
+      if event != 'end': continue
+      tag = _local_name(element.tag)
+      if tag not in ('node', 'edge'): continue
+      data = dict(defaults)
+      for child in element:
+        if _local_name(child.tag) == 'data':
+          data[keys.get(child.get('key'), (child.get('key'),))[0]] = child.text
+      try:
+        if tag == 'node':
+          x, y = data.get('x'), data.get('y')
+          if x is None or y is None:
+            yield ('node', element.get('id'), None, None)
+          else:
+            yield ('node', element.get('id'), float(x), float(y))
+        else:
+          weight = data.get('weight')
+          yield ('edge', element.get('source'), element.get('target'), DEFAULT_WEIGHT if weight is None else float(weight))
+      except ValueError:
+        raise ValueError('Invalid number in ' + tag + ' ' + str(element.get('id') or element.get('source')))
+      element.clear() # free the element once it has been read
+      del graph_element[:]
+
+
+def _local_name(tag):
+  return tag.rsplit('}', 1)[-1] # drop the namespace
+
+
+def _quote(text):
+  # text as a quoted xml attribute.  xml.sax.saxutils does the same but imports most of urllib and email with it
+  return '"' + text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;') + '"'
+
+
+def write_graphml(graph, path, positions=None):
+  csr = graph.freeze()
+  labels = csr.labels
+  with open(path, 'w', encoding='utf-8') as file:
+    file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    file.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+    file.write('  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n')
+    file.write('  <key id="x" for="node" attr.name="x" attr.type="double"/>\n')
+    file.write('  <key id="y" for="node" attr.name="y" attr.type="double"/>\n')
+    file.write('  <graph edgedefault="' + ('directed' if csr.digraph else 'undirected') + '">\n')
+    for label in labels:
+      position = positions.get(label) if positions else None
+      if position is None:
+        file.write('    <node id=' + _quote(str(label)) + '/>\n')
+      else:
+        file.write('    <node id=' + _quote(str(label)) + '><data key="x">' + repr(float(position[0])) +
+                   '</data><data key="y">' + repr(float(position[1])) + '</data></node>\n')
+    for i, label in enumerate(labels):
+      source = _quote(str(label))
+      for j, weight in csr.neighbours(i):
+        if csr.digraph or i <= j:
+          file.write('    <edge source=' + source + ' target=' + _quote(str(labels[j])) +
+                     '><data key="weight">' + repr(weight) + '</data></edge>\n')
+    file.write('  </graph>\n')
+    file.write('</graphml>\n')
+
+
+
+def write_binary(graph, path, positions=None):
+  csr = graph.freeze()
+  labels = [str(label) for label in csr.labels]
+  for label in labels:
+    if '\n' in label:
+      raise ValueError('Node label ' + repr(label) + ' cannot be written to a binary file')
+  label_bytes = '\n'.join(labels).encode('utf-8')
+  flags = DIGRAPH if csr.digraph else 0
+  if positions:
+    flags |= POSITIONS
+    nan = float('nan')
+    coordinates = array('d')
+    for label in csr.labels:
+      x, y = positions.get(label, (nan, nan))
+      coordinates.append(x)
+      coordinates.append(y)
+  sections = [array('q', csr.offsets), array('q', csr.targets), array('d', csr.weights)]
+  if flags & POSITIONS: sections.append(coordinates)
+  with open(path, 'wb') as file:
+    file.write(binary_header(flags, len(labels), len(csr.targets), len(label_bytes)))
+    for section in sections:
+      if sys.byteorder != 'little': section.byteswap() # files are little endian
+      section.tofile(file)
+    file.write(label_bytes)
+
+
+def read_binary(path):
+  # return (csr, positions) for a binary file.  The arrays of the CSRGraph are views of the memory mapped file, so
+  # nothing but the labels is read until it is used.  positions is None, or the x and y of node i at positions[2*i]
+  # and positions[2*i+1], nan for a node saved without a position
+  flags, n, m, sections, label_text = map_binary(path)
+  labels = bytes(label_text).decode('utf-8').split('\n') if n else []
+  csr = CSRGraph(labels, sections['offsets'], sections['targets'], sections['weights'], bool(flags & DIGRAPH))
+  if flags & REVERSE:
+    csr._reverse = CSRGraph(labels, sections['rev_offsets'], sections['rev_targets'], sections['rev_weights'], True, csr.index)
+    csr._reverse._reverse = csr
+  return csr, sections.get('positions')
+
+
+def binary_header(flags, n, m, label_size):
+  # header of a binary file holding n nodes, m edges and label_size bytes of label text
+  return _HEADER.pack(_MAGIC, _FORMAT_VERSION, flags, n, m, label_size)
+
+
+def binary_sections(flags, n, m):
+  # (name, length, typecode) of each array stored in a binary file with the given header, in file order
+  sections = [('offsets', n + 1, 'q'), ('targets', m, 'q'), ('weights', m, 'd')]
+  if flags & POSITIONS: sections.append(('positions', 2 * n, 'd'))
+  if flags & REVERSE: sections += [('rev_offsets', n + 1, 'q'), ('rev_targets', m, 'q'), ('rev_weights', m, 'd')]
+  if flags & LABEL_INDEX: sections += [('label_offsets', n + 1, 'q'), ('label_order', n, 'q')]
+  return sections
+
+
+def map_binary(path):
+  # memory map a binary file and return (flags, node count, edge count, sections, label text) where sections maps
+  # the name of each array in the file to a view of it, and label text is a memoryview of the labels
+  with open(path, 'rb') as file:
+    size = os.fstat(file.fileno()).st_size
+    if size < _HEADER.size:
+      raise ValueError(path + ' is not a graph file')
+    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) # stays mapped while the views below exist
+  magic, version, flags, n, m, label_size = _HEADER.unpack_from(mapped)
+  if magic != _MAGIC:
+    raise ValueError(path + ' is not a graph file')
+  if version != _FORMAT_VERSION:
+    raise ValueError(path + ' was written in an unsupported format version ' + str(version))
+  layout = binary_sections(flags, n, m)
+  if _HEADER.size + 8 * sum(count for name, count, typecode in layout) + label_size != size:
+    raise ValueError(path + ' is truncated or corrupt')
+
+  view = memoryview(mapped)
+  sections = {}
+  start = _HEADER.size
+  for name, count, typecode in layout:
+    section = view[start:start + 8 * count]
+    if sys.byteorder == 'little':
+      sections[name] = section.cast(typecode)
+    else: # swap into a copy on big endian machines
+      sections[name] = array(typecode, section.tobytes())
+      sections[name].byteswap()
+    start += 8 * count
+  return flags, n, m, sections, view[start:start + label_size]
@@ -1,7 +1,11 @@
 import sys
-from queue import PriorityQueue
 import heapq
 import random
+import math
+from collections import deque
+from PyGraph.SGraph import Graph, UnionFind
+
+PROGRESS_INTERVAL = 1024 # loop steps between calls to an algorithm's progress function
 
 ''' Graph Path Algortihm File
   
@@ -14,130 +18,460 @@ import random
     Modified: 5/10/2017 
     Changes made: added bellman fords algorithm to find shortest path under additional circumstances
 
+    Modified: 10/18/2026
+    Changes made: algorithms run on the integer indexed CSRGraph snapshot returned by graph.freeze(), so they
+    accept either a Graph or a CSRGraph.  Dijkstra and prims use heaps, and kruskals algorithm was added.
+    Bellman ford uses a queue of changed nodes and returns the negative cycle it finds.  Added an iterative
+    tarjans algorithm for strongly connected components, and bidirectional dijkstra and A* for point to point queries.
+    Bidirectional dijkstra, bellman ford and prims take an optional progress function, called every PROGRESS_INTERVAL
+    steps with the fraction of the work done.  An exception raised by it stops the algorithm.  Searches that stop
+    at their end nodes are only used on graphs without negative edges, otherwise every reachable node is searched
+
     Description:
         This file contains graph shortest path finding, and minimum spanning tree algorithms
 
 '''
 
 def dijkstra(graph, from_v, to_v_list=None):
-  q = PriorityQueue() # create a priority queue
-  node_dict = {}  # create a node dictionary to return a distance, parent pair given a node value 
-  current = (None, None) # holds the currently selected node
-  edge_w = None
+  csr = graph.freeze() # integer indexed snapshot of the graph
 	
-  if to_v_list is None: to_v_list = node_dict.keys() # if no node was input, find path to all nodes
+  if to_v_list is None: to_v_list = csr.labels # if no node was input, find path to all nodes
 
   # make start node is valid	
-  if from_v not in graph.nodes_dict:
+  if from_v not in csr.index:
     print ('Invalid start node of ' + str(from_v))
     return
 	  
   # make sure destination nodes are valid
   for node in to_v_list:
-    if node not in graph.nodes_dict:
+    if node not in csr.index:
       print ('Invalid end node of ' + str(node))
       return	
     
-  # set up algorithm start conditions
-  for node in graph.nodes_dict.keys(): # for each node
-    if node == from_v: # if node is the start node
-      q.put((0, node))  # put node in queue with 0 distance
-      node_dict[node] = (0, node) # put into dictionary with 0 distance and itself as a parent
+  start = csr.index[from_v]
+  goals = None # settle every reachable node
+  if to_v_list is not csr.labels and not csr.has_negative_weights(): # stopping early could miss a negative edge
+    goals = [csr.index[node] for node in to_v_list]
+  search = _dijkstra_search(csr, start, goals)
+  if search is None: return [('Invalid', -1, None)] # a negative edge was reached
+  dist, parent = search
+    
+  return _path_results(csr, start, dist, parent, to_v_list)
+
+
+def _dijkstra_search(csr, start, goals=None):
+  # heap based dijkstra over node indexes.  Stale heap entries are skipped rather than removed, and the
+  # search stops once every index in goals is settled (goals of None settles everything reachable), so goals
+  # must only be given for graphs without negative weights.  returns (dist, parent) lists indexed by node, or None if a negative edge is reached
+  offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+  dist = [float('inf')] * len(csr) # distance from start for each node index
+  parent = [-1] * len(csr) # parent index for each node index
+  done = bytearray(len(csr)) # flags for settled node indexes
+  dist[start] = 0
+  parent[start] = start
+  remaining = None if goals is None else set(goals) # goals not yet settled
+  heap = [(0, start)] # put start node in heap with 0 distance
+  heappop, heappush = heapq.heappop, heapq.heappush
+
+  while heap:
+    current_dist, current = heappop(heap) # get node with shortest distance from start
+    if done[current]: continue # stale entry for a node that was already settled
+    done[current] = 1
+    if remaining is not None:
+      remaining.discard(current)
+      if not remaining: break # every requested node is settled
+    for e in range(offsets[current], offsets[current+1]): # for each adjacent node
+      edge_w = weights[e]
+      if edge_w < 0: return None
+      adj_node = targets[e]
+      new_dist = current_dist + edge_w
+      if new_dist < dist[adj_node]: # if distance to start is less than it originally was 
+        dist[adj_node] = new_dist # change distance and parent of node
+        parent[adj_node] = current
+        heappush(heap, (new_dist, adj_node)) # push new entry, any older entry for the node goes stale
+
+  return dist, parent
+
+
+
+def bidirectional_dijkstra(graph, from_v, to_v, progress=None):
+  # point to point dijkstra searching forward from from_v and backward from to_v at the same time.  Only the
+  # nodes explored by the two searches are touched, and a Graph is searched directly without freezing it.
+  # returns [(to_v, distance, path)] in the same format as dijkstra.  progress is given the fraction of nodes settled
+  if not _has_node(graph, from_v):
+    print ('Invalid start node of ' + str(from_v))
+    return
+  if not _has_node(graph, to_v):
+    print ('Invalid end node of ' + str(to_v))
+    return
+  if _has_negative_edge(graph): return dijkstra(graph, from_v, [to_v]) # searches everything reachable for negative edges
+  search = _bidirectional_search(graph, from_v, to_v, progress)
+  if search is None: return [('Invalid', -1, None)] # a negative edge was reached
+  return [(to_v, search.distance, search.path)]
+
+
+class _BidirectionalSearch(object):
+  # state left by a bidirectional search.  dist and done hold the distances found and the nodes settled by
+  # the forward [0] and backward [1] searches, and frontier the smallest distance each search had left to
+  # explore, a lower bound on the distance to any node that search did not settle
+  __slots__ = ('distance', 'path', 'dist', 'done', 'frontier')
+
+
+def _bidirectional_search(graph, from_v, to_v, progress=None):
+  # returns a _BidirectionalSearch, or None if the graph has a negative edge.  The searches stop once they meet,
+  # so they cannot tell whether a negative edge is reachable
+  if _has_negative_edge(graph): return None
+  neighbours = (_neighbour_function(graph, False), _neighbour_function(graph, True)) # forward and backward edges
+  dist = ({from_v: 0}, {to_v: 0}) # distances found by each search
+  parent = ({from_v: None}, {to_v: None}) # parents in each search, towards from_v and towards to_v
+  done = (set(), set()) # nodes settled by each search
+  heaps = ([(0, 0, from_v)], [(0, 0, to_v)]) # (distance, tie breaker, node) so labels are never compared
+  best, meet = float('inf'), None # length of the shortest path seen so far and the node where the searches joined
+  if from_v == to_v: best, meet = 0, from_v
+  counter = 1
+  heappop, heappush = heapq.heappop, heapq.heappush
+  steps = 0
+  if progress is not None:
+    node_count = len(graph.nodes_dict) if isinstance(graph, Graph) else len(graph.freeze())
+
+  while heaps[0] and heaps[1]:
+    if heaps[0][0][0] + heaps[1][0][0] >= best: break # no unexplored path can be shorter than best
+    steps += 1
+    if progress is not None and steps % PROGRESS_INTERVAL == 0:
+      progress(min(1.0, (len(done[0]) + len(done[1])) / node_count))
+    side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1 # advance the search with the closer frontier
+    heap, side_dist, side_parent, side_done = heaps[side], dist[side], parent[side], done[side]
+    other_dist = dist[1-side]
+    current_dist, tie, current = heappop(heap)
+    if current in side_done: continue # stale entry for a node that was already settled
+    side_done.add(current)
+    for adj_node, edge_w in neighbours[side](current):
+      if edge_w < 0: return None
+      new_dist = current_dist + edge_w
+      if new_dist < side_dist.get(adj_node, float('inf')):
+        side_dist[adj_node] = new_dist
+        side_parent[adj_node] = current
+        heappush(heap, (new_dist, counter, adj_node))
+        counter += 1
+      if adj_node in other_dist and new_dist + other_dist[adj_node] < best: # the two searches meet at adj_node
+        best = new_dist + other_dist[adj_node]
+        meet = adj_node
+
+  search = _BidirectionalSearch()
+  search.distance = best
+  search.dist = dist
+  search.done = done
+  search.frontier = tuple(heap[0][0] if heap else float('inf') for heap in heaps)
+  search.path = None
+  if meet is not None: # searches met, join the two halves of the path
+    path = []
+    node = meet
+    while node is not None: # walk back from the meeting node to from_v
+      path.append(node)
+      node = parent[0][node]
+    path.reverse()
+    node = parent[1][meet]
+    while node is not None: # then forward from the meeting node to to_v
+      path.append(node)
+      node = parent[1][node]
+    search.path = path
+  return search
+
+
+def astar(graph, from_v, to_v, heuristic=None, positions=None):
+  # A* search from from_v to to_v.  heuristic(node, to_v) must not overestimate the remaining distance for
+  # the path to be the shortest.  If no heuristic is given but positions maps nodes to (x, y) points, the
+  # straight line distance between points is used, which only underestimates when edge weights are at
+  # least as long as the edges are drawn.  Without either it behaves like dijkstra.
+  # returns [(to_v, distance, path)] in the same format as dijkstra
+  if not _has_node(graph, from_v):
+    print ('Invalid start node of ' + str(from_v))
+    return
+  if not _has_node(graph, to_v):
+    print ('Invalid end node of ' + str(to_v))
+    return
+  if heuristic is None:
+    if positions is not None:
+      goal_x, goal_y = positions[to_v]
+      heuristic = lambda node, goal: math.hypot(positions[node][0] - goal_x, positions[node][1] - goal_y)
     else:
-      node_dict[node] = (float('inf'), None) # put all other nodes in dictionary with largest possible distance and no parent
-		
-  while not q.empty():
-    current = q.get() # get node with shortest distance from start
-    for adj_node in graph.nodes_dict[current[1]]: # for each adjacent node
-      edge_w = graph.edges_dict[(current[1], adj_node)]
+      heuristic = lambda node, goal: 0
+  if _has_negative_edge(graph): return dijkstra(graph, from_v, [to_v]) # searches everything reachable for negative edges
+
+  neighbours = _neighbour_function(graph, False)
+  dist = {from_v: 0} # best known distance to each node
+  parent = {from_v: None}
+  heap = [(heuristic(from_v, to_v), 0, 0, from_v)] # (estimated total, distance, tie breaker, node)
+  counter = 1
+  heappop, heappush = heapq.heappop, heapq.heappush
+
+  while heap:
+    estimate, current_dist, tie, current = heappop(heap)
+    if current_dist > dist[current]: continue # stale entry, a shorter route to current was found later
+    if current == to_v: break # goal reached
+    for adj_node, edge_w in neighbours(current):
       if edge_w < 0: return [('Invalid', -1, None)]
-      dist = current[0] + edge_w
-      if dist < node_dict[adj_node][0]: # if distance to start is less than it originally was 
-        q.put((dist, adj_node)) # put new dist parent pair in queue
-        node_dict[adj_node] = (dist, current[1]) # change value in node dictionary
-    
-  result = []
-  for node in to_v_list: # go through all end nodes 
-    path = [node] 
-    total_dist = node_dict[node][0] # set total distance to dist from start to goal node
-    if total_dist == float('inf'): # if path wasn't found
-      result.append((node, total_dist, None)) # return result with None 
-    else:  
-      while path[0] != from_v: # while node at 0 index is not start node
-        path.insert(0, node_dict[path[0]][1]) # insert parent into 0 index of path
-      result.append((node, total_dist, path)) # add path to result list
-		  
-  return result	  
+      new_dist = current_dist + edge_w
+      if new_dist < dist.get(adj_node, float('inf')):
+        dist[adj_node] = new_dist
+        parent[adj_node] = current
+        heappush(heap, (new_dist + heuristic(adj_node, to_v), new_dist, counter, adj_node))
+        counter += 1
+
+  if to_v not in dist: return [(to_v, float('inf'), None)] # goal was never reached
+  path = []
+  node = to_v
+  while node is not None: # walk parents back to the start node
+    path.append(node)
+    node = parent[node]
+  path.reverse()
+  return [(to_v, dist[to_v], path)]
+
+
+def _has_negative_edge(graph):
+  if isinstance(graph, Graph): return graph.negative_edges > 0
+  return graph.freeze().has_negative_weights()
+
+
+def _has_node(graph, node):
+  if isinstance(graph, Graph): return node in graph.nodes_dict
+  return node in graph.freeze().index
+
 
+def _neighbour_function(graph, reverse):
+  # return a function giving (adjacent node, weight) pairs for a node label, following edges backwards if
+  # reverse.  A Graph is read directly, anything else through its CSRGraph snapshot
+  if isinstance(graph, Graph):
+    edges_dict = graph.edges_dict
+    if reverse:
+      pred_dict = graph.pred_dict if graph.digraph else graph.nodes_dict
+      return lambda node: [(adj, edges_dict[(adj, node)]) for adj in pred_dict[node]]
+    nodes_dict = graph.nodes_dict
+    return lambda node: [(adj, edges_dict[(node, adj)]) for adj in nodes_dict[node]]
+  csr = graph.freeze()
+  if reverse: csr = csr.reverse()
+  offsets, targets, weights, labels, index = csr.offsets, csr.targets, csr.weights, csr.labels, csr.index
+  def neighbours(node):
+    i = index[node]
+    return [(labels[targets[e]], weights[e]) for e in range(offsets[i], offsets[i+1])]
+  return neighbours
 
 
-def prims(graph):
-  if not graph.is_connected(): return None # if graph is not connected return None
-  nodes_list = [] 
+
+def prims(graph, progress=None):
+  # heap based prims algorithm, O(E log V).  returns a list of (weight, from node, to node) edges forming a
+  # minimum spanning tree, or None if the graph is not connected.  progress is given the fraction of nodes in the tree
+  csr = graph.freeze() # integer indexed snapshot of the graph
+  if len(csr) < 1: return None # an empty graph has no spanning tree
+  offsets, targets, weights, labels = csr.offsets, csr.targets, csr.weights, csr.labels
+  in_tree = bytearray(len(csr)) # flags for node indexes already in the tree
   edges_list = [] 
-  edges_q = PriorityQueue() 
-  current = random.choice(list(graph.nodes_dict.keys())) # randomly select a node
-  nodes_list.append(current) # add to list of nodes
-  while len(nodes_list) < len(graph.nodes_dict): # while all nodes have not been added to list
-    edges_q.queue.clear() # clear the queue
-    for node in nodes_list: # for each node in list
-      for adj_node in graph.nodes_dict[node]: # go through adjacent nodes
-        weight = graph.edges_dict[(node, adj_node)] 
-        if adj_node not in nodes_list: # if the adjacent node is not in the node list
-          edges_q.put((weight, node, adj_node)) # add associated edge to queue
-    min_edge = edges_q.get() # get the smallest weight edge from the queue
-    edges_list.append(min_edge) # add the edge to edge list
-    nodes_list.append(min_edge[2]) # add the associated node to node list
+  edges_q = [] # heap of (weight, from index, to index) edges leaving the tree
+  heappop, heappush = heapq.heappop, heapq.heappush
+
+  current = random.randrange(len(csr)) # randomly select a node
+  while True:
+    in_tree[current] = 1 # add node to tree
+    if progress is not None and len(edges_list) % PROGRESS_INTERVAL == 0:
+      progress(len(edges_list) / len(csr))
+    for e in range(offsets[current], offsets[current+1]): # push its edges to nodes outside the tree
+      adj_node = targets[e]
+      if not in_tree[adj_node]:
+        heappush(edges_q, (weights[e], current, adj_node))
+    if len(edges_list) == len(csr) - 1: break # every node has been added
+    while edges_q and in_tree[edges_q[0][2]]: # discard edges whose far end joined the tree since they were pushed
+      heappop(edges_q)
+    if not edges_q: return None # remaining nodes cannot be reached so the graph is not connected
+    weight, from_node, current = heappop(edges_q) # get the smallest weight edge leaving the tree
+    edges_list.append((weight, labels[from_node], labels[current])) # add the edge to edge list
 
   return edges_list # return list of edges
 
 
+def kruskal(graph):
+  # kruskals algorithm using union find, O(E log E).  returns the same result as prims
+  csr = graph.freeze() # integer indexed snapshot of the graph
+  if len(csr) < 1: return None # an empty graph has no spanning tree
+  offsets, targets, weights, labels = csr.offsets, csr.targets, csr.weights, csr.labels
+  edges = []
+  for u in range(len(csr)): # gather each edge once, undirected edges are stored in both directions
+    for e in range(offsets[u], offsets[u+1]):
+      v = targets[e]
+      if csr.digraph or u < v:
+        edges.append((weights[e], u, v))
+  edges.sort() # consider edges from smallest to largest weight
+
+  components = UnionFind(range(len(csr)))
+  edges_list = []
+  for weight, u, v in edges:
+    if components.union(u, v): # edge joins two separate trees
+      edges_list.append((weight, labels[u], labels[v]))
+      if components.components == 1: break # all nodes are joined
+
+  if components.components != 1: return None # graph is not connected
+  return edges_list
 
 
-def bellman_ford(graph, from_v, to_v_list=None):
-  node_dict = {}  # create a node dictionary to return a distance, parent pair given a node value 
 
-  if to_v_list is None: to_v_list = node_dict.keys() # if no node was input, find path to all nodes
+
+def bellman_ford(graph, from_v, to_v_list=None, progress=None):
+  # queue based bellman ford (SPFA).  Only nodes whose distance just changed are relaxed again, so the
+  # search ends as soon as a round relaxes nothing.  If a negative cycle can be reached from from_v the
+  # result is [('Negative cycle', -inf, cycle)] where cycle lists the cycle nodes, first node repeated at the end.
+  # progress is given the larger of the fraction of nodes reached and the longest path found over the node count,
+  # as a negative cycle is found once a path reaches that length
+  csr = graph.freeze() # integer indexed snapshot of the graph
+
+  if to_v_list is None: to_v_list = csr.labels # if no node was input, find path to all nodes
 
   # make sure start node is valid	
-  if from_v not in graph.nodes_dict:
+  if from_v not in csr.index:
     print ('Invalid start node of ' + str(from_v))
     return
 	  
   # make sure destination nodes are valid
   for node in to_v_list:
-    if node not in graph.nodes_dict:
+    if node not in csr.index:
       print ('Invalid end node of ' + str(node))
       return	
     
-  # set up algorithm start conditions
-  for node in graph.nodes_dict.keys(): # for each node
-    if node == from_v: # if node is the start node
-      node_dict[node] = (0, node) # put into dictionary with 0 distance and itself as a parent
-    else:
-      node_dict[node] = (float('inf'), None) # put all other nodes in dictionary with largest possible distance and no parent
-
-  for i in range(len(graph.nodes_dict.keys())-1): # loop through once for each the number of vertices - 1
-    for (u, v), weight in graph.edges_dict.items(): # for each loop get each edge 
-      if node_dict[u][0] + weight < node_dict[v][0]: # if shorter path found using that edge
-        node_dict[v] = (node_dict[u][0] + weight, u) # reset node's distance and parent
-  result = [] 
-  for (u, v), weight in graph.edges_dict.items(): # try to relax edges one more time
-    if node_dict[u][0] + weight < node_dict[v][0]: # if distance to a node can be shortened again a negative cycle exists 
-      result.append((node, -1, None)) # return result with none path and 
-      return result
+  start = csr.index[from_v]
+  dist, parent, cycle = _spfa_search(csr, [start], progress)
+  if cycle is not None: # a negative cycle was found
+    return [('Negative cycle', float('-inf'), [csr.labels[i] for i in cycle])]
   
+  return _path_results(csr, start, dist, parent, to_v_list)
+
+
+def _spfa_search(csr, sources, progress=None):
+  # shortest path faster algorithm over node indexes, starting from every index in sources at distance 0.
+  # returns (dist, parent, None), or (None, None, cycle) with the node indexes of a negative cycle
+  offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+  n = len(csr)
+  dist = [float('inf')] * n # distance from start for each node index
+  parent = [-1] * n # parent index for each node index, -1 for the sources
+  length = [0] * n # number of edges on the current best path to each node
+  in_queue = bytearray(n) # flags for node indexes waiting in the queue
+  queue = deque()
+  for start in sources:
+    dist[start] = 0
+    in_queue[start] = 1
+    queue.append(start)
+  inf = float('inf')
+  reached = len(queue) # nodes given a distance so far
+  longest = 0 # most edges on any path found so far
+  steps = 0
+
+  while queue:
+    u = queue.popleft()
+    in_queue[u] = 0
+    if progress is not None:
+      longest = max(longest, length[u])
+      steps += 1
+      if steps % PROGRESS_INTERVAL == 0:
+        progress(max(reached, longest) / n)
+    dist_u = dist[u]
+    for e in range(offsets[u], offsets[u+1]): # relax each edge leaving u
+      v = targets[e]
+      new_dist = dist_u + weights[e]
+      if new_dist < dist[v]: # if shorter path found using that edge
+        if dist[v] == inf: reached += 1 # first path found to v
+        dist[v] = new_dist # reset node's distance and parent
+        parent[v] = u
+        length[v] = length[u] + 1
+        if length[v] >= n: # a path with n edges repeats a node, so it runs through a negative cycle
+          return None, None, _negative_cycle(parent, v, n)
+        if not in_queue[v]: # distance changed so its edges must be relaxed again
+          in_queue[v] = 1
+          queue.append(v)
+
+  return dist, parent, None
+
+
+def _negative_cycle(parent, v, n):
+  # v was reached by a path of n or more edges, so walking n parents back from it lands on a cycle
+  for i in range(n):
+    v = parent[v]
+  cycle = [v]
+  u = parent[v]
+  while u != v: # collect the cycle by following parents until v comes around again
+    cycle.append(u)
+    u = parent[u]
+  cycle.append(v)
+  cycle.reverse() # parents were followed backwards, reverse to get the cycle in edge order
+  return cycle
+
+
+def strongly_connected_components(graph):
+  # iterative tarjans algorithm, O(V + E).  returns a list of components, each a list of node labels.
+  # for an undirected graph the components are its connected components
+  csr = graph.freeze() # integer indexed snapshot of the graph
+  offsets, targets, labels = csr.offsets, csr.targets, csr.labels
+  n = len(csr)
+  order = [-1] * n # discovery order of each node index, -1 if not yet visited
+  low = [0] * n # lowest discovery order reachable from the node's subtree
+  on_stack = bytearray(n)
+  stack = [] # nodes of components that are not yet complete
+  components = []
+  counter = 0
+
+  for root in range(n):
+    if order[root] != -1: continue
+    work = [(root, offsets[root])] # explicit call stack of (node, next edge to examine)
+    order[root] = low[root] = counter
+    counter += 1
+    stack.append(root)
+    on_stack[root] = 1
+    while work:
+      u, e = work[-1]
+      if e < offsets[u+1]: # u still has edges to examine
+        work[-1] = (u, e + 1)
+        v = targets[e]
+        if order[v] == -1: # tree edge, descend into v
+          order[v] = low[v] = counter
+          counter += 1
+          stack.append(v)
+          on_stack[v] = 1
+          work.append((v, offsets[v]))
+        elif on_stack[v] and order[v] < low[u]: # edge back into the current component
+          low[u] = order[v]
+      else: # all edges of u examined, return to its parent
+        work.pop()
+        if work:
+          parent = work[-1][0]
+          if low[u] < low[parent]: low[parent] = low[u]
+        if low[u] == order[u]: # u is the root of a component, pop the component off the stack
+          component = []
+          while True:
+            v = stack.pop()
+            on_stack[v] = 0
+            component.append(labels[v])
+            if v == u: break
+          components.append(component)
+
+  return components
+
+
+def _path_results(csr, start, dist, parent, to_v_list):
+  # build the (node, distance, path) result list from per index distances and parents
+  result = []
   for node in to_v_list: # go through all end nodes 
-    path = [node] 
-    total_dist = node_dict[node][0] # set total distance to dist from start to goal node
+    i = csr.index[node]
+    total_dist = dist[i] # set total distance to dist from start to goal node
     if total_dist == float('inf'): # if path wasn't found
       result.append((node, total_dist, None)) # return result with None  
     else:  
-      while path[0] != from_v: # while node at 0 index is not start node
-        path.insert(0, node_dict[path[0]][1]) # insert parent into 0 index of path
-      result.append((node, total_dist, path)) # add path to result list
+      result.append((node, total_dist, _build_path(csr, start, parent, i))) # add path to result list
 		  
-  return result	  
-      
-          
-          
+  return result
+
+
+def _build_path(csr, start, parent, end):
+  # follow parent indexes back from end to start and return the path as a list of node labels
+  labels = csr.labels
+  path = [labels[end]]
+  while end != start: # walk back until the start node is reached
+    end = parent[end]
+    path.append(labels[end])
+  path.reverse() # path was collected from end to start
+  return path
@@ -0,0 +1,324 @@
+import math
+import time
+import random
+from collections import deque
+from PyGraph.all_pairs import _import_numpy
+
+''' Graph Layout
+
+    Date: 10/18/2026
+
+    Description:
+        This file contains a force directed layout engine for placing the nodes of a graph.  It uses the Fruchterman
+        Reingold method: every pair of nodes pushes apart, nodes joined by an edge pull together, and the distance
+        nodes may move each step shrinks until they settle.  Far away nodes are pushed by the centers of mass of
+        grid cells rather than one at a time, with the grid halving in size at each level like a Barnes-Hut
+        quadtree, so a step takes time proportional to the node count.  Steps are vectorised with numpy when it is
+        installed, and a full layout then starts from the number of edges between nodes so it begins untangled.
+        Otherwise plain python is used and only nodes in nearby grid cells push each other apart.  Layouts can move
+        only some of the nodes, such as nodes just added and their neighbours, with the rest fixed.
+
+'''
+
+EDGE_LENGTH = 80.0 # k of the Fruchterman Reingold forces, joined nodes settle somewhat further apart than this
+ITERATIONS = 60 # steps for a full layout
+LOCAL_ITERATIONS = 40 # steps when only some nodes move
+PIVOTS = 30 # nodes distances are measured from to start a full layout
+GRAVITY = 0.5 # pull towards the center in a full layout, keeps separate components near each other
+MARGIN = 20.0 # smallest coordinate after a full layout
+MAX_LEVELS = 10 # finest grid has at most 4**MAX_LEVELS cells
+
+
+class ForceLayout(object):
+  ''' Force directed layout of a Graph, CSRGraph or DiskGraph.
+
+      positions is a dictionary of node label -> (x, y) for nodes that already have a place.  Nodes without one
+      start next to their placed neighbours, or at random if they have none; a full layout with no positions at
+      all starts from distances along edges when numpy is installed.  movable is a collection of the labels
+      allowed to move, or None to lay out every node and move the result so no coordinate is below MARGIN.
+      Set use_numpy to False to use the plain python steps even when numpy is installed.
+  '''
+
+  def __init__(self, graph, positions=None, movable=None, edge_length=EDGE_LENGTH, seed=None, use_numpy=None):
+    csr = graph.freeze()
+    self.labels = csr.labels
+    self.k = float(edge_length)
+    self.random = random.Random(seed)
+    n = len(csr)
+    self.full = movable is None
+    index = csr.index
+    self.active = list(range(n)) if self.full else sorted(index[label] for label in movable if label in index)
+    self.np = np = _import_numpy() if use_numpy is not False else None
+
+    # each edge once; undirected edges are stored in both directions
+    offsets, targets = csr.offsets, csr.targets
+    self.sources, self.targets = [], []
+    self.neighbours = [[] for i in range(n)] # node index -> indexes joined to it by an edge in either direction
+    for u in range(n):
+      for e in range(offsets[u], offsets[u+1]):
+        v = targets[e]
+        if v != u and (csr.digraph or u < v):
+          self.sources.append(u)
+          self.targets.append(v)
+          self.neighbours[u].append(v)
+          self.neighbours[v].append(u)
+
+    self.iterations = ITERATIONS if self.full else LOCAL_ITERATIONS
+    self.start_temperature = self.k
+    if self.full and not positions and np is not None and self.sources:
+      self.pos = self.pivot_positions(PIVOTS)
+    else:
+      self.x, self.y = self.start_positions(positions or {})
+      if self.full: # starting from scratch, give nodes room to untangle
+        self.start_temperature = self.k * math.sqrt(n) / 5
+      if np is not None:
+        self.pos = np.column_stack((np.array(self.x, dtype=float), np.array(self.y, dtype=float)))
+    self.step_count = 0
+    if np is not None:
+      self.active_array = np.array(self.active, dtype=np.int64)
+      self.source_array = np.array(self.sources, dtype=np.int64)
+      self.target_array = np.array(self.targets, dtype=np.int64)
+
+  def start_positions(self, positions):
+    # starting x and y lists.  Nodes without a position are placed working outwards from placed nodes, each at
+    # the middle of its placed neighbours
+    n = len(self.labels)
+    x, y = [0.0] * n, [0.0] * n
+    placed = bytearray(n)
+    queue = deque()
+    for i, label in enumerate(self.labels):
+      position = positions.get(label)
+      if position is not None:
+        x[i], y[i] = float(position[0]), float(position[1])
+        placed[i] = 1
+        queue.append(i)
+    count = len(queue)
+    center_x = sum(x) / count if count else 0.0
+    center_y = sum(y) / count if count else 0.0
+
+    jitter = self.k / 2
+    while queue:
+      for j in self.neighbours[queue.popleft()]:
+        if placed[j]: continue
+        near = [i for i in self.neighbours[j] if placed[i]]
+        x[j] = sum(x[i] for i in near) / len(near) + self.random.uniform(-jitter, jitter)
+        y[j] = sum(y[i] for i in near) / len(near) + self.random.uniform(-jitter, jitter)
+        placed[j] = 1
+        queue.append(j)
+
+    spread = self.k * math.sqrt(n - count) / 2 # the rest are not joined to any placed node
+    for i in range(n):
+      if not placed[i]:
+        x[i] = center_x + self.random.uniform(-spread, spread)
+        y[i] = center_y + self.random.uniform(-spread, spread)
+    return x, y
+
+  def pivot_positions(self, pivots):
+    # starting positions from the number of edges between nodes, so a layout starts untangled.  Distances from a
+    # few pivot nodes, each the node farthest from those already chosen, are projected onto the two directions
+    # they vary most in (pivot multidimensional scaling), then scaled so the average edge is self.k long
+    np = self.np
+    n = len(self.labels)
+    columns = []
+    nearest = np.full(n, np.inf)
+    pivot = 0
+    for _ in range(min(pivots, n)):
+      distance = np.array(self.hops_from(pivot), dtype=float)
+      distance[distance < 0] = distance.max() + 1 # other components
+      columns.append(distance)
+      nearest = np.minimum(nearest, distance)
+      pivot = int(nearest.argmax())
+    squared = np.column_stack(columns) ** 2
+    centered = -0.5 * (squared - squared.mean(axis=0) - squared.mean(axis=1)[:, None] + squared.mean())
+    vectors = np.linalg.eigh(centered.T @ centered)[1]
+    pos = centered @ vectors[:, [-1, -2]]
+
+    delta = pos[self.sources] - pos[self.targets]
+    length = np.sqrt((delta * delta).sum(axis=1)).mean()
+    pos *= self.k / max(length, 1e-9)
+    pos += np.array([[self.random.uniform(-1, 1), self.random.uniform(-1, 1)] for i in range(n)]) # split ties
+    return pos
+
+  def hops_from(self, start):
+    # number of edges from start to each node, -1 for nodes it can't reach
+    hops = [-1] * len(self.labels)
+    hops[start] = 0
+    queue = deque([start])
+    neighbours = self.neighbours
+    while queue:
+      u = queue.popleft()
+      next_hops = hops[u] + 1
+      for v in neighbours[u]:
+        if hops[v] < 0:
+          hops[v] = next_hops
+          queue.append(v)
+    return hops
+
+  def run(self, iterations=None, report=None, report_interval=0.5):
+    # take the remaining steps and return the positions of the moving nodes.  report, if given, is called with
+    # the positions at most every report_interval seconds while the layout runs
+    if iterations is not None: self.iterations = iterations
+    last_report = time.perf_counter()
+    while self.step_count < self.iterations:
+      self.step()
+      if report is not None and time.perf_counter() - last_report >= report_interval:
+        report(self.positions())
+        last_report = time.perf_counter()
+    return self.positions()
+
+  def temperature(self):
+    # largest distance a node may move in the next step, shrinking linearly to a tenth of the edge length
+    remaining = 1 - self.step_count / max(self.iterations, 1)
+    return max(self.start_temperature * remaining, self.k / 10)
+
+  def step(self):
+    if self.active:
+      if self.np is not None: self.numpy_step()
+      else: self.python_step()
+    self.step_count += 1
+
+  def positions(self):
+    # label -> (x, y) for each moving node
+    if self.np is not None:
+      xs, ys = self.pos[:, 0].tolist(), self.pos[:, 1].tolist()
+    else:
+      xs, ys = self.x, self.y
+    shift_x = shift_y = 0.0
+    if self.full and self.active: # move the layout to the top left of the scene
+      shift_x = MARGIN - min(xs)
+      shift_y = MARGIN - min(ys)
+    labels = self.labels
+    return {labels[i]: (xs[i] + shift_x, ys[i] + shift_y) for i in self.active}
+
+  def numpy_step(self):
+    np = self.np
+    pos, active = self.pos, self.active_array
+    n = len(pos)
+    k = self.k
+    force = _grid_repulsion(np, pos, active, k * k)
+
+    # attraction of d*d/k along each edge
+    if len(self.source_array):
+      delta = pos[self.source_array] - pos[self.target_array]
+      pull = delta * (np.sqrt((delta * delta).sum(axis=1)) / k)[:, None]
+      attraction = np.empty((n, 2))
+      for axis in (0, 1):
+        attraction[:, axis] = (np.bincount(self.target_array, weights=pull[:, axis], minlength=n) -
+                               np.bincount(self.source_array, weights=pull[:, axis], minlength=n))
+      force += attraction[active]
+    if self.full:
+      force += GRAVITY * (pos.mean(axis=0) - pos[active])
+
+    length = np.sqrt((force * force).sum(axis=1))
+    scale = np.minimum(length, self.temperature()) / np.maximum(length, 1e-9)
+    pos[active] += force * scale[:, None]
+
+  def python_step(self):
+    # repulsion only between nodes within two edge lengths, found through a grid of cells that size
+    x, y, k = self.x, self.y, self.k
+    k2 = k * k
+    cell_size = 2 * k
+    cells = {}
+    for i in range(len(x)):
+      cells.setdefault((int(x[i] // cell_size), int(y[i] // cell_size)), []).append(i)
+    force_x, force_y = {}, {}
+    for i in self.active:
+      fx = fy = 0.0
+      column, row = int(x[i] // cell_size), int(y[i] // cell_size)
+      for near_column in (column - 1, column, column + 1):
+        for near_row in (row - 1, row, row + 1):
+          for j in cells.get((near_column, near_row), ()):
+            if j == i: continue
+            dx, dy = x[i] - x[j], y[i] - y[j]
+            d2 = max(dx*dx + dy*dy, 0.01)
+            if d2 < cell_size * cell_size:
+              fx += dx * k2 / d2
+              fy += dy * k2 / d2
+      force_x[i], force_y[i] = fx, fy
+
+    for u, v in zip(self.sources, self.targets):
+      dx, dy = x[u] - x[v], y[u] - y[v]
+      d = math.sqrt(dx*dx + dy*dy) / k
+      if u in force_x:
+        force_x[u] -= dx * d
+        force_y[u] -= dy * d
+      if v in force_x:
+        force_x[v] += dx * d
+        force_y[v] += dy * d
+
+    if self.full:
+      center_x, center_y = sum(x) / len(x), sum(y) / len(y)
+    temperature = self.temperature()
+    for i in self.active:
+      fx, fy = force_x[i], force_y[i]
+      if self.full:
+        fx += GRAVITY * (center_x - x[i])
+        fy += GRAVITY * (center_y - y[i])
+      length = math.sqrt(fx*fx + fy*fy)
+      if length > 1e-9:
+        scale = min(length, temperature) / length
+        x[i] += fx * scale
+        y[i] += fy * scale
+
+
+def _grid_repulsion(np, pos, active, k2):
+  # repulsive force of k2/d from every node on each active node.  Nodes are sorted into grids of 2**level cells a
+  # side for each level, the levels of a quadtree.  At each level a cell is pushed by the centers of mass of the
+  # cells that are children of its parent's neighbours but not its own neighbours, and at the finest level each
+  # node is pushed by the nodes themselves in its neighbouring cells, so every other node is counted once
+  n = len(pos)
+  low = pos.min(axis=0)
+  side = max(float((pos.max(axis=0) - low).max()), 1.0) * 1.000001
+  levels = max(1, min(MAX_LEVELS, int(math.ceil(math.log(max(n, 2) / 2.0, 4)))))
+  size = 1 << levels
+  cells = np.minimum(((pos - low) * (size / side)).astype(np.int64), size - 1)
+  act_pos, act_cells = pos[active], cells[active]
+  force = np.zeros((len(active), 2))
+
+  # far field from cell centers of mass, 6 by 6 children of the parent's neighbours less the 3 by 3 near cells
+  children = np.arange(6)
+  for level in range(2, levels + 1):
+    shift = levels - level
+    width = 1 << level
+    flat = (cells[:, 0] >> shift) * width + (cells[:, 1] >> shift)
+    mass = np.bincount(flat, minlength=width * width).astype(float)
+    center_x = np.bincount(flat, weights=pos[:, 0], minlength=width * width) / np.maximum(mass, 1)
+    center_y = np.bincount(flat, weights=pos[:, 1], minlength=width * width) / np.maximum(mass, 1)
+    # nodes sharing a cell are pushed alike, with the force at the cell's center of mass
+    own_flat, inverse = np.unique(flat[active], return_inverse=True)
+    own = np.column_stack((own_flat >> level, own_flat & (width - 1)))
+    base = (own >> 1) * 2 - 2
+    column = np.repeat(base[:, 0, None] + children, 6, axis=1)
+    row = np.tile(base[:, 1, None] + children, (1, 6))
+    valid = ((column >= 0) & (column < width) & (row >= 0) & (row < width) &
+             ((np.abs(column - own[:, 0, None]) > 1) | (np.abs(row - own[:, 1, None]) > 1)))
+    cell = np.where(valid, column * width + row, 0)
+    dx = center_x[own_flat, None] - center_x[cell]
+    dy = center_y[own_flat, None] - center_y[cell]
+    scale = np.where(valid, mass[cell], 0) * k2 / np.maximum(dx*dx + dy*dy, 0.01)
+    force[:, 0] += (dx * scale).sum(axis=1)[inverse]
+    force[:, 1] += (dy * scale).sum(axis=1)[inverse]
+
+  # near field, every node in the 3 by 3 cells around each active node at the finest level
+  flat = cells[:, 0] * size + cells[:, 1]
+  order = np.argsort(flat, kind='stable') # nodes grouped by cell
+  counts = np.bincount(flat, minlength=size * size)
+  starts = np.cumsum(counts) - counts
+  steps = np.array([-1, 0, 1])
+  column = np.repeat(act_cells[:, 0, None] + steps, 3, axis=1)
+  row = np.tile(act_cells[:, 1, None] + steps, (1, 3))
+  valid = (column >= 0) & (column < size) & (row >= 0) & (row < size)
+  cell = np.where(valid, column * size + row, 0)
+  count = np.where(valid, counts[cell], 0).ravel()
+  total = int(count.sum())
+  owner = np.repeat(np.repeat(np.arange(len(active)), 3 * 3), count) # active position of each pair
+  within = np.arange(total) - np.repeat(np.cumsum(count) - count, count) # place of the partner in its cell
+  partner = order[np.repeat(starts[cell].ravel(), count) + within]
+  keep = partner != active[owner]
+  owner, partner = owner[keep], partner[keep]
+  dx = act_pos[owner, 0] - pos[partner, 0]
+  dy = act_pos[owner, 1] - pos[partner, 1]
+  scale = k2 / np.maximum(dx*dx + dy*dy, 0.01)
+  force[:, 0] += np.bincount(owner, weights=dx * scale, minlength=len(active))
+  force[:, 1] += np.bincount(owner, weights=dy * scale, minlength=len(active))
+  return force
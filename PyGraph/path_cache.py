@@ -0,0 +1,231 @@
+from collections import OrderedDict
+from PyGraph.graph_path_algorithm import _bidirectional_search, _spfa_search, dijkstra, prims
+
+''' Path Cache File
+
+    Date: 10/18/2026
+
+    Description:
+        This file contains a cache of path algorithm results for one graph.  Each result remembers the graph
+        version it was computed at.  When the graph has changed since, the changes recorded in the graph's
+        journal are checked against what the result depends on, and the result is only recomputed if one of
+        them could alter it.  Results can be computed on another thread from a snapshot of the graph and stored
+        when they are done.
+
+'''
+
+class PathCache(object):
+  ''' Cached dijkstra, bellman ford and prims results for a Graph.
+
+      The methods take the same arguments as the matching path algorithm functions for a single pair
+      of nodes and return results in the same format.  Results are identified by keys of the form
+      ('DIJKSTRA', from_v, to_v), ('BELLMAN FORD', from_v, to_v) and ('PRIMS',).
+
+      To compute a result off the thread that edits the graph, check lookup(key) first, then call
+      compute(key, graph.freeze(), graph.version) on the other thread and pass the entry it returns to
+      store(key, entry) back on the editing thread.
+  '''
+
+  def __init__(self, graph, size=32):
+    self.graph = graph
+    self.size = size # most results kept at once
+    self.entries = OrderedDict() # key -> _CacheEntry, least recently used first
+    self.hits = 0
+    self.misses = 0
+
+  def dijkstra(self, from_v, to_v):
+    return self.get(('DIJKSTRA', from_v, to_v))
+
+  def bellman_ford(self, from_v, to_v):
+    return self.get(('BELLMAN FORD', from_v, to_v))
+
+  def prims(self):
+    return self.get(('PRIMS',))
+
+  def clear(self):
+    self.entries.clear()
+
+  def get(self, key):
+    # the result for key, reused if it still holds for the current graph or computed now
+    for node in key[1:]: # make sure start and end nodes are valid
+      if node not in self.graph.nodes_dict:
+        print ('Invalid node of ' + str(node))
+        return
+    entry = self.lookup(key)
+    if entry is None:
+      entry = self.compute(key)
+      self.store(key, entry)
+    return entry.result
+
+  def lookup(self, key):
+    # the cached entry for key if its result still holds for the current graph, otherwise None
+    graph = self.graph
+    entry = self.entries.get(key)
+    if entry is None: return None
+    changes = graph.changes_since(entry.version)
+    if changes is None or any(entry.affected_by(change, graph.digraph) for change in changes):
+      return None
+    entry.version = graph.version # result still holds for the current graph
+    self.entries.move_to_end(key)
+    self.hits += 1
+    return entry
+
+  def compute(self, key, snapshot=None, version=None, progress=None):
+    # compute a new entry for key on snapshot, a Graph or CSRGraph copy of the graph taken at version.  Without a
+    # snapshot the graph itself is used.  Only reads snapshot, so it can run on another thread
+    if snapshot is None: snapshot, version = self.graph, self.graph.version
+    return _ENTRY_CLASSES[key[0]](snapshot, version, *key[1:], progress=progress)
+
+  def store(self, key, entry):
+    # keep an entry returned by compute, it is checked against the changes made since its version when looked up
+    self.misses += 1
+    self.entries[key] = entry
+    self.entries.move_to_end(key)
+    if len(self.entries) > self.size: # drop the least recently used result
+      self.entries.popitem(last=False)
+
+
+
+class _CacheEntry(object):
+  # a cached result and the graph version it is known to hold for
+
+  def affected_by(self, change, digraph):
+    # return True if the journal entry change could alter the result
+    version, operation, node1, node2, weight = change
+    if operation == 'add_node': return self.node_added(node1)
+    if operation == 'remove_node': return self.node_removed(node1)
+    if operation == 'add_edge':
+      return self.edge_added(node1, node2, weight) or (not digraph and self.edge_added(node2, node1, weight))
+    if operation == 'remove_edge':
+      return self.edge_removed(node1, node2) or (not digraph and self.edge_removed(node2, node1))
+    return True # unknown change
+
+
+class _PathEntry(_CacheEntry):
+  # shared handling for single pair shortest path results
+
+  def path_edges(self, path):
+    return set(zip(path, path[1:])) if path else set()
+
+  def node_added(self, node):
+    return False # a new node has no edges yet
+
+  def node_removed(self, node):
+    # its edges were journaled as removed before it, so only the end nodes and nodes on the path matter
+    return node == self.from_v or node == self.to_v or (self.path is not None and node in self.path)
+
+  def edge_removed(self, from_node, to_node):
+    return (from_node, to_node) in self.on_path # removing edges off the path leaves the path shortest
+
+
+class _DijkstraEntry(_PathEntry):
+
+  def __init__(self, graph, version, from_v, to_v, progress=None):
+    self.version = version
+    self.from_v, self.to_v = from_v, to_v
+    search = _bidirectional_search(graph, from_v, to_v, progress)
+    if search is None: # the graph has a negative edge, search everything reachable and recompute after any change
+      self.search = None
+      self.result = dijkstra(graph, from_v, [to_v])
+      self.path = self.result[0][2]
+      self.on_path = self.path_edges(self.path)
+      return
+    self.search = search
+    self.path = search.path
+    self.on_path = self.path_edges(search.path)
+    self.result = [(to_v, search.distance, search.path)]
+    self.best_in = float('inf') # smallest (distance to start of added edge + weight) over skipped added edges
+    self.best_out = float('inf') # smallest (weight + distance from end of added edge to to_v) over skipped added edges
+
+  def affected_by(self, change, digraph):
+    if self.search is None: return True # no search state to check the change against
+    return _PathEntry.affected_by(self, change, digraph)
+
+  def edge_added(self, from_node, to_node, weight):
+    search = self.search
+    if weight < 0: return True
+    # lower bounds on the distance from from_v to from_node and from to_node to to_v; nodes a search did
+    # not settle are at least as far as that search's frontier
+    dist, done, frontier = search.dist, search.done, search.frontier
+    lower_in = dist[0][from_node] if from_node in done[0] else frontier[0]
+    lower_out = dist[1][to_node] if to_node in done[1] else frontier[1]
+    if lower_in + weight + lower_out < search.distance: return True # a path through the new edge may be shorter
+    # a path using several skipped edges is at least as long as the best way into the first plus the best way
+    # out of the last, so remember those to check the edges added later
+    self.best_in = min(self.best_in, lower_in + weight)
+    self.best_out = min(self.best_out, weight + lower_out)
+    return self.best_in + self.best_out < search.distance
+
+
+class _BellmanFordEntry(_PathEntry):
+
+  def __init__(self, graph, version, from_v, to_v, progress=None):
+    self.version = version
+    self.from_v, self.to_v = from_v, to_v
+    csr = graph.freeze()
+    dist, parent, cycle = _spfa_search(csr, [csr.index[from_v]], progress)
+    labels = csr.labels
+    self.dist, self.parent = {}, {}
+    if cycle is not None: # keep the cycle, it stays reachable and negative while no edges are removed
+      self.path = [labels[i] for i in cycle]
+      self.result = [('Negative cycle', float('-inf'), self.path)]
+    else:
+      for i, d in enumerate(dist): # distances and parents of every node reachable from from_v
+        if d != float('inf'):
+          self.dist[labels[i]] = d
+          self.parent[labels[i]] = labels[parent[i]] if parent[i] >= 0 else None
+      self.path = None
+      if to_v in self.dist:
+        self.path = [to_v]
+        while self.path[-1] != from_v:
+          self.path.append(self.parent[self.path[-1]])
+        self.path.reverse()
+      self.result = [(to_v, self.dist.get(to_v, float('inf')), self.path)]
+    self.on_path = self.path_edges(self.path)
+
+  def edge_added(self, from_node, to_node, weight):
+    if self.result[0][1] == float('-inf'): return False # an added edge cannot remove the negative cycle
+    # distances stay exactly as computed unless the edge shortens the way to to_node
+    return self.dist.get(from_node, float('inf')) + weight < self.dist.get(to_node, float('inf'))
+
+  def edge_removed(self, from_node, to_node):
+    if self.result[0][1] == float('-inf'): return True # the cycle or the way to it may be broken
+    return self.parent.get(to_node) == from_node and to_node in self.dist # a tree edge, distances below it change
+
+
+class _PrimsEntry(_CacheEntry):
+
+  def __init__(self, graph, version, progress=None):
+    self.version = version
+    self.result = prims(graph, progress)
+    self.tree = {} # node -> {adjacent node: weight} for the edges of the spanning tree
+    for weight, node1, node2 in self.result or ():
+      self.tree.setdefault(node1, {})[node2] = weight
+      self.tree.setdefault(node2, {})[node1] = weight
+
+  def node_added(self, node):
+    return self.result is not None # a new node is not connected, a disconnected graph stays disconnected
+
+  def node_removed(self, node):
+    return True # either the tree spanned it or the graph may have become connected
+
+  def edge_added(self, from_node, to_node, weight):
+    if self.result is None: return True # the edge may connect the graph
+    # the tree stays minimal if the new edge is no lighter than every tree edge on the path it closes into a cycle
+    stack = [(from_node, 0)]
+    seen = {from_node}
+    while stack:
+      node, heaviest = stack.pop()
+      if node == to_node: return weight < heaviest
+      for adj, adj_weight in self.tree.get(node, {}).items():
+        if adj not in seen:
+          seen.add(adj)
+          stack.append((adj, max(heaviest, adj_weight)))
+    return True
+
+  def edge_removed(self, from_node, to_node):
+    if self.result is None: return False # removing an edge cannot connect the graph
+    return to_node in self.tree.get(from_node, {})
+
+
+_ENTRY_CLASSES = {'DIJKSTRA': _DijkstraEntry, 'BELLMAN FORD': _BellmanFordEntry, 'PRIMS': _PrimsEntry}
@@ -0,0 +1,7 @@
+import random
+import pytest
+
+
+@pytest.fixture
+def rng():
+  return random.Random(1729) # fixed seed so failures can be reproduced
@@ -0,0 +1,35 @@
+from PyGraph.SGraph import Graph
+
+''' helpers shared by the tests: random graphs and the reference results they are checked against '''
+
+
+def random_graph(rng, n, m, digraph, low=1, high=10):
+  # Graph with nodes 'n0'..'n<n-1>' and up to m edges with integer weights in [low, high].  Integer weights keep
+  # sums exact, so distances found by different algorithms can be compared with ==
+  graph = Graph(digraph)
+  for i in range(n):
+    graph.add_node('n' + str(i))
+  for _ in range(m):
+    u, v = rng.randrange(n), rng.randrange(n)
+    if u != v:
+      graph.add_edge('n' + str(u), 'n' + str(v), rng.randint(low, high))
+  return graph
+
+
+def reference_bellman_ford(graph, from_v):
+  # the original edge by edge bellman ford over edges_dict.  returns a dictionary of node -> distance for the
+  # reachable nodes, or None if a negative cycle can be reached from from_v
+  dist = {from_v: 0}
+  for _ in range(len(graph.nodes_dict) - 1):
+    for (u, v), weight in graph.edges_dict.items():
+      if u in dist and dist[u] + weight < dist.get(v, float('inf')):
+        dist[v] = dist[u] + weight
+  for (u, v), weight in graph.edges_dict.items(): # an edge that still relaxes lies on or after a negative cycle
+    if u in dist and dist[u] + weight < dist.get(v, float('inf')):
+      return None
+  return dist
+
+
+def path_length(graph, path):
+  # total weight of the edges along path, checking each one exists
+  return sum(graph.edges_dict[(u, v)] for u, v in zip(path, path[1:]))
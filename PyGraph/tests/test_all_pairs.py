@@ -0,0 +1,69 @@
+import pytest
+from PyGraph.SGraph import Graph
+import PyGraph.all_pairs as all_pairs
+from PyGraph.all_pairs import AllPairsPaths
+from PyGraph.tests.random_graphs import random_graph, reference_bellman_ford, path_length
+
+''' checks floyd warshall and johnsons algorithm against the original bellman ford '''
+
+METHODS = ['floyd_warshall', 'johnson']
+
+
+def check_all_pairs(graph, paths):
+  for from_v in graph.nodes_dict:
+    expected = reference_bellman_ford(graph, from_v)
+    for to_v in graph.nodes_dict:
+      path = paths.path(from_v, to_v)
+      if to_v in expected:
+        assert paths.distance(from_v, to_v) == expected[to_v]
+        assert path[0] == from_v and path[-1] == to_v
+        assert path_length(graph, path) == expected[to_v]
+      else:
+        assert paths.distance(from_v, to_v) == float('inf') and path is None
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('digraph', [False, True])
+def test_all_pairs_match_bellman_ford(rng, method, digraph):
+  for trial in range(15):
+    low = -2 if digraph else 1 # an undirected negative edge is a negative cycle
+    graph = random_graph(rng, rng.randint(1, 12), rng.randint(0, 40), digraph, low, 10)
+    paths = AllPairsPaths(graph, method)
+    if any(reference_bellman_ford(graph, node) is None for node in graph.nodes_dict):
+      assert paths.negative_cycle is not None
+      assert path_length(graph, paths.negative_cycle) < 0
+      (node, distance, cycle), = paths.query(next(iter(graph.nodes_dict)))
+      assert (node, distance, cycle) == ('Negative cycle', float('-inf'), paths.negative_cycle)
+    else:
+      assert paths.negative_cycle is None
+      check_all_pairs(graph, paths)
+
+
+def test_floyd_warshall_without_numpy(rng, monkeypatch):
+  monkeypatch.setattr(all_pairs, '_numpy', None) # as if numpy were not installed
+  for trial in range(10):
+    graph = random_graph(rng, rng.randint(1, 12), rng.randint(0, 40), True)
+    check_all_pairs(graph, AllPairsPaths(graph, 'floyd_warshall'))
+
+
+@pytest.mark.parametrize('method', METHODS + ['auto'])
+def test_results_follow_graph_changes(method):
+  graph = Graph(True)
+  for node in 'ABC':
+    graph.add_node(node)
+  graph.add_edge('A', 'B', 5)
+  graph.add_edge('B', 'C', 5)
+  paths = AllPairsPaths(graph, method)
+  assert paths.query('A', ['C']) == [('C', 10, ['A', 'B', 'C'])]
+  graph.add_edge('A', 'C', 3)
+  assert paths.query('A', ['C']) == [('C', 3, ['A', 'C'])]
+  graph.remove_edge('A', 'C')
+  graph.remove_edge('B', 'C')
+  assert paths.query('A', ['C']) == [('C', float('inf'), None)]
+
+
+def test_unknown_method():
+  graph = Graph(False)
+  graph.add_node('A')
+  with pytest.raises(ValueError):
+    AllPairsPaths(graph, 'dijkstra')
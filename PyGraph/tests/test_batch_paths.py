@@ -0,0 +1,39 @@
+import pytest
+from PyGraph.batch_paths import dijkstra_many
+from PyGraph.disk_graph import DiskGraph
+from PyGraph.graph_path_algorithm import dijkstra
+import PyGraph.graph_io as graph_io
+from PyGraph.tests.random_graphs import random_graph
+
+''' checks results from the worker processes match dijkstra run in this process '''
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_dijkstra_many(rng, workers):
+  graph = random_graph(rng, 30, 90, True)
+  sources = list(graph.nodes_dict)[:10]
+  targets = list(graph.nodes_dict)[5:15]
+  results = dict(dijkstra_many(graph, sources, targets, workers))
+  assert sorted(results) == sorted(sources)
+  for source in sources:
+    assert results[source] == dijkstra(graph, source, targets)
+
+
+def test_invalid_source(rng, capsys):
+  graph = random_graph(rng, 5, 5, False)
+  assert list(dijkstra_many(graph, ['n0', 'missing'], workers=2)) == []
+  assert 'Invalid start node' in capsys.readouterr().out
+
+
+def test_graphs_read_from_files(rng, tmp_path):
+  # the arrays of both are views of a mapped file rather than arrays
+  graph = random_graph(rng, 30, 90, False)
+  sources = list(graph.nodes_dict)[:10]
+  disk = DiskGraph.from_graph(str(tmp_path / 'graph.pygraph'), graph)
+  graph_io.write_binary(graph, str(tmp_path / 'plain.pygraph'))
+  csr, positions = graph_io.read_binary(str(tmp_path / 'plain.pygraph'))
+  for snapshot in (disk, csr):
+    results = dict(dijkstra_many(snapshot, sources, workers=2))
+    assert sorted(results) == sorted(sources)
+    for source in sources:
+      assert results[source] == dijkstra(graph, source)
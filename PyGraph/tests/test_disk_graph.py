@@ -0,0 +1,83 @@
+import pytest
+from PyGraph.SGraph import Graph
+from PyGraph.disk_graph import DiskGraph
+from PyGraph.graph_path_algorithm import dijkstra, bidirectional_dijkstra, bellman_ford, strongly_connected_components
+import PyGraph.graph_io as graph_io
+from PyGraph.tests.random_graphs import random_graph
+
+''' checks a DiskGraph reads the same as the Graph it was built from '''
+
+
+@pytest.mark.parametrize('digraph', [False, True])
+def test_views_match_graph(rng, tmp_path, digraph):
+  graph = random_graph(rng, 40, 120, digraph)
+  graph.add_node('lone node')
+  disk = DiskGraph.from_graph(str(tmp_path / 'graph.pygraph'), graph)
+  assert disk.digraph == digraph
+  assert set(disk.nodes_dict) == set(graph.nodes_dict)
+  assert dict(disk.edges_dict) == graph.edges_dict
+  for node in graph.nodes_dict:
+    assert disk.nodes_dict[node] == graph.nodes_dict[node]
+    assert disk.predecessors(node) == graph.predecessors(node)
+    assert disk.index[node] == disk.labels.index(node)
+  assert 'missing' not in disk.nodes_dict and ('n0', 'missing') not in disk.edges_dict
+  assert disk.is_connected() == graph.is_connected()
+  assert disk.changes_since(disk.version) == []
+
+
+@pytest.mark.parametrize('digraph', [False, True])
+def test_algorithms_match_graph(rng, tmp_path, digraph):
+  graph = random_graph(rng, 40, 120, digraph)
+  disk = DiskGraph.from_graph(str(tmp_path / 'graph.pygraph'), graph)
+  for from_v in list(graph.nodes_dict)[:5]:
+    expected = {node: distance for node, distance, path in dijkstra(graph, from_v)}
+    assert {node: distance for node, distance, path in dijkstra(disk, from_v)} == expected
+    assert {node: distance for node, distance, path in bellman_ford(disk, from_v)} == expected
+    for to_v in list(graph.nodes_dict)[-3:]:
+      assert bidirectional_dijkstra(disk, from_v, to_v)[0][1] == expected[to_v]
+  assert sorted(map(sorted, strongly_connected_components(disk))) == \
+         sorted(map(sorted, strongly_connected_components(graph)))
+
+
+def test_build_from_files(rng, tmp_path):
+  graph = random_graph(rng, 30, 80, True)
+  for extension in ('.csv', '.graphml', '.pygraph'):
+    source = str(tmp_path / ('source' + extension))
+    graph_io.save_graph(graph, source)
+    disk = DiskGraph.build(str(tmp_path / ('built' + extension + '.pygraph')), source)
+    assert disk.digraph and dict(disk.edges_dict) == graph.edges_dict
+
+
+def test_build_keeps_last_weight(tmp_path):
+  source = tmp_path / 'source.csv'
+  source.write_text('A,B,1\nB,A,2\nA,B,3\nC\n')
+  disk = DiskGraph.build(str(tmp_path / 'graph.pygraph'), str(source))
+  assert not disk.digraph
+  assert dict(disk.edges_dict) == {('A', 'B'): 3.0, ('B', 'A'): 3.0}
+  assert set(disk.nodes_dict) == {'A', 'B', 'C'}
+
+
+def test_build_from_graphml_without_graph(tmp_path):
+  source = tmp_path / 'empty.graphml'
+  source.write_text('<?xml version="1.0"?>\n<graphml xmlns="http://graphml.graphdrawing.org/xmlns"></graphml>\n')
+  disk = DiskGraph.build(str(tmp_path / 'graph.pygraph'), str(source))
+  assert len(disk.nodes_dict) == 0 and not disk.is_connected()
+
+
+def test_source_changed_between_passes(tmp_path):
+  passes = []
+  def source():
+    passes.append(None)
+    yield ('edge', 'A', 'B', 1.0)
+    if len(passes) > 1: yield ('edge', 'A', 'B', 2.0) # more edges than were counted in the first pass
+  with pytest.raises(ValueError, match='changed'):
+    DiskGraph.build(str(tmp_path / 'graph.pygraph'), source, True)
+
+
+def test_plain_binary_file_is_refused(tmp_path):
+  graph = Graph(False)
+  graph.add_node('A')
+  path = str(tmp_path / 'graph.pygraph')
+  graph_io.write_binary(graph, path)
+  with pytest.raises(ValueError, match='label index'):
+    DiskGraph(path)
@@ -0,0 +1,123 @@
+import gc
+import pytest
+from PyGraph.SGraph import Graph
+import PyGraph.graph_io as graph_io
+from PyGraph.tests.random_graphs import random_graph
+
+''' checks graphs come back from each file format as they were saved '''
+
+EXTENSIONS = ['.csv', '.graphml', '.pygraph']
+
+
+def labelled_graph(rng, digraph):
+  # a random graph with string labels, as labels are read back as strings, and weights that are not whole numbers
+  graph = Graph(digraph)
+  source = random_graph(rng, 30, 60, digraph)
+  for node in source.nodes_dict:
+    graph.add_node(node)
+  graph.add_node('node with spaces & <xml>') # no edges, so it has a line of its own in an edge list
+  for (u, v), weight in source.edges_dict.items():
+    if digraph or (v, u) not in graph.edges_dict:
+      graph.add_edge(u, v, weight + rng.random())
+  return graph
+
+
+@pytest.mark.parametrize('extension', EXTENSIONS)
+@pytest.mark.parametrize('digraph', [False, True])
+def test_round_trip(rng, tmp_path, extension, digraph):
+  graph = labelled_graph(rng, digraph)
+  positions = {node: (rng.uniform(-100, 100), rng.uniform(-100, 100)) for node in list(graph.nodes_dict)[::2]}
+  path = str(tmp_path / ('graph' + extension))
+  graph_io.save_graph(graph, path, positions)
+  loaded, loaded_positions = graph_io.load_graph(path)
+  assert loaded.digraph == digraph
+  assert set(loaded.nodes_dict) == set(graph.nodes_dict)
+  assert loaded.edges_dict == graph.edges_dict
+  if extension == '.csv':
+    assert loaded_positions == {} # edge lists do not keep positions
+  else:
+    assert loaded_positions == positions
+
+
+def test_read_binary(rng, tmp_path):
+  graph = labelled_graph(rng, True)
+  path = str(tmp_path / 'graph.pygraph')
+  graph_io.write_binary(graph, path)
+  csr, positions = graph_io.read_binary(path)
+  assert positions is None
+  assert csr.thaw().edges_dict == graph.edges_dict
+  assert csr.reverse().thaw().edges_dict == {(v, u): weight for (u, v), weight in graph.edges_dict.items()}
+
+
+def test_edge_list_formats(tmp_path):
+  path = tmp_path / 'graph.txt'
+  path.write_text('# a comment first, so the kind comes from the argument\nA B\nB, C, 2.5\n\n# another comment\nD\n')
+  digraph, records = graph_io.iter_edge_list(str(path), True)
+  assert digraph
+  assert list(records) == [('edge', 'A', 'B', 1.0), ('edge', 'B', 'C', 2.5), ('node', 'D', None, None)]
+  path.write_text('# digraph\nA B\n')
+  assert graph_io.iter_edge_list(str(path))[0]
+  path.write_text('A B x\n')
+  with pytest.raises(ValueError, match='line 1'):
+    graph_io.load_graph(str(path))
+  path.write_text('A\nA B 1 2\n')
+  with pytest.raises(ValueError, match='line 2'):
+    graph_io.load_graph(str(path))
+
+
+def test_unwritable_labels(tmp_path):
+  graph = Graph(False)
+  graph.add_node('#A')
+  with pytest.raises(ValueError):
+    graph_io.save_graph(graph, str(tmp_path / 'graph.csv'))
+  graph = Graph(False)
+  graph.add_node('A\nB')
+  with pytest.raises(ValueError):
+    graph_io.save_graph(graph, str(tmp_path / 'graph.pygraph'))
+
+
+def test_graphml_defaults(tmp_path):
+  path = tmp_path / 'graph.graphml'
+  path.write_text('<?xml version="1.0"?>\n<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                  '<key id="w" for="edge" attr.name="weight"><default>4</default></key>\n'
+                  '<graph edgedefault="undirected"><node id="A"/><node id="B"/><node id="C"/>\n'
+                  '<edge source="A" target="B"/><edge source="B" target="C"><data key="w">2</data></edge>\n'
+                  '</graph></graphml>\n')
+  graph, positions = graph_io.load_graph(str(path))
+  assert not graph.digraph
+  assert graph.edges_dict[('A', 'B')] == 4 and graph.edges_dict[('C', 'B')] == 2
+
+
+def test_graphml_without_graph(tmp_path):
+  path = tmp_path / 'empty.graphml'
+  path.write_text('<?xml version="1.0"?>\n<graphml xmlns="http://graphml.graphdrawing.org/xmlns"></graphml>\n')
+  digraph, records = graph_io.iter_graphml(str(path))
+  assert list(records) == []
+  records.close()
+
+
+def test_bad_binary_files(tmp_path):
+  path = tmp_path / 'graph.pygraph'
+  path.write_bytes(b'not a graph')
+  with pytest.raises(ValueError):
+    graph_io.read_binary(str(path))
+  graph = Graph(False)
+  graph.add_node('A')
+  graph_io.write_binary(graph, str(path))
+  path.write_bytes(path.read_bytes()[:-1])
+  with pytest.raises(ValueError, match='truncated'):
+    graph_io.read_binary(str(path))
+
+
+@pytest.mark.filterwarnings('error') # a file left open is reported as an unraisable ResourceWarning
+@pytest.mark.parametrize('extension', EXTENSIONS)
+def test_closing_records_closes_file(rng, tmp_path, extension):
+  path = str(tmp_path / ('graph' + extension))
+  graph_io.save_graph(labelled_graph(rng, False), path)
+  digraph, records = graph_io.iter_graph(path)
+  records.close() # before the first record
+  digraph, records = graph_io.iter_graph(path)
+  next(records)
+  records.close() # part way through
+  del records
+  gc.collect()
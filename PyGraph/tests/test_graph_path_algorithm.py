@@ -0,0 +1,190 @@
+import math
+import pytest
+from PyGraph.SGraph import Graph
+from PyGraph.graph_path_algorithm import (dijkstra, bidirectional_dijkstra, astar, bellman_ford, prims, kruskal,
+                                          strongly_connected_components)
+from PyGraph.tests.random_graphs import random_graph, reference_bellman_ford, path_length
+
+''' checks the path algorithms against the original bellman ford on random graphs '''
+
+
+def check_results(graph, from_v, result, expected):
+  # result is a list of (node, distance, path) and expected a dictionary of node -> distance for reachable nodes
+  for node, distance, path in result:
+    if node in expected:
+      assert distance == expected[node]
+      assert path[0] == from_v and path[-1] == node
+      assert path_length(graph, path) == distance
+    else:
+      assert distance == float('inf') and path is None
+
+
+def negative_edge_graph():
+  # A reaches B directly for 1, but the way through C is shorter once the negative edge is counted
+  graph = Graph(True)
+  for node in 'ABC':
+    graph.add_node(node)
+  graph.add_edge('A', 'B', 1)
+  graph.add_edge('A', 'C', 5)
+  graph.add_edge('C', 'B', -10)
+  return graph
+
+
+@pytest.mark.parametrize('digraph', [False, True])
+def test_dijkstra_matches_bellman_ford(rng, digraph):
+  for trial in range(30):
+    graph = random_graph(rng, rng.randint(1, 25), rng.randint(0, 80), digraph)
+    for from_v in list(graph.nodes_dict)[:5]:
+      expected = reference_bellman_ford(graph, from_v)
+      check_results(graph, from_v, dijkstra(graph, from_v), expected)
+      check_results(graph, from_v, dijkstra(graph.freeze(), from_v), expected)
+      targets = rng.sample(list(graph.nodes_dict), min(3, len(graph.nodes_dict)))
+      result = dijkstra(graph, from_v, targets) # stops early once the targets are settled
+      assert [node for node, distance, path in result] == targets
+      check_results(graph, from_v, result, expected)
+
+
+@pytest.mark.parametrize('digraph', [False, True])
+def test_point_to_point_searches_match_bellman_ford(rng, digraph):
+  for trial in range(30):
+    graph = random_graph(rng, rng.randint(1, 25), rng.randint(0, 80), digraph)
+    nodes = list(graph.nodes_dict)
+    for _ in range(5):
+      from_v, to_v = rng.choice(nodes), rng.choice(nodes)
+      expected = reference_bellman_ford(graph, from_v)
+      check_results(graph, from_v, bidirectional_dijkstra(graph, from_v, to_v), expected)
+      check_results(graph, from_v, bidirectional_dijkstra(graph.freeze(), from_v, to_v), expected)
+      check_results(graph, from_v, astar(graph, from_v, to_v), expected)
+
+
+def test_astar_with_positions(rng):
+  # edges at least as long as the straight line between their ends, so the distance heuristic never overestimates
+  graph = Graph(False)
+  positions = {}
+  for i in range(30):
+    node = 'n' + str(i)
+    graph.add_node(node)
+    positions[node] = (rng.uniform(0, 100), rng.uniform(0, 100))
+  nodes = list(graph.nodes_dict)
+  for _ in range(90):
+    u, v = rng.sample(nodes, 2)
+    straight = math.hypot(positions[u][0] - positions[v][0], positions[u][1] - positions[v][1])
+    graph.add_edge(u, v, math.ceil(straight) + rng.randint(0, 20))
+  for _ in range(20):
+    from_v, to_v = rng.sample(nodes, 2)
+    expected = reference_bellman_ford(graph, from_v)
+    check_results(graph, from_v, astar(graph, from_v, to_v, positions=positions), expected)
+
+
+def test_negative_edge_found_after_target_settled():
+  # B is settled before the negative edge into it is seen, so stopping at B would give the wrong distance
+  graph = negative_edge_graph()
+  invalid = [('Invalid', -1, None)]
+  assert dijkstra(graph, 'A', ['B']) == invalid
+  assert dijkstra(graph.freeze(), 'A', ['B']) == invalid
+  assert bidirectional_dijkstra(graph, 'A', 'B') == invalid
+  assert bidirectional_dijkstra(graph.freeze(), 'A', 'B') == invalid
+  assert astar(graph, 'A', 'B') == invalid
+  assert bellman_ford(graph, 'A', ['B']) == [('B', -5, ['A', 'C', 'B'])]
+
+  graph.remove_edge('C', 'B')
+  assert graph.negative_edges == 0
+  assert dijkstra(graph, 'A', ['B']) == [('B', 1, ['A', 'B'])]
+  assert bidirectional_dijkstra(graph, 'A', 'B') == [('B', 1, ['A', 'B'])]
+  assert astar(graph, 'A', 'B') == [('B', 1, ['A', 'B'])]
+
+
+def test_unreachable_negative_edge_is_ignored():
+  graph = negative_edge_graph()
+  graph.add_node('D')
+  graph.add_edge('D', 'A', 2)
+  assert dijkstra(graph, 'B', ['B']) == [('B', 0, ['B'])] # nothing leaves B
+
+
+def test_invalid_nodes(capsys):
+  graph = negative_edge_graph()
+  assert dijkstra(graph, 'X') is None
+  assert dijkstra(graph, 'A', ['X']) is None
+  assert bidirectional_dijkstra(graph, 'A', 'X') is None
+  assert astar(graph, 'X', 'A') is None
+  assert bellman_ford(graph, 'X') is None
+  assert 'Invalid' in capsys.readouterr().out
+
+
+def test_spanning_trees(rng):
+  for trial in range(30):
+    graph = random_graph(rng, rng.randint(1, 20), rng.randint(0, 60), False)
+    prims_tree, kruskal_tree = prims(graph), kruskal(graph)
+    if not graph.is_connected():
+      assert prims_tree is None and kruskal_tree is None
+      continue
+    assert len(prims_tree) == len(kruskal_tree) == len(graph.nodes_dict) - 1
+    assert sum(edge[0] for edge in prims_tree) == sum(edge[0] for edge in kruskal_tree)
+    for tree in (prims_tree, kruskal_tree):
+      for weight, u, v in tree:
+        assert graph.edges_dict[(u, v)] == weight
+
+
+@pytest.mark.parametrize('digraph', [False, True])
+def test_spfa_matches_bellman_ford(rng, digraph):
+  cycles = 0
+  for trial in range(60):
+    graph = random_graph(rng, rng.randint(1, 15), rng.randint(0, 40), digraph, -3, 10)
+    for from_v in list(graph.nodes_dict)[:4]:
+      expected = reference_bellman_ford(graph, from_v)
+      result = bellman_ford(graph, from_v)
+      if expected is None:
+        cycles += 1
+        (node, distance, cycle), = result
+        assert (node, distance) == ('Negative cycle', float('-inf'))
+        assert cycle[0] == cycle[-1] and len(cycle) > 2
+        assert path_length(graph, cycle) < 0
+      else:
+        check_results(graph, from_v, result, expected)
+  assert cycles > 0 # the weights should give some negative cycles
+
+
+def reachable(graph, node):
+  seen = {node}
+  stack = [node]
+  while stack:
+    for adj in graph.nodes_dict[stack.pop()]:
+      if adj not in seen:
+        seen.add(adj)
+        stack.append(adj)
+  return seen
+
+
+@pytest.mark.parametrize('digraph', [False, True])
+def test_strongly_connected_components(rng, digraph):
+  for trial in range(30):
+    graph = random_graph(rng, rng.randint(1, 30), rng.randint(0, 50), digraph)
+    components = strongly_connected_components(graph)
+    assert sorted(node for component in components for node in component) == sorted(graph.nodes_dict)
+    reach = {node: reachable(graph, node) for node in graph.nodes_dict}
+    for component in components: # two nodes share a component exactly when each reaches the other
+      for node in component:
+        assert {other for other in reach[node] if node in reach[other]} == set(component)
+
+
+def test_components_of_a_long_path():
+  # deep enough to overflow the stack of a recursive tarjans algorithm
+  graph = Graph(True)
+  for i in range(20000):
+    graph.add_node(i)
+  for i in range(19999):
+    graph.add_edge(i, i + 1, 1)
+  graph.add_edge(19999, 0, 1)
+  assert len(strongly_connected_components(graph)) == 1
+
+
+def test_bellman_ford_progress_stops_search():
+  graph = Graph(True)
+  for i in range(5000):
+    graph.add_node(i)
+  for i in range(4999):
+    graph.add_edge(i, i + 1, 1)
+  def cancel(fraction):
+    raise KeyboardInterrupt
+  with pytest.raises(KeyboardInterrupt):
+    bellman_ford(graph, 0, progress=cancel)
@@ -0,0 +1,125 @@
+import pytest
+from PyGraph.SGraph import Graph
+from PyGraph.path_cache import PathCache
+from PyGraph.graph_path_algorithm import dijkstra, kruskal
+from PyGraph.tests.random_graphs import random_graph, reference_bellman_ford, path_length
+
+''' checks cached results stay the same as freshly computed ones while the graph is edited '''
+
+
+def random_edit(rng, graph, low):
+  nodes = list(graph.nodes_dict)
+  choice = rng.random()
+  if choice < 0.5 or not graph.edges_dict: # add an edge or change the weight of one
+    u, v = rng.choice(nodes), rng.choice(nodes)
+    if u != v: graph.add_edge(u, v, rng.randint(low, 10))
+  elif choice < 0.85:
+    graph.remove_edge(*rng.choice(list(graph.edges_dict)))
+  elif choice < 0.95 or len(nodes) < 3:
+    graph.add_node('m' + str(graph.version))
+  else:
+    graph.remove_node(rng.choice(nodes))
+
+
+def check_pair(graph, result, from_v, to_v, expected):
+  (node, distance, path), = result
+  if expected is None: # negative cycle
+    assert (node, distance) == ('Negative cycle', float('-inf'))
+    assert path_length(graph, path) < 0
+  elif to_v in expected:
+    assert (node, distance) == (to_v, expected[to_v])
+    assert path[0] == from_v and path[-1] == to_v and path_length(graph, path) == distance
+  else:
+    assert (node, distance, path) == (to_v, float('inf'), None)
+
+
+@pytest.mark.parametrize('digraph', [False, True])
+def test_dijkstra_and_bellman_ford_entries(rng, digraph):
+  for trial in range(10):
+    graph = random_graph(rng, 12, 30, digraph)
+    cache = PathCache(graph, size=8)
+    for step in range(150):
+      random_edit(rng, graph, -2 if digraph and step % 10 == 0 else 1)
+      nodes = list(graph.nodes_dict)
+      for _ in range(3):
+        from_v, to_v = rng.choice(nodes), rng.choice(nodes)
+        expected = reference_bellman_ford(graph, from_v)
+        check_pair(graph, cache.bellman_ford(from_v, to_v), from_v, to_v, expected)
+        result = cache.dijkstra(from_v, to_v)
+        if graph.negative_edges and result != dijkstra(graph, from_v, [to_v]): # may be Invalid
+          pytest.fail('cached dijkstra result differs on a graph with a negative edge')
+        elif not graph.negative_edges:
+          check_pair(graph, result, from_v, to_v, expected)
+    assert cache.hits > 0
+
+
+def test_prims_entries(rng):
+  for trial in range(10):
+    graph = random_graph(rng, 10, 25, False)
+    cache = PathCache(graph)
+    for step in range(100):
+      random_edit(rng, graph, 1)
+      tree, expected = cache.prims(), kruskal(graph)
+      if expected is None:
+        assert tree is None
+      else:
+        assert sum(edge[0] for edge in tree) == sum(edge[0] for edge in expected)
+
+
+def test_removing_negative_edge_recomputes_dijkstra():
+  graph = Graph(True)
+  for node in 'ABC':
+    graph.add_node(node)
+  graph.add_edge('A', 'B', 1)
+  graph.add_edge('A', 'C', 5)
+  graph.add_edge('C', 'B', -10)
+  cache = PathCache(graph)
+  assert cache.dijkstra('A', 'B') == [('Invalid', -1, None)]
+  graph.remove_edge('C', 'B') # off the cached path, which has none
+  assert cache.dijkstra('A', 'B') == [('B', 1, ['A', 'B'])]
+  graph.add_edge('C', 'B', -10)
+  assert cache.dijkstra('A', 'B') == [('Invalid', -1, None)]
+
+
+def test_unaffected_results_are_reused():
+  graph = Graph(False)
+  for node in 'ABCD':
+    graph.add_node(node)
+  graph.add_edge('A', 'B', 1)
+  graph.add_edge('B', 'C', 1)
+  cache = PathCache(graph)
+  cache.dijkstra('A', 'C')
+  graph.add_edge('C', 'D', 1) # cannot shorten the way from A to C
+  graph.add_node('E')
+  assert cache.dijkstra('A', 'C') == [('C', 2, ['A', 'B', 'C'])]
+  assert (cache.hits, cache.misses) == (1, 1)
+  graph.add_edge('A', 'C', 1)
+  assert cache.dijkstra('A', 'C') == [('C', 1, ['A', 'C'])]
+  assert cache.misses == 2
+
+
+def test_background_compute_and_store():
+  graph = Graph(False)
+  for node in 'ABC':
+    graph.add_node(node)
+  graph.add_edge('A', 'B', 2)
+  graph.add_edge('B', 'C', 2)
+  cache = PathCache(graph)
+  key = ('DIJKSTRA', 'A', 'C')
+  assert cache.lookup(key) is None
+  entry = cache.compute(key, graph.freeze(), graph.version) # as run on another thread
+  graph.add_edge('A', 'C', 1) # edited before the entry is stored
+  cache.store(key, entry)
+  assert cache.lookup(key) is None # the edit is checked against the entry
+  assert cache.dijkstra('A', 'C') == [('C', 1, ['A', 'C'])]
+
+
+def test_size_limit():
+  graph = Graph(False)
+  for node in range(10):
+    graph.add_node(node)
+  cache = PathCache(graph, size=3)
+  for node in range(10):
+    cache.dijkstra(0, node)
+  assert len(cache.entries) == 3
+  assert list(cache.entries) == [('DIJKSTRA', 0, node) for node in (7, 8, 9)]
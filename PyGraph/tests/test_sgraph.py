@@ -0,0 +1,145 @@
+import pytest
+from PyGraph.SGraph import Graph, CSRGraph, UnionFind
+from PyGraph.graph_path_algorithm import strongly_connected_components
+from PyGraph.tests.random_graphs import random_graph
+
+''' checks the Graph bookkeeping, the CSRGraph snapshot and UnionFind '''
+
+
+def test_negative_edge_count(rng):
+  for digraph in (False, True):
+    graph = random_graph(rng, 10, 30, digraph, -5, 5)
+    for step in range(60):
+      if step % 3 == 0 and graph.edges_dict:
+        graph.remove_edge(*rng.choice(list(graph.edges_dict)))
+      elif step % 20 == 0:
+        graph.set_digraph(not graph.digraph)
+      else:
+        u, v = rng.sample(list(graph.nodes_dict), 2)
+        graph.add_edge(u, v, rng.randint(-5, 5)) # sometimes changing the weight of an existing edge
+      assert graph.negative_edges == sum(1 for weight in graph.edges_dict.values() if weight < 0)
+      assert graph.freeze().has_negative_weights() == (graph.negative_edges > 0)
+
+
+@pytest.mark.parametrize('digraph', [False, True])
+def test_predecessors_follow_edits(rng, digraph):
+  graph = random_graph(rng, 20, 60, digraph)
+  for step in range(40):
+    nodes = list(graph.nodes_dict)
+    if step % 4 == 0:
+      removed = rng.choice(nodes)
+      graph.remove_node(removed)
+      assert all(removed not in edge for edge in graph.edges_dict)
+    elif step % 4 == 1 and graph.edges_dict:
+      graph.remove_edge(*rng.choice(list(graph.edges_dict)))
+    else:
+      graph.add_node('m' + str(step))
+      graph.add_edge(rng.choice(nodes), 'm' + str(step), 1)
+    for node in graph.nodes_dict: # the index holds exactly the nodes with an edge into each node
+      assert graph.predecessors(node) == {u for (u, v) in graph.edges_dict if v == node}
+
+
+@pytest.mark.parametrize('digraph', [False, True])
+def test_freeze(rng, digraph):
+  graph = random_graph(rng, 20, 50, digraph)
+  csr = graph.freeze()
+  assert graph.freeze() is csr # reused until the graph changes
+  assert len(csr) == 20 and csr.edge_count() == len(graph.edges_dict)
+  for i, label in enumerate(csr.labels):
+    assert {(csr.labels[j], weight) for j, weight in csr.neighbours(i)} == \
+           {(adj, graph.edges_dict[(label, adj)]) for adj in graph.nodes_dict[label]}
+    assert {csr.labels[j] for j, weight in csr.reverse().neighbours(i)} == set(graph.predecessors(label))
+  thawed = csr.thaw()
+  assert thawed.edges_dict == graph.edges_dict and thawed.digraph == digraph
+  graph.add_node('new')
+  assert graph.freeze() is not csr
+
+
+def test_union_find(rng):
+  items = list(range(50))
+  sets = UnionFind(items)
+  naive = {item: {item} for item in items} # item -> the set holding it
+  assert sets.components == 50
+  for _ in range(80):
+    a, b = rng.choice(items), rng.choice(items)
+    merged = naive[a] is not naive[b]
+    assert sets.union(a, b) == merged
+    if merged:
+      joined = naive[a] | naive[b]
+      for item in joined:
+        naive[item] = joined
+    assert sets.components == len({id(group) for group in naive.values()})
+    for item in items:
+      assert (sets.find(item) == sets.find(a)) == (item in naive[a])
+
+
+def test_union_find_add():
+  sets = UnionFind()
+  sets.add('A')
+  sets.add('A') # already present
+  sets.add('B')
+  assert sets.components == 2
+  assert sets.union('A', 'B') and not sets.union('B', 'A')
+  assert sets.components == 1
+
+
+def test_components_follow_edits(rng):
+  for trial in range(20):
+    graph = random_graph(rng, 15, 15, False)
+    for step in range(30):
+      if step % 3 == 0 and graph.edges_dict:
+        graph.remove_edge(*rng.choice(list(graph.edges_dict)))
+      elif step % 7 == 0:
+        graph.remove_node(rng.choice(list(graph.nodes_dict)))
+      else:
+        u, v = rng.sample(list(graph.nodes_dict), 2)
+        graph.add_edge(u, v, 1)
+      assert graph.is_connected() == (len(strongly_connected_components(graph)) == 1)
+
+
+def test_digraph_is_connected():
+  graph = Graph(True)
+  for node in 'ABC':
+    graph.add_node(node)
+  graph.add_edge('A', 'B', 1)
+  graph.add_edge('B', 'C', 1)
+  assert not graph.is_connected()
+  graph.add_edge('C', 'A', 1)
+  assert graph.is_connected()
+  assert not Graph(True).is_connected()
+
+
+def test_changes_since():
+  graph = Graph(False)
+  graph.add_node('A')
+  version = graph.version
+  graph.add_node('B')
+  graph.add_edge('A', 'B', 1)
+  assert graph.changes_since(version) == [(version + 1, 'add_node', 'B', None, None),
+                                          (version + 2, 'add_edge', 'A', 'B', 1)]
+  assert graph.changes_since(graph.version) == []
+  for i in range(2000): # push the earlier changes out of the journal
+    graph.add_edge('A', 'B', i)
+  assert graph.changes_since(version) is None
+
+
+def test_set_digraph():
+  graph = Graph(True)
+  for node in 'ABC':
+    graph.add_node(node)
+  graph.add_edge('A', 'B', 3)
+  graph.add_edge('B', 'A', 2)
+  graph.add_edge('B', 'C', 1)
+  graph.set_digraph(False)
+  assert graph.edges_dict == {('A', 'B'): 2, ('B', 'A'): 2, ('B', 'C'): 1, ('C', 'B'): 1}
+  assert graph.nodes_dict == {'A': {'B'}, 'B': {'A', 'C'}, 'C': {'B'}}
+  assert graph.is_connected()
+  graph.set_digraph(True)
+  assert graph.pred_dict == {'A': {'B'}, 'B': {'A', 'C'}, 'C': {'B'}}
+
+
+def test_csr_index_built_when_needed():
+  csr = CSRGraph(['A', 'B'], [0, 1, 1], [1], [2.0], True)
+  assert csr._index is None
+  assert csr.index == {'A': 0, 'B': 1}
+  assert list(csr.reverse().neighbours(1)) == [(0, 2.0)]
@@ -0,0 +1 @@
+# lets pytest import the PyGraph modules and the command line scripts as they are imported when run from this folder
@@ -0,0 +1,32 @@
+import os
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen') # no display is needed to test the scene
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt5 import QtWidgets
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+class MessageBox(object):
+    # stands in for the scene's invalid input message box, keeping the messages instead of showing them
+    def __init__(self):
+        self.messages = []
+
+    def setText(self, text):
+        self.messages.append(text)
+
+    def exec_(self):
+        pass
+
+
+@pytest.fixture
+def scene_factory(qapp):
+    from GraphGuiClasses import GraphScene
+    def make(digraph=False, batched_edges=False):
+        scene = GraphScene(digraph, batched_edges)
+        scene.InvalidInMsg = MessageBox()
+        return scene
+    return make
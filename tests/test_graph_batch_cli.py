@@ -0,0 +1,91 @@
+import io
+import json
+import pytest
+import GraphBatchCli
+from PyGraph.SGraph import Graph
+from PyGraph.disk_graph import DiskGraph
+import PyGraph.graph_io as graph_io
+
+''' runs the command line entry point on small graph files and reads back its json lines '''
+
+
+def run(tmp_path, *argv):
+    output = tmp_path / 'out.jsonl'
+    GraphBatchCli.main([str(arg) for arg in argv] + ['--output', str(output)])
+    return [json.loads(line) for line in output.read_text().splitlines()]
+
+
+@pytest.fixture
+def edge_list(tmp_path):
+    path = tmp_path / 'graph.csv'
+    path.write_text('# digraph\nA,B,1\nB,C,2\nA,C,5\nD\n')
+    return path
+
+
+@pytest.mark.parametrize('algorithm', ['dijkstra', 'bellman_ford', 'bidirectional', 'astar', 'all_pairs'])
+def test_path_queries(tmp_path, edge_list, algorithm):
+    lines = run(tmp_path, edge_list, algorithm, '--query', 'A', 'C', 'D', '--query', 'X', 'A')
+    assert lines == [
+        {'algorithm': algorithm, 'from': 'A', 'to': 'C', 'distance': 3, 'path': ['A', 'B', 'C']},
+        {'algorithm': algorithm, 'from': 'A', 'to': 'D', 'distance': None, 'path': None},
+        {'algorithm': algorithm, 'from': 'X', 'error': 'node "X" is not in graph'}]
+
+
+def test_queries_file_and_stdin(tmp_path, edge_list, monkeypatch):
+    queries = tmp_path / 'queries.txt'
+    queries.write_text('# start, ends\nA, B\n\nB C\n')
+    monkeypatch.setattr('sys.stdin', io.StringIO('C\n'))
+    lines = run(tmp_path, edge_list, 'dijkstra', '--queries', queries, '--queries', '-')
+    assert [(line['from'], line['to'], line['distance']) for line in lines] == \
+           [('A', 'B', 1), ('B', 'C', 2), ('C', 'A', None), ('C', 'B', None), ('C', 'C', 0), ('C', 'D', None)]
+
+
+def test_negative_weights(tmp_path):
+    path = tmp_path / 'graph.csv'
+    path.write_text('# digraph\nA,B,1\nA,C,5\nC,B,-10\nB,A,1\n')
+    assert run(tmp_path, path, 'dijkstra', '--query', 'A', 'B') == \
+           [{'algorithm': 'dijkstra', 'from': 'A', 'error': 'negative edge weight'}]
+    (line,) = run(tmp_path, path, 'bellman_ford', '--query', 'A', 'B')
+    assert line['error'] == 'negative cycle' and line['cycle'][0] == line['cycle'][-1]
+
+
+def test_point_to_point_needs_end_node(tmp_path, edge_list):
+    assert run(tmp_path, edge_list, 'astar', '--query', 'A') == \
+           [{'algorithm': 'astar', 'from': 'A', 'error': 'astar needs an end node'}]
+
+
+def test_graph_algorithms(tmp_path):
+    path = tmp_path / 'graph.csv'
+    path.write_text('A,B,1\nB,C,2\nA,C,5\n')
+    for algorithm in ('prims', 'kruskal'):
+        lines = run(tmp_path, path, algorithm)
+        assert sum(line['weight'] for line in lines) == 3 and len(lines) == 2
+    path.write_text('A,B,1\nC\n')
+    assert run(tmp_path, path, 'prims') == [{'algorithm': 'prims', 'error': 'graph is not connected'}]
+    components = run(tmp_path, path, 'components')
+    assert sorted(sorted(line['component']) for line in components) == [['A', 'B'], ['C']]
+
+
+def test_binary_and_disk_graph_files(tmp_path):
+    graph = Graph(False)
+    for node in 'ABC':
+        graph.add_node(node)
+    graph.add_edge('A', 'B', 1)
+    graph.add_edge('B', 'C', 1)
+    positions = {'A': (0, 0), 'B': (1, 0), 'C': (2, 0)}
+    binary = tmp_path / 'graph.pygraph'
+    graph_io.write_binary(graph, str(binary), positions)
+    disk = tmp_path / 'disk.pygraph'
+    DiskGraph.from_graph(str(disk), graph)
+    for path in (binary, disk):
+        assert run(tmp_path, path, 'astar', '--query', 'A', 'C') == \
+               [{'algorithm': 'astar', 'from': 'A', 'to': 'C', 'distance': 2.0, 'path': ['A', 'B', 'C']}]
+
+
+def test_usage_errors(tmp_path, edge_list, capsys):
+    with pytest.raises(SystemExit):
+        GraphBatchCli.main([str(edge_list), 'dijkstra']) # no queries
+    with pytest.raises(SystemExit) as exit_info:
+        GraphBatchCli.main([str(tmp_path / 'missing.csv'), 'prims'])
+    assert exit_info.value.code == 1
+    assert 'Could not load' in capsys.readouterr().err
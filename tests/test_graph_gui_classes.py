@@ -0,0 +1,258 @@
+import random
+import pytest
+from PyQt5 import QtCore, QtWidgets
+from GraphGuiClasses import UpdateData, Edge, NodeGrid
+
+''' checks the scene bookkeeping behind the GUI on an offscreen QApplication '''
+
+
+def test_update_signals_are_coalesced(qapp):
+    updater = UpdateData()
+    sent = []
+    updater.signal.connect(sent.append)
+    updater.notify(UpdateData.PATH)
+    updater.notify(UpdateData.EDGES)
+    assert sent == [] # nothing is sent until control returns to the event loop
+    qapp.processEvents()
+    assert sent == [UpdateData.PATH | UpdateData.EDGES]
+    qapp.processEvents()
+    assert sent == [UpdateData.PATH | UpdateData.EDGES] # no new changes, no new signal
+    updater.notify(UpdateData.NODES)
+    updater.flush() # sends straight away
+    assert sent == [UpdateData.PATH | UpdateData.EDGES, UpdateData.NODES]
+    qapp.processEvents()
+    assert len(sent) == 2
+
+
+def test_scene_edits_send_one_signal(qapp, scene_factory):
+    scene = scene_factory()
+    qapp.processEvents() # signals from creating the scene
+    sent = []
+    scene.data_updater.signal.connect(sent.append)
+    for i in range(10):
+        scene.add_node_at(str(i), i * 50, 0)
+    for i in range(9):
+        scene.add_edge(str(i), str(i + 1), 1)
+    qapp.processEvents()
+    assert len(sent) == 1 and sent[0] & UpdateData.NODES and sent[0] & UpdateData.EDGES
+
+
+def index_changes(scene):
+    # record the index methods the scene switches to
+    changes = []
+    set_method = scene.setItemIndexMethod
+    def record(method):
+        changes.append(method)
+        set_method(method)
+    scene.setItemIndexMethod = record
+    return changes
+
+
+def test_small_batches_keep_the_scene_index(scene_factory):
+    scene = scene_factory()
+    for node_val in 'ABC':
+        scene.add_node_at(node_val, 0, 0)
+    scene.add_edge('A', 'B', 1)
+    changes = index_changes(scene)
+    scene.set_node_selected(scene.nodes['A'], True)
+    scene.delete_nodes_selected()
+    with scene.batch():
+        scene.add_edge('B', 'C', 1)
+    assert changes == []
+    assert set(scene.nodes) == {'B', 'C'} and set(scene.edges) == {('B', 'C')}
+
+
+def test_bulk_edits_index_items_once(scene_factory):
+    scene = scene_factory()
+    for node_val in 'ABCD':
+        scene.add_node_at(node_val, 0, 0)
+    changes = index_changes(scene)
+    with scene.batch():
+        assert scene.add_edges_bulk([('A', 'B', 1), ('B', 'C', 2), ('C', 'X', 3)]) == 2
+    assert changes == [QtWidgets.QGraphicsScene.NoIndex, QtWidgets.QGraphicsScene.BspTreeIndex]
+    assert scene.InvalidInMsg.messages == ['1 edits failed, first error: "X" is not in graph'] # reported once at the end
+
+
+def check_incidence(scene):
+    # every node's incident edges are exactly the edge items with it at one end
+    for node_val in scene.nodes:
+        assert scene.incident[node_val] == {edge for edge in scene.edges.values() if node_val in (edge.node1.val, edge.node2.val)}
+    assert set(scene.incident) == set(scene.nodes)
+
+
+def test_incidence_index_follows_edits(scene_factory):
+    rng = random.Random(1729)
+    for digraph in (False, True):
+        scene = scene_factory(digraph)
+        for i in range(20):
+            scene.add_node_at(str(i), rng.uniform(0, 1000), rng.uniform(0, 1000))
+        for step in range(300):
+            nodes = list(scene.nodes)
+            choice = rng.random()
+            if choice < 0.5:
+                u, v = rng.sample(nodes, 2)
+                scene.add_edge(u, v, rng.randint(1, 9)) # may replace an edge between the same nodes
+            elif choice < 0.8 and scene.edges:
+                scene.remove_edge(*rng.choice(list(scene.edges)))
+            elif choice < 0.9:
+                node = scene.nodes[rng.choice(nodes)]
+                scene.add_node_at(node.val, node.x, node.y) # replacing a node keeps its edges
+            else:
+                scene.remove_node(rng.choice(nodes))
+                scene.add_node_at(str(100 + step), rng.uniform(0, 1000), rng.uniform(0, 1000))
+            check_incidence(scene)
+        assert {key: edge.weight for key, edge in scene.edges.items()} == \
+               {key: weight for key, weight in scene.graph.edges_dict.items() if digraph or key in scene.edges}
+        assert scene.InvalidInMsg.messages == []
+
+
+def path_scene(scene_factory):
+    scene = scene_factory()
+    for i, node_val in enumerate('ABCD'):
+        scene.add_node_at(node_val, i * 100, 0)
+    scene.add_edge('A', 'B', 1)
+    scene.add_edge('B', 'C', 1)
+    scene.add_edge('A', 'C', 5)
+    return scene
+
+
+def test_algorithms_run_in_background(qapp, scene_factory, monkeypatch):
+    scene = path_scene(scene_factory)
+    monkeypatch.setattr(type(scene), 'BACKGROUND_SIZE', 0) # every graph counts as large
+    scene.show_shortest_path_dijkstra('A', 'C')
+    assert scene.algorithm_finish is not None # waiting for the worker
+    scene.thread_pool.waitForDone()
+    qapp.processEvents() # deliver its result
+    assert scene.path_displayed == (True, 'A', 'C', '2.0')
+    assert scene.nodes['B'].highlighted
+
+
+def test_editing_cancels_background_algorithm(qapp, scene_factory, monkeypatch):
+    scene = path_scene(scene_factory)
+    monkeypatch.setattr(type(scene), 'BACKGROUND_SIZE', 0)
+    scene.current_path_algo = 'BELLMAN FORD'
+    scene.show_shortest_path_bellman_ford('A', 'D')
+    generation = scene.algorithm_generation
+    scene.add_edge('C', 'D', 1) # the path is searched for again on the edited graph
+    assert scene.algorithm_generation > generation
+    scene.thread_pool.waitForDone()
+    qapp.processEvents()
+    assert scene.path_displayed == (True, 'A', 'D', '3.0') # the result for the graph before the edit was dropped
+    assert scene.InvalidInMsg.messages == []
+
+
+def test_all_pairs_size_limit(scene_factory, monkeypatch):
+    scene = path_scene(scene_factory)
+    scene.show_shortest_path_all_pairs('A', 'C')
+    assert scene.all_pairs is not None and scene.path_displayed == (True, 'A', 'C', '2.0')
+    monkeypatch.setattr(type(scene), 'ALL_PAIRS_SIZE', 3) # four nodes is now too many
+    scene.show_shortest_path_all_pairs('A', 'C') # searched on its own instead
+    assert scene.all_pairs is None and scene.path_displayed == (True, 'A', 'C', '2.0')
+    assert scene.nodes['B'].highlighted
+
+
+def edge_items(scene):
+    # edge items in the scene, drawn by themselves or by the edge layer
+    if scene.edge_layer is not None:
+        return set(scene.edge_layer.edges)
+    return {item for item in scene.items() if isinstance(item, Edge)}
+
+
+@pytest.mark.parametrize('batched_edges', [False, True])
+def test_set_digraph_keeps_scene_in_step(scene_factory, batched_edges):
+    scene = scene_factory(True, batched_edges)
+    for i, node_val in enumerate('ABCD'):
+        scene.add_node_at(node_val, i * 100, 0)
+    scene.add_edge('A', 'B', 3)
+    scene.add_edge('B', 'A', 2)
+    scene.add_edge('B', 'C', 1)
+    scene.add_edge('D', 'C', 4)
+
+    scene.set_digraph(False)
+    assert not scene.digraph and not scene.graph.digraph
+    assert {key: edge.weight for key, edge in scene.edges.items()} == {('A', 'B'): 2, ('B', 'C'): 1, ('D', 'C'): 4}
+    assert all(not edge.directed for edge in scene.edges.values())
+    assert edge_items(scene) == set(scene.edges.values())
+    check_incidence(scene)
+
+    scene.set_digraph(True)
+    assert scene.digraph and scene.graph.digraph
+    assert {key: edge.weight for key, edge in scene.edges.items()} == scene.graph.edges_dict == \
+           {('A', 'B'): 2, ('B', 'A'): 2, ('B', 'C'): 1, ('C', 'B'): 1, ('D', 'C'): 4, ('C', 'D'): 4}
+    assert all(edge.directed for edge in scene.edges.values())
+    assert edge_items(scene) == set(scene.edges.values())
+    check_incidence(scene)
+
+
+def test_node_grid_matches_brute_force(qapp):
+    rng = random.Random(1729)
+    grid = NodeGrid()
+    centers = {}
+    for i in range(300):
+        centers[i] = (rng.uniform(-500, 1500), rng.uniform(-500, 1500))
+        grid.add(i, *centers[i])
+    for i in range(0, 300, 7): # move some and remove others
+        if i % 2:
+            centers[i] = (rng.uniform(-500, 1500), rng.uniform(-500, 1500))
+            grid.add(i, *centers[i])
+        else:
+            del centers[i]
+            grid.remove(i)
+    assert set(grid.centers) == set(centers)
+
+    for _ in range(200):
+        x, y = rng.uniform(-700, 1700), rng.uniform(-700, 1700)
+        size = rng.choice([5, 50, 400, 3000]) # small areas visit cells, large ones the filled cells
+        rect = QtCore.QRectF(x, y, size, size * rng.uniform(0.2, 2))
+        assert sorted(grid.vals_in(rect)) == sorted(val for val, point in centers.items() if rect.contains(QtCore.QPointF(*point)))
+
+        point = QtCore.QPointF(x, y)
+        near = {val: (cx - x)**2 + (cy - y)**2 for val, (cx, cy) in centers.items()}
+        near = {val: dist for val, dist in near.items() if dist <= 20*20}
+        found = grid.val_at(point)
+        if near:
+            assert near[found] == min(near.values())
+        else:
+            assert found is None
+
+
+def test_scene_grid_follows_nodes(scene_factory):
+    scene = scene_factory()
+    scene.add_node_at('A', 0, 0)
+    scene.add_node_at('B', 200, 0)
+    scene.add_node_at('C', 400, 0)
+    scene.move_nodes({'B': (200, 300)})
+    scene.remove_node('C')
+    assert scene.node_grid.val_at(QtCore.QPointF(220, 320)) == 'B'
+    assert scene.node_grid.val_at(QtCore.QPointF(220, 20)) is None
+    assert scene.node_grid.val_at(QtCore.QPointF(420, 20)) is None
+    assert sorted(scene.node_grid.vals_in(QtCore.QRectF(-10, -10, 300, 400))) == ['A', 'B']
+
+
+def test_save_and_load_graph(scene_factory, tmp_path):
+    scene = scene_factory(True)
+    scene.add_node_at('A', 10, 20)
+    scene.add_node_at('B', 300, 40)
+    scene.add_node_at('C', 50, 400)
+    scene.add_edge('A', 'B', 1.5)
+    scene.add_edge('B', 'C', 2)
+    path = str(tmp_path / 'graph.graphml')
+    scene.save_graph(path)
+
+    loaded = scene_factory(False)
+    loaded.add_node_at('old', 0, 0) # replaced by the loaded graph
+    loaded.load_graph(path)
+    assert loaded.digraph
+    assert {val: (node.x, node.y) for val, node in loaded.nodes.items()} == {'A': (10, 20), 'B': (300, 40), 'C': (50, 400)}
+    assert {key: edge.weight for key, edge in loaded.edges.items()} == {('A', 'B'): 1.5, ('B', 'C'): 2}
+    check_incidence(loaded)
+
+
+def test_load_edge_list_places_nodes(scene_factory, tmp_path):
+    path = tmp_path / 'graph.csv'
+    path.write_text('Alberta,Boston,1\nBoston,Chicago,2\nDenver\n') # labels longer than can be typed in
+    scene = scene_factory()
+    scene.load_graph(str(path))
+    assert set(scene.nodes) == {'Alberta', 'Boston', 'Chicago', 'Denver'}
+    assert len({(node.x, node.y) for node in scene.nodes.values()}) == 4 # laid out apart from each other
+    assert scene.InvalidInMsg.messages == []